@@ -1,19 +1,27 @@
+from dataclasses import replace
 from fastapi import Depends, HTTPException, status, Cookie
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db, get_sessionmaker, get_async_sessionmaker
+from app.models.user import User, UserRole
+from app.models.pg import PG
+from app.models.room import Room
+from app.models.bed import Bed
+from app.models.tenant import TenantProfile
 from app.core.security import decode_access_token
+from app.core.principal_cache import Principal, principal_cache
 
-def get_current_user(
-    access_token: str | None = Cookie(default=None),
-    db: Session = Depends(get_db)
-):
+def _token_user_id(access_token: str | None) -> int:
     if access_token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing token"
         )
 
+    user_id = principal_cache.get_token(access_token)
+    if user_id is not None:
+        return user_id
+
     payload = decode_access_token(access_token)
     if payload is None:
         raise HTTPException(
@@ -28,11 +36,94 @@ def get_current_user(
             detail="Invalid token payload"
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user_id = int(user_id)
+    principal_cache.put_token(access_token, user_id, payload.get("exp"))
+    return user_id
+
+def _load_principal(db: Session, user_id: int):
+    user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
 
+    owned_pg_ids = [pg_id for (pg_id,) in db.query(PG.id).filter(PG.admin_id == user.id)]
+    return user, principal_cache.put_principal(Principal.from_user(user, owned_pg_ids))
+
+def get_current_principal(
+    access_token: str | None = Cookie(default=None),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Identity, role and owned PG ids; no DB round trip on a cache hit"""
+    user_id = _token_user_id(access_token)
+
+    principal = principal_cache.get_principal(user_id)
+    if principal is None:
+        _, principal = _load_principal(db, user_id)
+    return principal
+
+def get_current_user(
+    access_token: str | None = Cookie(default=None),
+    db: Session = Depends(get_db)
+):
+    user_id = _token_user_id(access_token)
+
+    principal = principal_cache.get_principal(user_id)
+    if principal is not None:
+        return principal.attach(db)
+
+    user, _ = _load_principal(db, user_id)
     return user
+
+
+### Async variant for DB_MODE=async
+
+async def get_current_user_async(
+    access_token: str | None = Cookie(default=None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user_id = _token_user_id(access_token)
+
+    principal = principal_cache.get_principal(user_id)
+    if principal is not None:
+        return await db.run_sync(principal.attach)
+
+    user, _ = await db.run_sync(_load_principal, user_id)
+    return user
+
+
+### For long-lived responses (GET /events): a cache miss uses its own short-lived
+### session, so an open stream does not keep a pooled connection checked out
+
+def _stream_principal(db: Session, user_id: int, principal: Principal | None) -> Principal:
+    if principal is None:
+        _, principal = _load_principal(db, user_id)
+    if principal.role == UserRole.ADMIN:
+        return principal
+
+    # A tenant follows the PG of their bed, as in get_tenants; no profile, no PG
+    tenant_pg_id = db.query(Room.pg_id).join(
+        Bed, Bed.room_id == Room.id
+    ).join(
+        TenantProfile, TenantProfile.bed_id == Bed.id
+    ).filter(TenantProfile.user_id == principal.id).scalar()
+    return replace(principal, tenant_pg_id=tenant_pg_id)
+
+def get_stream_principal(access_token: str | None = Cookie(default=None)) -> Principal:
+    user_id = _token_user_id(access_token)
+
+    principal = principal_cache.get_principal(user_id)
+    if principal is not None and principal.role == UserRole.ADMIN:
+        return principal
+    with get_sessionmaker()() as db:
+        return _stream_principal(db, user_id, principal)
+
+async def get_stream_principal_async(access_token: str | None = Cookie(default=None)) -> Principal:
+    user_id = _token_user_id(access_token)
+
+    principal = principal_cache.get_principal(user_id)
+    if principal is not None and principal.role == UserRole.ADMIN:
+        return principal
+    async with get_async_sessionmaker()() as db:
+        return await db.run_sync(_stream_principal, user_id, principal)
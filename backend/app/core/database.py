@@ -1,28 +1,256 @@
 import os
-from sqlalchemy import create_engine
+import uuid
+import random
+import logging
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
+from starlette.requests import Request
+from app.core.settings import Settings, get_settings, configure as configure_settings
 
-load_dotenv()
+Base = declarative_base()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+REPLICA_PIN_COOKIE = "db_primary"
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True
-)
+logger = logging.getLogger(__name__)
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+def _pool_options(settings: Settings, url: str) -> dict:
+    options = {
+        "pool_pre_ping": settings.pool_pre_ping,
+        "pool_recycle": settings.pool_recycle,
+    }
+    if settings.pool_class == "null":
+        options["poolclass"] = NullPool
+    elif not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout
+        )
+    return options
+
+def _log_disconnects(engine):
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.is_disconnect:
+            # SQLAlchemy invalidates the pool; the next checkout gets a fresh connection
+            logger.warning("Database connection lost, pool invalidated: %s", context.original_exception)
+
+
+### Engines, created on first use
+#
+# Nothing connects (or imports a driver) until the first session is opened, so
+# importing the app and create_app() stay cheap, and a server that preloads the
+# app and forks its workers never shares a pooled connection between processes.
+#
+# Engines belong to the Settings they were made from, i.e. to the app serving the
+# request (see settings.get_settings), so two apps in one process keep their own
+# pools; apps with equal settings share them.
+
+class _Engines:
+    def __init__(self):
+        self.engine = None
+        self.sessionmaker = None
+        self.replica_sessionmakers = None
+        self.async_engine = None
+        self.async_sessionmaker = None
+        self.async_replica_sessionmakers = None
+
+    def sync_engines(self) -> list:
+        replicas = [maker.kw["bind"] for maker in self.replica_sessionmakers or []]
+        return [engine for engine in [self.engine, *replicas] if engine is not None]
+
+_engines: dict[Settings, _Engines] = {}
+
+def _current() -> tuple[Settings, _Engines]:
+    settings = get_settings()
+    engines = _engines.get(settings)
+    if engines is None:
+        engines = _engines.setdefault(settings, _Engines())
+    return settings, engines
+
+def configure(settings: Settings):
+    """Default settings for code outside any app's requests, e.g. scripts"""
+    configure_settings(settings)
+
+def reset():
+    """Drop every engine; the next session creates new ones"""
+    for engines in list(_engines.values()):
+        for engine in engines.sync_engines():
+            engine.dispose()
+    # Async pools can only be closed on their event loop; unreferenced, they close with it
+    _engines.clear()
+
+def _create_engine(settings: Settings, url: str):
+    engine = create_engine(url, **_pool_options(settings, url))
+    _log_disconnects(engine)
+    return engine
+
+def get_engine():
+    settings, engines = _current()
+    if engines.engine is None:
+        if not settings.database_url:
+            raise RuntimeError("DATABASE_URL is not set")
+        engines.engine = _create_engine(settings, settings.database_url)
+    return engines.engine
+
+def get_sessionmaker():
+    """Sessions on the primary"""
+    _, engines = _current()
+    if engines.sessionmaker is None:
+        engines.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return engines.sessionmaker
+
+def get_replica_sessionmakers():
+    settings, engines = _current()
+    if engines.replica_sessionmakers is None:
+        engines.replica_sessionmakers = [
+            sessionmaker(autocommit=False, autoflush=False, bind=_create_engine(settings, url))
+            for url in settings.replica_urls
+        ]
+    return engines.replica_sessionmakers
+
+def pool_usage() -> list[tuple[int, int]]:
+    """(checked out, capacity) of each bounded pool the current app has created so far, sync and async"""
+    _, engines = _current()
+    pools = engines.sync_engines()
+    pools += [engine.sync_engine for engine in [engines.async_engine] if engine is not None]
+    usage = []
+    for engine in pools:
+        max_overflow = getattr(engine.pool, "_max_overflow", None)
+        if max_overflow is not None and max_overflow >= 0:
+            usage.append((engine.pool.checkedout(), engine.pool.size() + max_overflow))
+    return usage
+
+def _after_fork():
+    # Pools created before a fork (e.g. by a preload hook that touched the
+    # database) must not hand the parent's connections to the child
+    for engines in list(_engines.values()):
+        for engine in engines.sync_engines():
+            engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
 
-Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+### Read replicas
+
+def reads_from_replica(request: Request) -> bool:
+    """Safe-method requests without a recent write of their own"""
+    return (
+        bool(get_settings().replica_urls)
+        and request.method in ("GET", "HEAD")
+        and REPLICA_PIN_COOKIE not in request.cookies
+    )
+
+def get_db(request: Request):
+    if reads_from_replica(request):
+        db = random.choice(get_replica_sessionmakers())()
+    else:
+        db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write request, set a short-lived cookie that keeps the
+    client's reads on the primary until the replicas have caught up, so a
+    client always sees its own writes.
+    """
+    def __init__(self, app, pin_seconds: int):
+        self.app = app
+        self.cookie = (
+            f"{REPLICA_PIN_COOKIE}=1; Max-Age={pin_seconds}; Path=/; HttpOnly; SameSite=lax"
+        ).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            return await self.app(scope, receive, send)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message.setdefault("headers", []).append((b"set-cookie", self.cookie))
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+
+### Async engine, created on first use so the sync path never imports an async driver
+
+_ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+def _async_url(url: str) -> str:
+    for prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+def async_database_url() -> str:
+    settings = get_settings()
+    return settings.async_database_url or _async_url(settings.database_url)
+
+def _create_async_engine(settings: Settings, url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    connect_args = {}
+    if settings.pooler_mode == "transaction" and "+asyncpg" in url:
+        # Transaction poolers hand each transaction to any server connection,
+        # so server-side prepared statements cannot be cached or reused by name
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    async_engine = create_async_engine(
+        url,
+        connect_args=connect_args,
+        **_pool_options(settings, url)
+    )
+    _log_disconnects(async_engine.sync_engine)
+    return async_engine
+
+def get_async_engine():
+    settings, engines = _current()
+    if engines.async_engine is None:
+        engines.async_engine = _create_async_engine(settings, async_database_url())
+    return engines.async_engine
+
+def get_async_sessionmaker():
+    _, engines = _current()
+    if engines.async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        engines.async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return engines.async_sessionmaker
+
+def get_async_replica_sessionmakers():
+    settings, engines = _current()
+    if engines.async_replica_sessionmakers is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        engines.async_replica_sessionmakers = [
+            async_sessionmaker(
+                bind=_create_async_engine(settings, _async_url(url)),
+                autoflush=False,
+                expire_on_commit=False
+            )
+            for url in settings.replica_urls
+        ]
+    return engines.async_replica_sessionmakers
+
+async def get_async_db(request: Request):
+    if reads_from_replica(request):
+        sessionmaker = random.choice(get_async_replica_sessionmakers())
+    else:
+        sessionmaker = get_async_sessionmaker()
+    async with sessionmaker() as db:
+        yield db
@@ -0,0 +1,39 @@
+import hashlib
+from fastapi import Request, Response
+
+# Bump when a listing's response shape changes, so clients holding an old
+# ETag get the new representation instead of a 304
+RESPONSE_FORMAT = 1
+
+# Let the browser keep the listing but revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+def pg_etag(scope: str, versions: list[tuple[int, int]]) -> str:
+    """
+    Strong ETag for a listing built from the given PGs' data, from their
+    (pg_id, version) pairs. The version is read before the listing itself, so a
+    concurrent write can only make the ETag older than the body, never newer.
+    """
+    if len(versions) == 1:
+        (pg_id, version), = versions
+        return f'"{scope}.{RESPONSE_FORMAT}.pg{pg_id}v{version}"'
+
+    state = ",".join(f"{pg_id}:{version}" for pg_id, version in versions)
+    digest = hashlib.sha1(state.encode()).hexdigest()[:20]
+    return f'"{scope}.{RESPONSE_FORMAT}.{digest}"'
+
+def not_modified(request: Request, response: Response, etag: str):
+    """
+    304 response when If-None-Match matches the ETag, otherwise None after
+    setting ETag / Cache-Control on the response the endpoint will return
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match uses weak comparison: W/ prefixes are ignored
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
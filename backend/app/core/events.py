@@ -0,0 +1,294 @@
+import os
+import json
+import asyncio
+import logging
+import itertools
+import threading
+from dataclasses import dataclass, field
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from app.models.user import UserRole
+from app.core.settings import get_settings
+
+### Occupancy change events, pushed to GET /events
+#
+# Services queue events on their session with emit(); they are published when
+# the session commits and dropped on rollback.
+#
+# "memory": published straight to this process's hub
+# "postgres": sent with pg_notify inside the committing transaction, so Postgres
+#   delivers them on commit; every worker LISTENs and feeds its own hub
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+# LISTEN needs a session-level connection: point this at the database directly
+# when DATABASE_URL goes through a transaction pooler
+EVENTS_DATABASE_URL = os.getenv("EVENTS_DATABASE_URL")
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "mypg_events")
+# Comment line sent on idle streams so proxies keep them open
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# Events buffered per connection; a client that falls this far behind is disconnected
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+# Open streams per process before new ones get 503
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "10000"))
+
+BED_OCCUPIED = "bed.occupied"
+BED_CREATED = "bed.created"
+BED_DELETED = "bed.deleted"
+ROOM_CREATED = "room.created"
+ROOM_DELETED = "room.deleted"
+TENANT_ASSIGNED = "tenant.assigned"
+
+# pg_notify payloads must stay under 8000 bytes
+_NOTIFY_LIMIT = 7900
+_PENDING = "pending_events"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Event:
+    type: str
+    pg_id: int
+    # Routes the event to the owning admin's streams; not sent to clients
+    admin_id: int
+    data: dict = field(default_factory=dict)
+    # database_url of the app that emitted it: apps on other databases in this
+    # process have their own admins and PGs with the same ids
+    source: str | None = None
+
+    def to_dict(self) -> dict:
+        return {"type": self.type, "admin_id": self.admin_id, "pg_id": self.pg_id, **self.data}
+
+    @classmethod
+    def from_dict(cls, values: dict, source: str | None = None):
+        values = dict(values)
+        return cls(values.pop("type"), values.pop("pg_id"), values.pop("admin_id"), values, source)
+
+    def sse(self, event_id: int) -> str:
+        payload = json.dumps({"type": self.type, "pg_id": self.pg_id, **self.data}, separators=(",", ":"), default=str)
+        return f"id: {event_id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+def emit(db: Session, type: str, pg, **data):
+    """
+    Queue an event on the session, published once it commits.
+    pg is the (pg_id, admin_id) row returned by adjust_pg_counters.
+    """
+    if pg is None:
+        return
+    pg_id, admin_id = pg
+    db.info.setdefault(_PENDING, []).append(Event(type, pg_id, admin_id, data, get_settings().database_url))
+
+
+### Fan-out hub
+
+class Subscriber:
+    def __init__(self, keys: set, loop: asyncio.AbstractEventLoop):
+        self.keys = keys
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def deliver(self, event: Event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up; the stream ends and the client resyncs on reconnect
+            self.overflowed = True
+
+
+class EventHub:
+    """
+    Subscribers indexed by scope key, so a publish only touches the streams it
+    is addressed to. An idle stream costs one queue and one waiting task.
+    Publishing is thread-safe: events are handed to each subscriber loop with
+    one call_soon_threadsafe per batch.
+    """
+    def __init__(self):
+        self._subscribers: dict[tuple, set[Subscriber]] = {}
+        self._loops: dict[asyncio.AbstractEventLoop, int] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # One LISTEN connection per loop and source database
+        self._listeners: dict[tuple, asyncio.Task] = {}
+
+    @property
+    def subscribers(self) -> int:
+        return sum(self._loops.values())
+
+    def subscribe(self, keys: set) -> Subscriber:
+        loop = asyncio.get_running_loop()
+        subscriber = Subscriber(keys, loop)
+        with self._lock:
+            for key in keys:
+                self._subscribers.setdefault(key, set()).add(subscriber)
+            self._loops[loop] = self._loops.get(loop, 0) + 1
+        if EVENTS_BACKEND == "postgres":
+            source = get_settings().database_url
+            if (loop, source) not in self._listeners:
+                self._listeners[loop, source] = loop.create_task(_listen(self, source))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            for key in subscriber.keys:
+                subscribers = self._subscribers.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[key]
+            self._loops[subscriber.loop] -= 1
+            if not self._loops[subscriber.loop]:
+                del self._loops[subscriber.loop]
+
+    def publish(self, events: list[Event]):
+        """Deliver to local subscribers, from any thread"""
+        with self._lock:
+            loops = list(self._loops)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, events, loop)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
+    def _dispatch(self, events: list[Event], loop):
+        for event in events:
+            with self._lock:
+                targets = (
+                    self._subscribers.get((event.source, "admin", event.admin_id), set())
+                    | self._subscribers.get((event.source, "pg", event.pg_id), set())
+                )
+            for subscriber in targets:
+                if subscriber.loop is loop:
+                    subscriber.deliver(event)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+hub = EventHub()
+
+
+### Publishing on commit
+
+def _notify(session: Session):
+    """before_commit: in postgres mode, hand the pending events to pg_notify inside the transaction"""
+    pending = session.info.get(_PENDING)
+    if not pending or EVENTS_BACKEND != "postgres" or session.get_bind().dialect.name != "postgresql":
+        return
+
+    chunks, chunk, size = [], [], 2
+    for item in (json.dumps(e.to_dict(), separators=(",", ":"), default=str) for e in pending):
+        if chunk and size + len(item) + 1 > _NOTIFY_LIMIT:
+            chunks.append(chunk)
+            chunk, size = [], 2
+        chunk.append(item)
+        size += len(item) + 1
+    chunks.append(chunk)
+
+    for chunk in chunks:
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": EVENTS_CHANNEL, "payload": "[" + ",".join(chunk) + "]"}
+        )
+    # Delivered by Postgres from here on, through _listen
+    session.info[_PENDING] = []
+
+def _publish(session: Session):
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        hub.publish(pending)
+
+def _discard(session: Session, *args):
+    session.info.pop(_PENDING, None)
+
+def install():
+    """Hook every Session (including the one behind AsyncSession); idempotent"""
+    if not event.contains(Session, "after_commit", _publish):
+        event.listen(Session, "before_commit", _notify)
+        event.listen(Session, "after_commit", _publish)
+        event.listen(Session, "after_rollback", _discard)
+
+install()
+
+
+### Postgres LISTEN
+
+def _listen_dsn() -> str:
+    from app.core.database import async_database_url
+    return (EVENTS_DATABASE_URL or async_database_url()).replace("postgresql+asyncpg://", "postgresql://", 1)
+
+async def _listen(hub: EventHub, source: str):
+    """Feed the hub from NOTIFY on EVENTS_CHANNEL for as long as the loop runs, reconnecting on errors"""
+    import asyncpg
+    loop = asyncio.get_running_loop()
+
+    def received(connection, pid, channel, payload):
+        hub._dispatch([Event.from_dict(values, source) for values in json.loads(payload)], loop)
+
+    delay = 1
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(_listen_dsn())
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(EVENTS_CHANNEL, received)
+            delay = 1
+            await closed.wait()
+            logger.warning("Event listener connection closed, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logger.warning("Event listener failed, retrying in %ss: %s", delay, error)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+
+### SSE stream
+
+def event_stream(principal) -> StreamingResponse:
+    """
+    text/event-stream of the events for an admin's PGs (including ones created
+    later) or a tenant's PG. Clients should refetch on (re)connect and after an
+    `overflow` event, which ends the stream.
+    """
+    source = get_settings().database_url
+    if principal.role == UserRole.ADMIN:
+        keys = {(source, "admin", principal.id)}
+    elif principal.tenant_pg_id is not None:
+        keys = {(source, "pg", principal.tenant_pg_id)}
+    else:
+        raise HTTPException(status_code=403, detail="Not a tenant of any PG")
+
+    if hub.subscribers >= EVENTS_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many event streams", headers={"Retry-After": "30"})
+
+    async def stream():
+        subscriber = hub.subscribe(keys)
+        try:
+            yield f"retry: 3000\nevent: ready\ndata: {{}}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield event.sse(hub.next_id())
+                if subscriber.overflowed and subscriber.queue.empty():
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
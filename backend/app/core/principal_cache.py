@@ -0,0 +1,155 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.models.user import User, UserRole
+from app.core.settings import get_settings
+
+### In-process cache of verified tokens and authenticated principals
+#
+# token   -> user_id, kept until the JWT's own exp
+# user_id -> Principal, kept for AUTH_CACHE_TTL_SECONDS or until invalidated
+#
+# Invalidation is per process: other workers converge within the TTL.
+#
+# Keys are scoped to the app serving the request: tokens by the secret that
+# verified them, principals by the database they were loaded from, so apps with
+# other settings in the same process never see each other's entries.
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    name: str
+    email: str
+    role: UserRole
+    invited_pg_id: int | None = None
+    owned_pg_ids: tuple[int, ...] = field(default_factory=tuple)
+    # PG of the tenant's bed; only resolved for GET /events and never cached,
+    # since a tenant can move between PGs
+    tenant_pg_id: int | None = None
+
+    @classmethod
+    def from_user(cls, user: User, owned_pg_ids=()):
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            invited_pg_id=user.invited_pg_id,
+            owned_pg_ids=tuple(owned_pg_ids)
+        )
+
+    def attach(self, db: Session) -> User:
+        """
+        Rebuild a session-bound User without a SELECT.
+        Columns not cached (password_hash) and relationships load lazily on access.
+        """
+        user = User(
+            id=self.id,
+            name=self.name,
+            email=self.email,
+            role=self.role,
+            invited_pg_id=self.invited_pg_id
+        )
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+
+class PrincipalCache:
+    def __init__(self, maxsize: int = AUTH_CACHE_SIZE, ttl: int = AUTH_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._tokens = OrderedDict()
+        self._principals = OrderedDict()
+        self._lock = threading.Lock()
+        self.token_hits = 0
+        self.token_misses = 0
+        self.principal_hits = 0
+        self.principal_misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _get(self, store: OrderedDict, key):
+        entry = store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del store[key]
+            return None
+        store.move_to_end(key)
+        return value
+
+    def _put(self, store: OrderedDict, key, value, expires_at: float):
+        store[key] = (expires_at, value)
+        store.move_to_end(key)
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+    def get_token(self, token: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            user_id = self._get(self._tokens, (get_settings().jwt_secret, token))
+            if user_id is None:
+                self.token_misses += 1
+            else:
+                self.token_hits += 1
+            return user_id
+
+    def put_token(self, token: str, user_id: int, exp=None):
+        if not self.enabled or exp is None:
+            return
+        with self._lock:
+            self._put(self._tokens, (get_settings().jwt_secret, token), user_id, float(exp))
+
+    def get_principal(self, user_id: int):
+        if not self.enabled:
+            return None
+        with self._lock:
+            principal = self._get(self._principals, (get_settings().database_url, user_id))
+            if principal is None:
+                self.principal_misses += 1
+            else:
+                self.principal_hits += 1
+            return principal
+
+    def put_principal(self, principal: Principal):
+        if self.enabled:
+            with self._lock:
+                self._put(self._principals, (get_settings().database_url, principal.id), principal, time.time() + self.ttl)
+        return principal
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            self._principals.pop((get_settings().database_url, user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._principals.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "max_size": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "tokens_cached": len(self._tokens),
+                "principals_cached": len(self._principals),
+                "token_hits": self.token_hits,
+                "token_misses": self.token_misses,
+                "principal_hits": self.principal_hits,
+                "principal_misses": self.principal_misses
+            }
+
+
+principal_cache = PrincipalCache()
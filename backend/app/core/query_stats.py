@@ -0,0 +1,192 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import ExecuteStyle
+import app.core.settings  # noqa: F401 - loads .env before the settings below are read
+
+# Requests slower than this are logged with their statements
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+# The same statement this many times in one request is reported as an N+1 candidate
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "3"))
+
+logger = logging.getLogger(__name__)
+
+### Per-request statement log
+
+@dataclass
+class Query:
+    statement: str
+    duration: float
+    rows: int
+    # One chunk of a multi-row INSERT; repeats of these are not N+1 loads
+    batch: bool = False
+
+@dataclass
+class QueryLog:
+    queries: list[Query] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    @property
+    def rows(self) -> int:
+        return sum(query.rows for query in self.queries)
+
+    def repeated(self, threshold: int = None) -> list[tuple[str, int]]:
+        """Statements issued at least `threshold` times, most repeated first"""
+        threshold = threshold or N_PLUS_ONE_THRESHOLD
+        counts = Counter(query.statement for query in self.queries if not query.batch)
+        return [(statement, n) for statement, n in counts.most_common() if n >= threshold]
+
+    def describe(self) -> str:
+        return "\n".join(
+            f"{i}. ({query.duration * 1000:.1f}ms, {query.rows} rows) {query.statement}"
+            for i, query in enumerate(self.queries, start=1)
+        )
+
+_request_log: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+
+# Logs collected regardless of context, for count_queries() around a TestClient call
+_watchers: list[QueryLog] = []
+_watchers_lock = threading.Lock()
+
+def _normalize(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _request_log.get()
+    if log is None and not _watchers:
+        return
+    duration = time.perf_counter() - context._query_started
+
+    # rowcount is rows returned for SELECT on psycopg2 / asyncpg and -1 where unknown
+    query = Query(
+        _normalize(statement),
+        duration,
+        max(cursor.rowcount, 0),
+        batch=context.execute_style is ExecuteStyle.INSERTMANYVALUES
+    )
+    if log is not None:
+        log.queries.append(query)
+    if _watchers:
+        with _watchers_lock:
+            for watcher in _watchers:
+                watcher.queries.append(query)
+
+def install():
+    """Hook every Engine (sync, and the sync side of the async one); idempotent"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+### Middleware
+
+class QueryStatsMiddleware:
+    """
+    Collects the statements of each HTTP request, adds a Server-Timing header
+    (db time, query count, total time), warns about repeated statements and logs
+    slow requests as one JSON record.
+    """
+    def __init__(self, app):
+        self.app = app
+        install()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        log = QueryLog()
+        token = _request_log.set(log)
+        started = time.perf_counter()
+        status = None
+        streaming = False
+
+        async def send_with_timing(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Event streams stay open by design; they are not slow requests
+                streaming = (b"content-type", b"text/event-stream; charset=utf-8") in message.get("headers", [])
+                total = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={log.duration * 1000:.1f};desc="{log.count} queries, {log.rows} rows", '
+                    f"app;dur={total:.1f}"
+                )
+                message.setdefault("headers", []).append((b"server-timing", timing.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_log.reset(token)
+            self._report(scope, status, log, (time.perf_counter() - started) * 1000, streaming)
+
+    def _report(self, scope, status, log: QueryLog, duration_ms: float, streaming: bool = False):
+        route = f"{scope['method']} {scope['path']}"
+        repeated = log.repeated()
+        for statement, n in repeated:
+            logger.warning("Possible N+1 in %s: statement ran %d times: %s", route, n, statement)
+
+        if duration_ms >= SLOW_REQUEST_MS and not streaming:
+            logger.warning("Slow request %s", json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(duration_ms, 1),
+                "db_ms": round(log.duration * 1000, 1),
+                "queries": log.count,
+                "rows": log.rows,
+                "n_plus_one": [{"statement": statement, "count": n} for statement, n in repeated],
+                "statements": [
+                    {"statement": query.statement, "duration_ms": round(query.duration * 1000, 2), "rows": query.rows}
+                    for query in log.queries
+                ],
+            }))
+
+
+### Helpers for tests and scripts
+
+@contextmanager
+def count_queries():
+    """
+    Record every statement issued while the block runs, from any thread:
+
+        with count_queries() as log:
+            client.get("/rooms/1")
+        assert log.count == 2, log.describe()
+    """
+    install()
+    log = QueryLog()
+    with _watchers_lock:
+        _watchers.append(log)
+    try:
+        yield log
+    finally:
+        with _watchers_lock:
+            _watchers.remove(log)
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail the block if it issues more than `limit` statements"""
+    with count_queries() as log:
+        yield log
+    if log.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {log.count}:\n{log.describe()}")
@@ -0,0 +1,394 @@
+import os
+import json
+import math
+import functools
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import anyio.to_thread
+from fastapi import HTTPException, Request, status
+from app.core.database import pool_usage
+from app.core.settings import get_settings
+
+### Token-bucket rate limits for the credential endpoints
+#
+# Each rule is "requests/seconds": a bucket holds up to `requests` tokens and
+# refills at requests/seconds per second. /auth/login, /auth/signup and
+# /auth/invite/generate take one token from the client IP's bucket and one from
+# the email's bucket before any password is hashed or user looked up; an empty
+# bucket is a 429 with Retry-After. "0" disables a rule.
+
+# The rules, store and switches come from Settings (rate_limit_*), read when
+# first needed rather than at import.
+
+def _rules(settings) -> dict:
+    return {
+        "login:ip": settings.rate_limit_login_ip,
+        "login:email": settings.rate_limit_login_email,
+        "signup:ip": settings.rate_limit_signup_ip,
+        "signup:email": settings.rate_limit_signup_email,
+        "invite:ip": settings.rate_limit_invite_ip,
+        "invite:email": settings.rate_limit_invite_email,
+        # Every POST/PUT/PATCH/DELETE, per client IP, checked by AdmissionMiddleware
+        "write:ip": settings.rate_limit_writes_ip,
+    }
+
+### Load shedding
+#
+# Checked on every request before routing. Past Settings.shed_threadpool_queue
+# or shed_db_pool_queue, new requests get an immediate 503 instead of queueing
+# behind work that is already late.
+
+SHED_EXEMPT_PATHS = {"/"}
+# Long-lived streams hold no thread or connection; they are not counted in flight
+_STREAM_PREFIXES = ("/events",)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Rate:
+    requests: int
+    seconds: float
+
+    @classmethod
+    def parse(cls, spec: str):
+        """"20/60" -> Rate(20, 60.0); "0" or "" -> None"""
+        if not spec or spec.strip() == "0":
+            return None
+        requests, _, seconds = spec.partition("/")
+        return cls(int(requests), float(seconds or 1))
+
+    @property
+    def per_second(self) -> float:
+        return self.requests / self.seconds
+
+
+def _parse_rules(rules: dict) -> dict:
+    return {name: Rate.parse(spec) for name, spec in rules.items()}
+
+@functools.lru_cache(maxsize=8)
+def _settings_rules(settings) -> dict:
+    """Parsed once per Settings object; it is frozen, so it can key the cache"""
+    return _parse_rules(_rules(settings))
+
+
+def _refill(tokens, updated, rate: Rate, now: float):
+    """(tokens left, seconds until the next token) after taking one, or (tokens, wait) when empty"""
+    if tokens is None:
+        tokens = rate.requests
+    else:
+        tokens = min(rate.requests, tokens + max(now - updated, 0) * rate.per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate.per_second
+
+
+### Stores
+#
+# A store keeps (tokens, updated) per key and applies _refill atomically.
+# Anything with take() and prune() works, e.g. a Redis script; assign it to
+# limiter.store.
+
+class MemoryStore:
+    blocking = False
+
+    def __init__(self, maxsize: int = None):
+        self.maxsize = get_settings().rate_limit_max_keys if maxsize is None else maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        """Take a token; returns 0 when allowed, else seconds until one is available"""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (None, None))
+            tokens, wait = _refill(tokens, updated, rate, now)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def prune(self, older_than: float):
+        with self._lock:
+            for key in [key for key, (_, updated) in self._buckets.items() if updated < older_than]:
+                del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteStore:
+    """
+    Buckets in a SQLite file, shared by the workers of one host (a stand-in for
+    a network store). Each take is one short write transaction; WAL mode lets
+    readers and the single writer proceed together.
+    """
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets"
+                " (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front, so concurrent takes serialize
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, wait = _refill(*(row or (None, None)), rate, now)
+            connection.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now)
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return wait
+
+    def prune(self, older_than: float):
+        self._connection().execute("DELETE FROM rate_limit_buckets WHERE updated < ?", (older_than,))
+
+    def __len__(self):
+        return self._connection().execute("SELECT count(*) FROM rate_limit_buckets").fetchone()[0]
+
+
+def create_store(spec: str = None):
+    spec = spec or get_settings().rate_limit_store
+    if spec == "memory":
+        return MemoryStore()
+    if spec.startswith("sqlite:///"):
+        return SQLiteStore(spec[len("sqlite:///"):])
+    raise ValueError(f"Unknown RATE_LIMIT_STORE: {spec}")
+
+
+### Limiter
+
+def client_ip(request) -> str:
+    """request.client, or the last X-Forwarded-For hop when the proxy in front is trusted"""
+    if get_settings().rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """
+    Rules and enabled default to the settings of the running app; pass them to
+    override. A store error lets the request through rather than failing auth.
+    """
+    def __init__(self, rules: dict = None, store=None, enabled: bool = None):
+        self._rules = None if rules is None else _parse_rules(rules)
+        self._enabled = enabled
+        self._store = store
+        self._lock = threading.Lock()
+        self._takes = 0
+        self.limited = {}
+        self.errors = 0
+
+    @property
+    def rules(self) -> dict:
+        return _settings_rules(get_settings()) if self._rules is None else self._rules
+
+    @property
+    def enabled(self) -> bool:
+        return get_settings().rate_limit_enabled if self._enabled is None else self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool):
+        self._enabled = enabled
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = create_store()
+        return self._store
+
+    @store.setter
+    def store(self, store):
+        self._store = store
+
+    def _take(self, name: str, key: str) -> float:
+        rate = self.rules.get(name)
+        if rate is None:
+            return 0.0
+        now = time.time()
+        try:
+            wait = self.store.take(f"{name}:{key}", rate, now)
+        except Exception as error:
+            with self._lock:
+                self.errors += 1
+            logger.warning("Rate limit store failed, allowing request: %s", error)
+            return 0.0
+
+        with self._lock:
+            self._takes += 1
+            prune = self._takes % 1000 == 0
+            if wait:
+                self.limited[name] = self.limited.get(name, 0) + 1
+        if prune:
+            # A bucket idle for the longest window has refilled; dropping it changes nothing
+            longest = max(rate.seconds for rate in self.rules.values() if rate is not None)
+            self.store.prune(now - longest)
+        return wait
+
+    def hit(self, scope: str, ip: str, email: str | None = None) -> float:
+        """Take from the scope's IP and email buckets; seconds to wait, 0 when allowed"""
+        if not self.enabled:
+            return 0.0
+        wait = self._take(f"{scope}:ip", ip)
+        if not wait and email:
+            wait = self._take(f"{scope}:email", email.strip().lower())
+        return wait
+
+    def check(self, request: Request, scope: str, email: str | None = None):
+        """Raise 429 when the client IP or the email is over the scope's rate"""
+        wait = self.hit(scope, client_ip(request), email)
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+
+    async def check_async(self, request: Request, scope: str, email: str | None = None):
+        if self.enabled and self.store.blocking:
+            await anyio.to_thread.run_sync(self.check, request, scope, email)
+        else:
+            self.check(request, scope, email)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "store": type(self.store).__name__,
+            "keys": len(self.store),
+            "rules": {
+                name: f"{rate.requests}/{rate.seconds:g}s" if rate else None
+                for name, rate in self.rules.items()
+            },
+            "limited": dict(self.limited),
+            "store_errors": self.errors,
+            "shed": dict(admission.shed),
+        }
+
+limiter = RateLimiter()
+
+
+### Admission control
+
+class Admission:
+    """
+    Queue lengths are estimated from the requests admitted and still running,
+    counted as they pass the middleware: a burst is measured as it arrives,
+    before any of it has reached a thread or a connection.
+    """
+    def __init__(self):
+        self.in_flight = 0
+        self.shed = {}
+
+    def threadpool_queue(self) -> int:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        waiting = limiter.statistics().tasks_waiting
+        if get_settings().db_mode == "sync":
+            # Every sync request runs on a thread; past the pool size they queue
+            waiting = max(waiting, self.in_flight - int(limiter.total_tokens))
+        return waiting
+
+    def db_pool_queue(self) -> int:
+        """Requests beyond the connections of every pool created so far, or of the primary's before the first"""
+        usage = pool_usage()
+        if usage:
+            capacity = sum(capacity for _, capacity in usage)
+        else:
+            settings = get_settings()
+            if settings.pool_class == "null":
+                return 0
+            capacity = settings.pool_size + settings.max_overflow
+        return self.in_flight - capacity
+
+    def overloaded(self) -> str | None:
+        """Why a new request should be shed now, or None"""
+        settings = get_settings()
+        threadpool_limit, db_pool_limit = settings.shed_threadpool_queue, settings.shed_db_pool_queue
+        if threadpool_limit > 0 and self.threadpool_queue() >= threadpool_limit:
+            return "threadpool"
+        if db_pool_limit > 0 and self.db_pool_queue() >= db_pool_limit:
+            return "db_pool"
+        return None
+
+admission = Admission()
+
+
+class AdmissionMiddleware:
+    """
+    Sheds requests with 503 while the threadpool or the connection pool has a
+    long queue, and applies the per-IP write rate (429) before a request
+    reaches its endpoint. Both answers take microseconds and touch no database.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in SHED_EXEMPT_PATHS:
+            return await self.app(scope, receive, send)
+
+        reason = admission.overloaded()
+        if reason is not None:
+            admission.shed[reason] = admission.shed.get(reason, 0) + 1
+            return await _reject(send, status.HTTP_503_SERVICE_UNAVAILABLE, "Server busy, please retry", 1)
+
+        if scope["method"] in ("POST", "PUT", "PATCH", "DELETE") and limiter.enabled:
+            request = Request(scope)
+            if limiter.store.blocking:
+                wait = await anyio.to_thread.run_sync(limiter._take, "write:ip", client_ip(request))
+            else:
+                wait = limiter._take("write:ip", client_ip(request))
+            if wait:
+                return await _reject(send, status.HTTP_429_TOO_MANY_REQUESTS, "Too many requests, please retry later", wait)
+
+        counted = not scope["path"].startswith(_STREAM_PREFIXES)
+        if counted:
+            admission.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if counted:
+                admission.in_flight -= 1
+
+async def _reject(send, status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(math.ceil(retry_after)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
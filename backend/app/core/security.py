@@ -1,37 +1,154 @@
 
 ### Password Hashing and verifying
 
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+# Imported first: it loads .env before the settings below are read
+from app.core.settings import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor; stored hashes with a different cost are rehashed on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker processes for bcrypt, 0 hashes inline in the calling thread
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+# Hash/verify jobs allowed in flight before new ones are rejected with 503
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(max(HASH_POOL_SIZE, 1) * 8)))
 
-def hash_password(password: str) -> str:
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# Executed inside the pool workers
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_password(plain: str, hashed: str) -> bool:
+def _verify(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+def _verify_and_update(plain: str, hashed: str):
+    return pwd_context.verify_and_update(plain, hashed)
+
+
+class HashPool:
+    """Bounded process pool for bcrypt with a queue-depth limit and timing metrics"""
+
+    def __init__(self, size: int = HASH_POOL_SIZE, queue_limit: int = HASH_QUEUE_LIMIT):
+        self.size = size
+        self.queue_limit = queue_limit
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timings = {}
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry",
+                    headers={"Retry-After": "1"}
+                )
+            self._in_flight += 1
+
+    def _release(self, op: str, started: float):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            stats = self.timings.setdefault(op, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["count"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    def run(self, op: str, fn, *args):
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            if self.size <= 0:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._release(op, started)
+
+    async def run_async(self, op: str, fn, *args):
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            if self.size <= 0:
+                return await asyncio.to_thread(fn, *args)
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._release(op, started)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pool_size": self.size,
+                "queue_limit": self.queue_limit,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected,
+                "rounds": BCRYPT_ROUNDS,
+                "operations": {
+                    op: dict(stats, avg_seconds=stats["total_seconds"] / stats["count"])
+                    for op, stats in self.timings.items()
+                }
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashPool()
+
+def hash_password(password: str) -> str:
+    return hash_pool.run("hash", _hash, password)
+
+def verify_password(plain: str, hashed: str) -> bool:
+    return hash_pool.run("verify", _verify, plain, hashed)
+
+def verify_and_update_password(plain: str, hashed: str):
+    """(valid, new_hash); new_hash is set when the stored cost differs from BCRYPT_ROUNDS"""
+    return hash_pool.run("verify", _verify_and_update, plain, hashed)
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run_async("hash", _hash, password)
+
+async def verify_and_update_password_async(plain: str, hashed: str):
+    return await hash_pool.run_async("verify", _verify_and_update, plain, hashed)
+
 
 ### JWT Session Management
 
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-import os
 
-SECRET_KEY = os.getenv("JWT_SECRET")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+# Read per call rather than at import, so importing the app never depends on the environment
 
 def create_access_token(data: dict):
+    settings = get_settings()
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.algorithm)
 
 def decode_access_token(token: str):
+    settings = get_settings()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.algorithm])
         return payload
     except JWTError:
         return None
-    
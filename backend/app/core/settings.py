@@ -0,0 +1,171 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from dotenv import load_dotenv
+
+### Application settings
+#
+# Read from the environment once, when the app is created, instead of at import
+# time. Pass a Settings to create_app() to run an app against another database
+# or with other options, e.g. in tests or benchmarks; apps with different
+# settings can run side by side in one process.
+#
+# .env is loaded into the environment here, on first import, so the tuning knobs
+# other modules read with os.getenv at import (BCRYPT_ROUNDS, PG_STATS_MODE, ...)
+# see it too. Those modules import this one before reading them. Variables that
+# are already set win over .env.
+load_dotenv()
+
+def _bool(value: str) -> bool:
+    return value.lower() == "true"
+
+def _list(value: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str | None = None
+    # "sync": def endpoints on the threadpool; "async": async def endpoints on an AsyncEngine
+    db_mode: str = "sync"
+    # Overrides the async URL otherwise derived from database_url
+    async_database_url: str | None = None
+    # Read replicas for GET requests, and how long a client's reads stay on the primary after it writes
+    replica_urls: tuple[str, ...] = ()
+    replica_pin_seconds: int = 5
+
+    ### Connection pool
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    # Connections older than this are replaced at checkout, before the server or pooler drops them
+    pool_recycle: int = 1800
+    # Off by default: a stale connection is detected by the disconnect error instead,
+    # which invalidates the pool, so checkout adds no round trip
+    pool_pre_ping: bool = False
+    # "transaction" when connecting through PgBouncer / the Supabase transaction pooler
+    pooler_mode: str = "session"
+    # "null" hands every checkout straight to the external pooler
+    pool_class: str = "queue"
+
+    ### Auth
+    jwt_secret: str | None = field(default=None, repr=False)
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 60
+
+    ### Rate limits (app/core/rate_limit.py): "requests/seconds" per bucket, "0" disables a rule
+    rate_limit_enabled: bool = True
+    rate_limit_login_ip: str = "20/60"
+    rate_limit_login_email: str = "5/60"
+    rate_limit_signup_ip: str = "20/3600"
+    rate_limit_signup_email: str = "3/3600"
+    rate_limit_invite_ip: str = "60/60"
+    rate_limit_invite_email: str = "30/60"
+    # Every POST/PUT/PATCH/DELETE, per client IP
+    rate_limit_writes_ip: str = "300/60"
+    # "memory": buckets per process; "sqlite:///path": a SQLite file shared by the host's workers
+    rate_limit_store: str = "memory"
+    # Buckets kept by the memory store; the least recently used are dropped (i.e. refilled)
+    rate_limit_max_keys: int = 100000
+    # Take the client IP from the last X-Forwarded-For hop; only behind a proxy that sets it
+    rate_limit_trust_forwarded: bool = False
+
+    ### Load shedding: 503 once this many requests wait for a thread / a DB connection; 0 disables
+    shed_threadpool_queue: int = 64
+    shed_db_pool_queue: int = 32
+
+    cors_origins: tuple[str, ...] = ("http://localhost:3000",)
+    # Per-request query count / DB time in Server-Timing, N+1 and slow-request logging
+    query_stats: bool = True
+
+    @classmethod
+    def from_env(cls, env=None) -> "Settings":
+        """Settings from environment variables (os.environ plus .env by default); unset ones keep their defaults"""
+        if env is None:
+            env = os.environ
+
+        defaults = cls()
+        get = env.get
+        return cls(
+            database_url=get("DATABASE_URL"),
+            db_mode=get("DB_MODE", defaults.db_mode),
+            async_database_url=get("ASYNC_DATABASE_URL"),
+            replica_urls=_list(get("DATABASE_REPLICA_URLS", "")),
+            replica_pin_seconds=int(get("REPLICA_PIN_SECONDS", defaults.replica_pin_seconds)),
+            pool_size=int(get("DB_POOL_SIZE", defaults.pool_size)),
+            max_overflow=int(get("DB_MAX_OVERFLOW", defaults.max_overflow)),
+            pool_timeout=int(get("DB_POOL_TIMEOUT", defaults.pool_timeout)),
+            pool_recycle=int(get("DB_POOL_RECYCLE", defaults.pool_recycle)),
+            pool_pre_ping=_bool(get("DB_POOL_PRE_PING", "false")),
+            pooler_mode=get("DB_POOLER_MODE", defaults.pooler_mode),
+            pool_class=get("DB_POOL_CLASS", defaults.pool_class),
+            jwt_secret=get("JWT_SECRET"),
+            algorithm=get("ALGORITHM") or defaults.algorithm,
+            access_token_expire_minutes=int(get("ACCESS_TOKEN_EXPIRE_MINUTES") or defaults.access_token_expire_minutes),
+            rate_limit_enabled=_bool(get("RATE_LIMIT_ENABLED", "true")),
+            rate_limit_login_ip=get("RATE_LIMIT_LOGIN_IP", defaults.rate_limit_login_ip),
+            rate_limit_login_email=get("RATE_LIMIT_LOGIN_EMAIL", defaults.rate_limit_login_email),
+            rate_limit_signup_ip=get("RATE_LIMIT_SIGNUP_IP", defaults.rate_limit_signup_ip),
+            rate_limit_signup_email=get("RATE_LIMIT_SIGNUP_EMAIL", defaults.rate_limit_signup_email),
+            rate_limit_invite_ip=get("RATE_LIMIT_INVITE_IP", defaults.rate_limit_invite_ip),
+            rate_limit_invite_email=get("RATE_LIMIT_INVITE_EMAIL", defaults.rate_limit_invite_email),
+            rate_limit_writes_ip=get("RATE_LIMIT_WRITES_IP", defaults.rate_limit_writes_ip),
+            rate_limit_store=get("RATE_LIMIT_STORE", defaults.rate_limit_store),
+            rate_limit_max_keys=int(get("RATE_LIMIT_MAX_KEYS", defaults.rate_limit_max_keys)),
+            rate_limit_trust_forwarded=_bool(get("RATE_LIMIT_TRUST_FORWARDED", "false")),
+            shed_threadpool_queue=int(get("SHED_THREADPOOL_QUEUE", defaults.shed_threadpool_queue)),
+            shed_db_pool_queue=int(get("SHED_DB_POOL_QUEUE", defaults.shed_db_pool_queue)),
+            cors_origins=_list(get("CORS_ORIGINS", "")) or defaults.cors_origins,
+            query_stats=_bool(get("QUERY_STATS", "true")),
+        )
+
+    def with_changes(self, **changes) -> "Settings":
+        return replace(self, **changes)
+
+
+_settings: Settings | None = None
+# Set while an app created with these settings handles a request (or its lifespan)
+_app_settings: ContextVar[Settings | None] = ContextVar("app_settings", default=None)
+
+def get_settings() -> Settings:
+    """
+    The settings of the app serving the current request. Elsewhere (scripts,
+    shells) the process default: read from the environment on first use unless
+    configure() set one.
+    """
+    settings = _app_settings.get()
+    if settings is not None:
+        return settings
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+def configure(settings: Settings):
+    global _settings
+    _settings = settings
+
+@contextmanager
+def use_settings(settings: Settings):
+    """Run a block as if inside a request to an app with these settings, e.g. app.state.settings"""
+    token = _app_settings.set(settings)
+    try:
+        yield settings
+    finally:
+        _app_settings.reset(token)
+
+
+class SettingsMiddleware:
+    """
+    Outermost middleware of every app: binds the app's settings for each
+    request, so its endpoints, dependencies, threadpool calls and streamed
+    bodies (which all run in copies of the request's context) use them.
+    """
+    def __init__(self, app, settings: Settings):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope, receive, send):
+        with use_settings(self.settings):
+            await self.app(scope, receive, send)
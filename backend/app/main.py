@@ -1,28 +1,105 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.database import ReadYourWritesMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.rate_limit import AdmissionMiddleware
+from app.core.settings import Settings, SettingsMiddleware
 from app.routers import auth
-from app.routers import pg 
+from app.routers import pg
 from app.routers import room
 from app.routers import bed
 from app.routers import tenant
+from app.routers import layout
+from app.routers import rent
+from app.routers import report
+from app.routers import events
+from app.routers import export
 
-app = FastAPI(title="MyPG Backend")
-
-# Add CORS middleware to allow frontend requests with cookies
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # Frontend URL
-    allow_credentials=True,  # Allow cookies
-    allow_methods=["*"],
-    allow_headers=["*"],
+SYNC_ROUTERS = (
+    auth.router,
+    pg.router,
+    room.router,
+    bed.router,
+    tenant.router,
+    events.router,
+    export.router,
+    layout.router,
+    rent.router,
+    report.router,
 )
 
-app.include_router(auth.router)
-app.include_router(pg.router)
-app.include_router(room.router)
-app.include_router(bed.router)
-app.include_router(tenant.router)
+def _endpoints(routers) -> set[tuple[str, str]]:
+    return {(method, route.path) for router in routers for route in router.routes for method in route.methods}
+
+def _check_async_routes(async_routers):
+    """Every sync route needs its async mirror, or DB_MODE=async would serve it on the sync pool"""
+    missing = _endpoints(SYNC_ROUTERS) - _endpoints(async_routers)
+    if missing:
+        raise RuntimeError(
+            "No async version of: " + ", ".join(f"{method} {path}" for method, path in sorted(missing, key=lambda e: (e[1], e[0])))
+        )
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """
+    Build the application. Settings default to the environment; no engine is
+    created and nothing connects until the first request, so this is cheap
+    enough to run in a preloading server's parent process before it forks.
+    Each app keeps its own settings and engines, so several can share a process.
+    """
+    settings = settings or Settings.from_env()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not set")
+    if not settings.jwt_secret:
+        raise RuntimeError("JWT_SECRET is not set")
+
+    app = FastAPI(title="MyPG Backend")
+    app.state.settings = settings
+
+    # Shed load (503) while the threadpool or connection pool is backed up, and
+    # rate-limit writes per client (429); added first so CORS headers wrap its answers
+    app.add_middleware(AdmissionMiddleware)
+
+    # Add CORS middleware to allow frontend requests with cookies
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),  # Frontend URL
+        allow_credentials=True,  # Allow cookies
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Pin a client's reads to the primary for a few seconds after each of its writes
+    if settings.replica_urls:
+        app.add_middleware(ReadYourWritesMiddleware, pin_seconds=settings.replica_pin_seconds)
+
+    # Per-request query count / DB time in Server-Timing, N+1 and slow-request logging
+    if settings.query_stats:
+        app.add_middleware(QueryStatsMiddleware)
+
+    # Added last, so it runs first: everything below it sees this app's settings
+    app.add_middleware(SettingsMiddleware, settings=settings)
+
+    if settings.db_mode == "async":
+        from app.routers import aio
+        _check_async_routes(aio.routers)
+        routers = aio.routers
+    else:
+        routers = SYNC_ROUTERS
+    for router in routers:
+        app.include_router(router)
+
+    @app.get("/")
+    def root():
+        return {"message": "MyPG backend running"}
+
+    return app
+
 
-@app.get("/")
-def root():
-    return {"message": "MyPG backend running"}
+def __getattr__(name):
+    # `uvicorn app.main:app`: the default app is built from the environment on
+    # first access rather than at import, so create_app can be imported alone
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,3 +4,6 @@ from app.models.room import Room
 from app.models.bed import Bed
 from app.models.tenant import TenantProfile  # if exists
 from app.models.rent import Rent
+from app.models.rent_rollup import RentRollup
+from app.models.occupancy import OccupancyEvent, OccupancyRollup
+from app.models.invite import Invite
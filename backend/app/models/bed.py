@@ -1,15 +1,27 @@
-from sqlalchemy import Column, Integer, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Bed(Base):
     __tablename__ = "beds"
+    __table_args__ = (
+        # Free beds per room, cheapest first, id as the keyset tie-breaker; only
+        # unoccupied rows are indexed, so it stays small as the PGs fill up
+        Index(
+            "ix_beds_free_room_id_rent_id",
+            "room_id",
+            "rent",
+            "id",
+            postgresql_where=text("is_occupied = false"),
+            sqlite_where=text("is_occupied = 0")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     rent = Column(Integer, nullable=False)
     is_occupied = Column(Boolean, default=False)
 
-    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
+    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False, index=True)
 
     room = relationship("Room", back_populates="beds")
     tenant = relationship("TenantProfile", back_populates="bed", uselist=False)
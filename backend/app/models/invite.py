@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from app.core.database import Base
+
+class Invite(Base):
+    """
+    A signup code for one PG. Each signup with the code claims one use; the
+    code stops working after max_uses signups or once expires_at has passed.
+    """
+    __tablename__ = "invites"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, nullable=False, unique=True, index=True)
+    pg_id = Column(Integer, ForeignKey("pgs.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    max_uses = Column(Integer, nullable=False, default=1)
+    uses = Column(Integer, nullable=False, default=0, server_default="0")
+    # None: never expires
+    expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
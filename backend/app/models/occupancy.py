@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Index
+from app.core.database import Base
+
+class OccupancyEvent(Base):
+    """One change to a PG's room / bed / occupied-bed counts, recorded by adjust_pg_counters"""
+    __tablename__ = "occupancy_events"
+    __table_args__ = (
+        Index("ix_occupancy_events_pg_id_occurred_at", "pg_id", "occurred_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    pg_id = Column(Integer, ForeignKey("pgs.id", ondelete="CASCADE"), nullable=False)
+    occurred_at = Column(DateTime, nullable=False)
+    # The event type of the write (bed.created, tenant.assigned, ...), or "baseline"
+    cause = Column(String, nullable=False)
+
+    rooms_delta = Column(Integer, nullable=False, default=0)
+    beds_delta = Column(Integer, nullable=False, default=0)
+    occupied_delta = Column(Integer, nullable=False, default=0)
+
+
+class OccupancyRollup(Base):
+    """
+    Per PG sums of occupancy_events deltas per day and per month, updated in the
+    same transaction as each event. A PG's counts at the end of a period are the
+    running total of its deltas up to and including that period.
+    """
+    __tablename__ = "occupancy_rollups"
+
+    pg_id = Column(Integer, ForeignKey("pgs.id", ondelete="CASCADE"), primary_key=True)
+    # "day" or "month"
+    period = Column(String, primary_key=True)
+    period_start = Column(Date, primary_key=True)
+
+    beds_delta = Column(Integer, nullable=False, default=0)
+    occupied_delta = Column(Integer, nullable=False, default=0)
+    changes = Column(Integer, nullable=False, default=0)
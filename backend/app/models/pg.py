@@ -9,7 +9,15 @@ class PG(Base):
     name = Column(String, nullable=False)
     address = Column(String, nullable=False)
 
-    admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    admin_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    # Occupancy counters, only maintained when PG_STATS_MODE=counters
+    total_rooms = Column(Integer, nullable=False, default=0, server_default="0")
+    total_beds = Column(Integer, nullable=False, default=0, server_default="0")
+    occupied_beds = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Bumped by every write to the PG's rooms, beds or tenants; listings derive ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     rooms = relationship("Room", back_populates="pg", cascade="all, delete")
     admin = relationship("User", back_populates="pgs", foreign_keys=[admin_id])
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, ForeignKey, Enum, String
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Date, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -9,10 +9,19 @@ class RentStatus(str, enum.Enum):
 
 class Rent(Base):
     __tablename__ = "rents"
+    __table_args__ = (
+        # One row per tenant per billing month; makes generation idempotent
+        UniqueConstraint("tenant_id", "month", name="uq_rents_tenant_month"),
+        # Covering index for the report aggregations (amount carried in the leaf on Postgres)
+        Index("ix_rents_tenant_month_status", "tenant_id", "month", "status", postgresql_include=["amount"]),
+        Index("ix_rents_month_status", "month", "status", postgresql_include=["amount", "tenant_id"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
-    month = Column(String, nullable=False)
+    # First day of the billing month
+    month = Column(Date, nullable=False)
     amount = Column(Integer, nullable=False)
     status = Column(Enum(RentStatus), default=RentStatus.DUE)
+    paid_on = Column(Date, nullable=True)
     tenant = relationship("TenantProfile", back_populates="rents")
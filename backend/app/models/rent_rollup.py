@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date
+from app.core.database import Base
+
+class RentRollup(Base):
+    """Per PG per month rent totals, refreshed by rent_service when RENT_ROLLUPS=true"""
+    __tablename__ = "rent_rollups"
+
+    pg_id = Column(Integer, ForeignKey("pgs.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+
+    billed = Column(Integer, nullable=False, default=0)
+    collected = Column(Integer, nullable=False, default=0)
+    rents = Column(Integer, nullable=False, default=0)
+    paid = Column(Integer, nullable=False, default=0)
@@ -8,7 +8,7 @@ class Room(Base):
     id = Column(Integer, primary_key=True, index=True)
     room_number = Column(Integer, nullable=False)
 
-    pg_id = Column(Integer, ForeignKey("pgs.id"), nullable=False)
+    pg_id = Column(Integer, ForeignKey("pgs.id"), nullable=False, index=True)
 
     pg = relationship("PG", back_populates="rooms")
     beds = relationship("Bed", back_populates="room", cascade="all, delete")
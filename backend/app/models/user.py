@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -17,8 +17,16 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum(UserRole), default=UserRole.TENANT)
-    invited_pg_id = Column(Integer, ForeignKey("pgs.id"), nullable=True)
-    invite_code = Column(String, nullable=True, index=True)
+    # The PG whose invite the user signed up with
+    invited_pg_id = Column(Integer, ForeignKey("pgs.id"), nullable=True, index=True)
+
+    __table_args__ = (
+        # Case-insensitive prefix search (tenant_service.search_tenants); text_pattern_ops
+        # lets Postgres serve LIKE 'term%' from them under any collation. Substring
+        # search also uses the pg_trgm indexes that migration 0007 adds where available
+        Index("ix_users_name_lower", func.lower(name).label("name_lower"), postgresql_ops={"name_lower": "text_pattern_ops"}),
+        Index("ix_users_email_lower", func.lower(email).label("email_lower"), postgresql_ops={"email_lower": "text_pattern_ops"}),
+    )
     
     pgs = relationship("PG", back_populates="admin", foreign_keys="[PG.admin_id]")
     invited_pg = relationship("PG", foreign_keys=[invited_pg_id])
@@ -0,0 +1,513 @@
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.auth import get_current_user_async, get_stream_principal_async
+from app.core.events import event_stream
+from app.core.principal_cache import Principal
+from app.core.etag import pg_etag, not_modified
+from app.core.security import hash_pool
+from app.core.rate_limit import limiter
+from app.core.principal_cache import principal_cache
+from app.models.user import User, UserRole
+from app.schemas.user import UserCreate, UserLogin, UserResponse, InviteGenerateRequest, InviteBatchRequest, InviteBatch, InvitePage
+from app.schemas.pg import PGCreate, PGOut
+from app.schemas.room import RoomCreate, RoomResponse
+from app.schemas.bed import BedCreate, BedResponse, AvailableBedPage, VacancySummary
+from app.schemas.tenant import TenantCreate, TenantBatchCreate, TenantOut, TenantPage, TenantSearchPage, AllocationRequest, AllocationPlan
+from app.schemas.layout import LayoutCreate, LayoutOut
+from app.schemas.rent import RentGenerate, RentPay, RentPage, RentStatus
+from app.services import aio
+from app.services.layout_service import parse_layout_csv
+
+### Async mirrors of every sync router, mounted when DB_MODE=async.
+### create_app refuses to start in async mode if a sync route has no mirror here.
+
+auth_router = APIRouter(prefix="/auth", tags=["Auth"])
+pg_router = APIRouter(prefix="/pg", tags=["PG"])
+room_router = APIRouter(prefix="/rooms", tags=["Rooms"])
+bed_router = APIRouter(prefix="/beds", tags=["Beds"])
+tenant_router = APIRouter(prefix="/tenants", tags=["Tenants"])
+events_router = APIRouter(prefix="/events", tags=["Events"])
+export_router = APIRouter(prefix="/export", tags=["Export"])
+layout_router = APIRouter(prefix="/layouts", tags=["Layouts"])
+rent_router = APIRouter(prefix="/rents", tags=["Rents"])
+report_router = APIRouter(prefix="/reports", tags=["Reports"])
+
+routers = [
+    auth_router, pg_router, room_router, bed_router, tenant_router, events_router, export_router,
+    layout_router, rent_router, report_router
+]
+
+
+### Auth
+
+@auth_router.post("/signup")
+async def signup(user: UserCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
+    await limiter.check_async(request, "signup", user.email)
+    token, error = await aio.signup_service(db, user.name, user.email, user.password, user.invite_code)
+
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    return {"access_token": token}
+
+@auth_router.post("/login")
+async def login(user: UserLogin, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    await limiter.check_async(request, "login", user.email)
+    token, error = await aio.login_service(db, user.email, user.password)
+
+    if error:
+        raise HTTPException(status_code=401, detail=error)
+
+    response.set_cookie(
+        key="access_token",
+        value=token,
+        httponly=True,
+        max_age=3600,   # 1 hour
+        samesite="lax"
+    )
+
+    return {"access_token": token, "token_type": "bearer"}
+
+@auth_router.post("/logout")
+async def logout(response: Response):
+    response.delete_cookie(key="access_token", samesite="lax")
+    return {"message": "Logged out successfully"}
+
+@auth_router.get("/me", response_model=UserResponse)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    return current_user
+
+@auth_router.get("/status")
+async def get_status(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await aio.get_user_status(db, current_user)
+
+@auth_router.post("/invite/generate")
+async def generate_invite(
+    request: InviteGenerateRequest,
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    await limiter.check_async(http_request, "invite", current_user.email)
+    result, error = await aio.generate_invite_code(db, request.pg_id, current_user)
+    if error:
+        raise HTTPException(status_code=403, detail=error)
+    return result
+
+@auth_router.post("/invites", response_model=InviteBatch)
+async def generate_invites(
+    request: InviteBatchRequest,
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    await limiter.check_async(http_request, "invite", current_user.email)
+    return await aio.create_invites(
+        db,
+        current_user,
+        request.pg_id,
+        count=request.count,
+        max_uses=request.max_uses,
+        ttl_hours=request.ttl_hours
+    )
+
+@auth_router.get("/invites", response_model=InvitePage)
+async def list_invites(
+    pg_id: int | None = None,
+    active_only: bool = False,
+    cursor: int | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.get_invites(db, current_user, pg_id=pg_id, active_only=active_only, cursor=cursor, limit=limit)
+
+@auth_router.delete("/invites/{invite_id}")
+async def delete_invite(invite_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await aio.revoke_invite(db, current_user, invite_id)
+
+@auth_router.get("/cache/stats")
+async def get_auth_cache_stats(current_user: User = Depends(get_current_user_async)):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view auth cache stats")
+    return principal_cache.stats()
+
+@auth_router.get("/hash/stats")
+async def get_hash_stats(current_user: User = Depends(get_current_user_async)):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view hashing stats")
+    return hash_pool.stats()
+
+@auth_router.get("/limits/stats")
+async def get_limit_stats(current_user: User = Depends(get_current_user_async)):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view rate limit stats")
+    return limiter.stats()
+
+
+### PGs
+
+@pg_router.post("/create", response_model=PGOut)
+async def add_pg(
+    pg: PGCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    # Block tenants from creating PGs
+    if current_user.role == UserRole.TENANT:
+        raise HTTPException(status_code=403, detail="Tenants cannot create PGs")
+    return await aio.create_pg(db, pg, current_user)
+
+@pg_router.get("/get", response_model=list[PGOut])
+async def list_my_pgs(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    # Block tenants from accessing PG list
+    if current_user.role == UserRole.TENANT:
+        raise HTTPException(status_code=403, detail="Tenants cannot access PG management")
+
+    etag = pg_etag("pgs", await aio.get_pg_versions(db, admin_id=current_user.id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return await aio.get_pgs(db, current_user)
+
+@pg_router.get("/{pg_id}/floor-plan")
+async def floor_plan(
+    pg_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    versions = await aio.get_pg_versions(db, admin_id=current_user.id, pg_id=pg_id)
+    if versions:
+        cached = not_modified(request, response, pg_etag("floor-plan", versions))
+        if cached:
+            return cached
+    plan = await aio.get_floor_plan(db, current_user, pg_id)
+    return Response(plan, media_type="application/json", headers=dict(response.headers))
+
+
+### Rooms
+
+@room_router.post("/create", response_model=RoomResponse)
+async def add_room(room: RoomCreate, db: AsyncSession = Depends(get_async_db)):
+    return await aio.create_room(db, room.room_number, room.pg_id)
+
+@room_router.get("/{pg_id}", response_model=list[RoomResponse])
+async def list_rooms(pg_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    cached = not_modified(request, response, pg_etag("rooms", await aio.get_pg_versions(db, pg_id=pg_id)))
+    if cached:
+        return cached
+    return await aio.get_rooms(db, pg_id)
+
+@room_router.delete("/{room_id}")
+async def remove_room(room_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await aio.delete_room(db, room_id)
+
+
+### Beds
+
+@bed_router.get("/available")
+async def list_available_beds(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    etag = pg_etag("available", await aio.get_pg_versions(db, admin_id=current_user.id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return await aio.get_available_beds_grouped(db, current_user)
+
+@bed_router.get("/available/search", response_model=AvailableBedPage)
+async def search_free_beds(
+    request: Request,
+    response: Response,
+    pg_id: int | None = None,
+    room_id: int | None = None,
+    rent_min: int | None = None,
+    rent_max: int | None = None,
+    sort: str = Query(default="rent", pattern="^-?rent$"),
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    etag = pg_etag("available-search", await aio.get_pg_versions(db, admin_id=current_user.id, pg_id=pg_id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return await aio.search_available_beds(
+        db,
+        current_user,
+        pg_id=pg_id,
+        room_id=room_id,
+        rent_min=rent_min,
+        rent_max=rent_max,
+        descending=sort == "-rent",
+        cursor=cursor,
+        limit=limit
+    )
+
+@bed_router.get("/available/summary", response_model=VacancySummary)
+async def free_bed_summary(
+    request: Request,
+    response: Response,
+    pg_id: int | None = None,
+    rent_min: int | None = None,
+    rent_max: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    etag = pg_etag("available-summary", await aio.get_pg_versions(db, admin_id=current_user.id, pg_id=pg_id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return await aio.get_available_beds_summary(db, current_user, pg_id=pg_id, rent_min=rent_min, rent_max=rent_max)
+
+@bed_router.post("/create", response_model=BedResponse)
+async def add_bed(bed: BedCreate, db: AsyncSession = Depends(get_async_db)):
+    return await aio.create_bed(db, bed.rent, bed.room_id)
+
+@bed_router.get("/{room_id}", response_model=list[BedResponse])
+async def list_beds(room_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    cached = not_modified(request, response, pg_etag("beds", await aio.get_pg_versions(db, room_id=room_id)))
+    if cached:
+        return cached
+    return await aio.get_beds(db, room_id)
+
+@bed_router.delete("/{bed_id}")
+async def remove_bed(bed_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await aio.delete_bed(db, bed_id)
+
+
+### Tenants
+
+@tenant_router.get("/unassigned")
+async def list_unassigned_tenants(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await aio.get_unassigned_tenants(db, current_user)
+
+@tenant_router.post("/create", response_model=TenantOut)
+async def add_tenant(
+    tenant: TenantCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.create_tenant(
+        db,
+        tenant.user_id,
+        tenant.bed_id,
+        tenant.move_in_date,
+        current_user
+    )
+
+@tenant_router.post("/batch", response_model=list[TenantOut])
+async def add_tenants(
+    batch: TenantBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.assign_beds(
+        db,
+        [(a.user_id, a.bed_id, a.move_in_date) for a in batch.assignments],
+        current_user
+    )
+
+@tenant_router.post("/allocate", response_model=AllocationPlan)
+async def allocate_unassigned_tenants(
+    request: AllocationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.allocate_beds(
+        db,
+        current_user,
+        request.move_in_date,
+        dry_run=request.dry_run,
+        max_rent=request.max_rent,
+        tenant_max_rent=request.tenant_max_rent,
+        groups=request.groups
+    )
+
+@tenant_router.get("/search", response_model=TenantSearchPage)
+async def search(
+    q: str = Query(min_length=1, max_length=100),
+    pg_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.search_tenants(db, current_user, q, pg_id=pg_id, cursor=cursor, limit=limit)
+
+@tenant_router.get("/", response_model=TenantPage)
+async def list_tenants(
+    cursor: int | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    pg_id: int | None = None,
+    room_id: int | None = None,
+    move_in_from: date | None = None,
+    move_in_to: date | None = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.get_tenants(
+        db,
+        current_user,
+        cursor=cursor,
+        limit=limit,
+        pg_id=pg_id,
+        room_id=room_id,
+        move_in_from=move_in_from,
+        move_in_to=move_in_to,
+        include_total=include_total
+    )
+
+
+### Events
+
+@events_router.get("")
+async def stream_events(principal: Principal = Depends(get_stream_principal_async)):
+    return event_stream(principal)
+
+
+### Export
+
+@export_router.get("/{dataset}")
+async def export(
+    dataset: Literal["tenants", "beds", "rents"],
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    pg_id: int | None = None,
+    month_from: date | None = None,
+    month_to: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.export_response(
+        db,
+        current_user,
+        dataset,
+        fmt=format,
+        compress=gzip,
+        pg_id=pg_id,
+        month_from=month_from,
+        month_to=month_to
+    )
+
+
+### Layouts
+
+@layout_router.post("/{pg_id}", response_model=LayoutOut)
+async def import_layout(
+    pg_id: int,
+    layout: LayoutCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    rooms = [room.model_dump() for room in layout.rooms]
+    return await aio.create_layout(db, pg_id, rooms, current_user)
+
+@layout_router.post("/{pg_id}/csv", response_model=LayoutOut)
+async def import_layout_csv(
+    pg_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    # Body is the raw CSV (Content-Type: text/csv)
+    rooms = parse_layout_csv(await request.body())
+    return await aio.create_layout(db, pg_id, rooms, current_user)
+
+@layout_router.post("/{pg_id}/clone/{source_pg_id}", response_model=LayoutOut)
+async def clone_pg_layout(
+    pg_id: int,
+    source_pg_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.clone_layout(db, source_pg_id, pg_id, current_user)
+
+
+### Rents
+
+@rent_router.post("/generate")
+async def generate_month(
+    request: RentGenerate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.generate_rents(db, current_user, request.month, request.pg_id)
+
+@rent_router.post("/pay")
+async def pay_rents(
+    request: RentPay,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.mark_rents_paid(db, current_user, request.rent_ids, request.paid_on)
+
+@rent_router.get("/", response_model=RentPage)
+async def list_rents(
+    month: date | None = None,
+    status: RentStatus | None = None,
+    pg_id: int | None = None,
+    cursor: int | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.get_rents(db, current_user, month, status, pg_id, cursor, limit)
+
+
+### Reports
+
+@report_router.get("/rents/pgs")
+async def rents_per_pg(
+    month_from: date | None = None,
+    month_to: date | None = None,
+    pg_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.pg_month_report(db, current_user, month_from, month_to, pg_id)
+
+@report_router.get("/rents/pgs/{pg_id}/rooms")
+async def rents_per_room(
+    pg_id: int,
+    month_from: date | None = None,
+    month_to: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.room_report(db, current_user, pg_id, month_from, month_to)
+
+@report_router.get("/rents/trend")
+async def rents_trend(
+    month_from: date | None = None,
+    month_to: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.collection_trend(db, current_user, month_from, month_to)
+
+@report_router.get("/occupancy")
+async def occupancy_trend(
+    pg_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    granularity: str = Query("day", pattern="^(day|month)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await aio.occupancy_series(db, current_user, pg_id, date_from, date_to, granularity)
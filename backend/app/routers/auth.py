@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.orm import Session
-from app.schemas.user import UserCreate, UserLogin, UserResponse, InviteGenerateRequest
+from app.schemas.user import UserCreate, UserLogin, UserResponse, InviteGenerateRequest, InviteBatchRequest, InviteBatch, InvitePage
 from app.core.database import get_db
 from app.services.auth_service import signup_service, login_service, generate_invite_code, get_user_status
-from app.core.auth import get_current_user
-from app.models.user import User
+from app.services.invite_service import create_invites, get_invites, revoke_invite
+from app.core.auth import get_current_user, get_current_principal
+from app.core.security import hash_pool
+from app.core.rate_limit import limiter
+from app.core.principal_cache import Principal, principal_cache
+from app.models.user import User, UserRole
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+def signup(user: UserCreate, request: Request, db: Session = Depends(get_db)):
+    limiter.check(request, "signup", user.email)
     token, error = signup_service(db, user.name, user.email, user.password, user.invite_code)
 
     if error:
@@ -19,7 +24,9 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(user: UserLogin, response: Response, db: Session = Depends(get_db)):
+def login(user: UserLogin, request: Request, response: Response, db: Session = Depends(get_db)):
+    # Before the user lookup and bcrypt verify that a guessing loop would cost
+    limiter.check(request, "login", user.email)
     token, error = login_service(db, user.email, user.password)
 
     if error:
@@ -54,10 +61,64 @@ def get_status(db: Session = Depends(get_db), current_user: User = Depends(get_c
 @router.post("/invite/generate")
 def generate_invite(
     request: InviteGenerateRequest,
+    http_request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    limiter.check(http_request, "invite", current_user.email)
     result, error = generate_invite_code(db, request.pg_id, current_user)
     if error:
         raise HTTPException(status_code=403, detail=error)
     return result
+
+@router.post("/invites", response_model=InviteBatch)
+def generate_invites(
+    request: InviteBatchRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # One rate-limit hit per batch, however many codes it creates
+    limiter.check(http_request, "invite", current_user.email)
+    return create_invites(
+        db,
+        current_user,
+        request.pg_id,
+        count=request.count,
+        max_uses=request.max_uses,
+        ttl_hours=request.ttl_hours
+    )
+
+@router.get("/invites", response_model=InvitePage)
+def list_invites(
+    pg_id: int | None = None,
+    active_only: bool = False,
+    cursor: int | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_invites(db, current_user, pg_id=pg_id, active_only=active_only, cursor=cursor, limit=limit)
+
+@router.delete("/invites/{invite_id}")
+def delete_invite(invite_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return revoke_invite(db, current_user, invite_id)
+
+
+@router.get("/cache/stats")
+def get_auth_cache_stats(principal: Principal = Depends(get_current_principal)):
+    if principal.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view auth cache stats")
+    return principal_cache.stats()
+
+@router.get("/hash/stats")
+def get_hash_stats(principal: Principal = Depends(get_current_principal)):
+    if principal.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view hashing stats")
+    return hash_pool.stats()
+
+@router.get("/limits/stats")
+def get_limit_stats(principal: Principal = Depends(get_current_principal)):
+    if principal.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view rate limit stats")
+    return limiter.stats()
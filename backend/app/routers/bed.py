@@ -1,23 +1,85 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.etag import pg_etag, not_modified
 from app.models.user import User
-from app.schemas.bed import BedCreate, BedResponse
-from app.services.bed_service import create_bed, get_beds, delete_bed, get_available_beds_grouped
+from app.schemas.bed import BedCreate, BedResponse, AvailableBedPage, VacancySummary
+from app.services.bed_service import (
+    create_bed, get_beds, delete_bed, get_available_beds_grouped, search_available_beds, get_available_beds_summary
+)
+from app.services.pg_service import get_pg_versions
 
 router = APIRouter(prefix="/beds", tags=["Beds"])
 
 @router.get("/available")
-def list_available_beds(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_available_beds(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    etag = pg_etag("available", get_pg_versions(db, admin_id=current_user.id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
     return get_available_beds_grouped(db, current_user)
 
+@router.get("/available/search", response_model=AvailableBedPage)
+def search_free_beds(
+    request: Request,
+    response: Response,
+    pg_id: int | None = None,
+    room_id: int | None = None,
+    rent_min: int | None = None,
+    rent_max: int | None = None,
+    sort: str = Query(default="rent", pattern="^-?rent$"),
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    etag = pg_etag("available-search", get_pg_versions(db, admin_id=current_user.id, pg_id=pg_id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return search_available_beds(
+        db,
+        current_user,
+        pg_id=pg_id,
+        room_id=room_id,
+        rent_min=rent_min,
+        rent_max=rent_max,
+        descending=sort == "-rent",
+        cursor=cursor,
+        limit=limit
+    )
+
+@router.get("/available/summary", response_model=VacancySummary)
+def free_bed_summary(
+    request: Request,
+    response: Response,
+    pg_id: int | None = None,
+    rent_min: int | None = None,
+    rent_max: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    etag = pg_etag("available-summary", get_pg_versions(db, admin_id=current_user.id, pg_id=pg_id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return get_available_beds_summary(db, current_user, pg_id=pg_id, rent_min=rent_min, rent_max=rent_max)
+
 @router.post("/create", response_model=BedResponse)
 def add_bed(bed: BedCreate, db: Session = Depends(get_db)):
     return create_bed(db, bed.rent, bed.room_id)
 
 @router.get("/{room_id}", response_model=list[BedResponse])
-def list_beds(room_id: int, db: Session = Depends(get_db)):
+def list_beds(room_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = not_modified(request, response, pg_etag("beds", get_pg_versions(db, room_id=room_id)))
+    if cached:
+        return cached
     return get_beds(db, room_id)
 
 @router.delete("/{bed_id}")
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from app.core.auth import get_stream_principal
+from app.core.events import event_stream
+from app.core.principal_cache import Principal
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+@router.get("")
+async def stream_events(principal: Principal = Depends(get_stream_principal)):
+    """Server-sent events for the caller's PGs: bed/room/tenant changes as they commit"""
+    return event_stream(principal)
@@ -0,0 +1,33 @@
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.services.export_service import export_response
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+@router.get("/{dataset}")
+def export(
+    dataset: Literal["tenants", "beds", "rents"],
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    pg_id: int | None = None,
+    month_from: date | None = None,
+    month_to: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every row of the admin's tenants, beds or rents as CSV or NDJSON"""
+    return export_response(
+        db,
+        current_user,
+        dataset,
+        fmt=format,
+        compress=gzip,
+        pg_id=pg_id,
+        month_from=month_from,
+        month_to=month_to
+    )
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.schemas.layout import LayoutCreate, LayoutOut
+from app.services.layout_service import create_layout, parse_layout_csv, clone_layout
+
+router = APIRouter(prefix="/layouts", tags=["Layouts"])
+
+@router.post("/{pg_id}", response_model=LayoutOut)
+def import_layout(
+    pg_id: int,
+    layout: LayoutCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    rooms = [room.model_dump() for room in layout.rooms]
+    return create_layout(db, pg_id, rooms, current_user)
+
+@router.post("/{pg_id}/csv", response_model=LayoutOut)
+async def import_layout_csv(
+    pg_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Body is the raw CSV (Content-Type: text/csv)
+    rooms = parse_layout_csv(await request.body())
+    return await run_in_threadpool(create_layout, db, pg_id, rooms, current_user)
+
+@router.post("/{pg_id}/clone/{source_pg_id}", response_model=LayoutOut)
+def clone_pg_layout(
+    pg_id: int,
+    source_pg_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return clone_layout(db, source_pg_id, pg_id, current_user)
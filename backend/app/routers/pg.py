@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.etag import pg_etag, not_modified
 from app.schemas.pg import PGCreate, PGOut
-from app.services.pg_service import create_pg, get_pgs
+from app.services.pg_service import create_pg, get_pgs, get_pg_versions, get_floor_plan
 from app.core.auth import get_current_user
 from app.models.user import User, UserRole
 
@@ -25,11 +26,34 @@ def add_pg(
 
 @router.get("/get", response_model=list[PGOut])
 def list_my_pgs(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     # Block tenants from accessing PG list
     if current_user.role == UserRole.TENANT:
         raise HTTPException(status_code=403, detail="Tenants cannot access PG management")
+
+    etag = pg_etag("pgs", get_pg_versions(db, admin_id=current_user.id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
     return get_pgs(db, current_user)
 
+@router.get("/{pg_id}/floor-plan")
+def floor_plan(
+    pg_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Rooms, beds and occupants of one PG in a single response"""
+    versions = get_pg_versions(db, admin_id=current_user.id, pg_id=pg_id)
+    if versions:
+        cached = not_modified(request, response, pg_etag("floor-plan", versions))
+        if cached:
+            return cached
+    # Already-encoded JSON; returned as-is, with the ETag headers set above
+    return Response(get_floor_plan(db, current_user, pg_id), media_type="application/json", headers=dict(response.headers))
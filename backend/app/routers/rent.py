@@ -0,0 +1,38 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.schemas.rent import RentGenerate, RentPay, RentPage, RentStatus
+from app.services.rent_service import generate_rents, mark_rents_paid, get_rents
+
+router = APIRouter(prefix="/rents", tags=["Rents"])
+
+@router.post("/generate")
+def generate_month(
+    request: RentGenerate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return generate_rents(db, current_user, request.month, request.pg_id)
+
+@router.post("/pay")
+def pay_rents(
+    request: RentPay,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return mark_rents_paid(db, current_user, request.rent_ids, request.paid_on)
+
+@router.get("/", response_model=RentPage)
+def list_rents(
+    month: date | None = None,
+    status: RentStatus | None = None,
+    pg_id: int | None = None,
+    cursor: int | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_rents(db, current_user, month, status, pg_id, cursor, limit)
@@ -0,0 +1,50 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.services.report_service import pg_month_report, room_report, collection_trend
+from app.services.occupancy_service import occupancy_series
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+@router.get("/rents/pgs")
+def rents_per_pg(
+    month_from: date | None = None,
+    month_to: date | None = None,
+    pg_id: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return pg_month_report(db, current_user, month_from, month_to, pg_id)
+
+@router.get("/rents/pgs/{pg_id}/rooms")
+def rents_per_room(
+    pg_id: int,
+    month_from: date | None = None,
+    month_to: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return room_report(db, current_user, pg_id, month_from, month_to)
+
+@router.get("/rents/trend")
+def rents_trend(
+    month_from: date | None = None,
+    month_to: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return collection_trend(db, current_user, month_from, month_to)
+
+@router.get("/occupancy")
+def occupancy_trend(
+    pg_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    granularity: str = Query("day", pattern="^(day|month)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return occupancy_series(db, current_user, pg_id, date_from, date_to, granularity)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.etag import pg_etag, not_modified
 from app.schemas.room import RoomCreate, RoomResponse
 from app.services.room_service import create_room, get_rooms, delete_room
+from app.services.pg_service import get_pg_versions
 
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
@@ -11,7 +13,10 @@ def add_room(room: RoomCreate, db: Session = Depends(get_db)):
     return create_room(db, room.room_number, room.pg_id)
 
 @router.get("/{pg_id}", response_model=list[RoomResponse])
-def list_rooms(pg_id: int, db: Session = Depends(get_db)):
+def list_rooms(pg_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = not_modified(request, response, pg_etag("rooms", get_pg_versions(db, pg_id=pg_id)))
+    if cached:
+        return cached
     return get_rooms(db, pg_id)
 
 @router.delete("/{room_id}")
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
-from app.schemas.tenant import TenantCreate, TenantOut
-from app.services.tenant_service import create_tenant, get_tenants, get_unassigned_tenants
+from app.schemas.tenant import TenantCreate, TenantBatchCreate, TenantOut, TenantPage, TenantSearchPage, AllocationRequest, AllocationPlan
+from app.services.allocation_service import allocate_beds
+from app.services.tenant_service import create_tenant, assign_beds, get_tenants, get_unassigned_tenants, search_tenants
 
 router = APIRouter(prefix="/tenants", tags=["Tenants"])
 
@@ -26,6 +28,66 @@ def add_tenant(
         current_user
     )
 
-@router.get("/", response_model=list[TenantOut])
-def list_tenants(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return get_tenants(db, current_user)
+@router.post("/batch", response_model=list[TenantOut])
+def add_tenants(
+    batch: TenantBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Whole intake is assigned in one transaction, or nothing is
+    return assign_beds(
+        db,
+        [(a.user_id, a.bed_id, a.move_in_date) for a in batch.assignments],
+        current_user
+    )
+
+@router.post("/allocate", response_model=AllocationPlan)
+def allocate_unassigned_tenants(
+    request: AllocationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return allocate_beds(
+        db,
+        current_user,
+        request.move_in_date,
+        dry_run=request.dry_run,
+        max_rent=request.max_rent,
+        tenant_max_rent=request.tenant_max_rent,
+        groups=request.groups
+    )
+
+@router.get("/search", response_model=TenantSearchPage)
+def search(
+    q: str = Query(min_length=1, max_length=100),
+    pg_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return search_tenants(db, current_user, q, pg_id=pg_id, cursor=cursor, limit=limit)
+
+@router.get("/", response_model=TenantPage)
+def list_tenants(
+    cursor: int | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    pg_id: int | None = None,
+    room_id: int | None = None,
+    move_in_from: date | None = None,
+    move_in_to: date | None = None,
+    include_total: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_tenants(
+        db,
+        current_user,
+        cursor=cursor,
+        limit=limit,
+        pg_id=pg_id,
+        room_id=room_id,
+        move_in_from=move_in_from,
+        move_in_to=move_in_to,
+        include_total=include_total
+    )
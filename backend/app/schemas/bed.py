@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel
 
 class BedCreate(BaseModel):
@@ -12,3 +13,40 @@ class BedResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class AvailableBed(BaseModel):
+    bed_id: int
+    rent: int
+    room_id: int
+    room_number: int
+    pg_id: int
+
+class PGRef(BaseModel):
+    id: int
+    name: str
+    address: str
+
+class AvailableBedPage(BaseModel):
+    items: list[AvailableBed]
+    pgs: list[PGRef]
+    next_cursor: Optional[str] = None
+
+class RoomVacancy(BaseModel):
+    room_id: int
+    room_number: int
+    free_beds: int
+    min_rent: int
+    max_rent: int
+
+class PGVacancy(BaseModel):
+    pg_id: int
+    pg_name: str
+    pg_address: str
+    free_beds: int
+    min_rent: int
+    max_rent: int
+    rooms: list[RoomVacancy]
+
+class VacancySummary(BaseModel):
+    free_beds: int
+    pgs: list[PGVacancy]
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+class BedSpec(BaseModel):
+    rent: int = Field(ge=0)
+
+class RoomSpec(BaseModel):
+    room_number: int = Field(gt=0)
+    beds: list[BedSpec] = []
+
+class LayoutCreate(BaseModel):
+    rooms: list[RoomSpec]
+
+class RoomLayoutOut(BaseModel):
+    id: int
+    room_number: int
+    bed_ids: list[int]
+
+class LayoutOut(BaseModel):
+    pg_id: int
+    total_rooms: int
+    total_beds: int
+    rooms: list[RoomLayoutOut]
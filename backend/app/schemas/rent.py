@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import Optional
+from enum import Enum
+
+class RentStatus(str, Enum):
+    PAID = "PAID"
+    DUE = "DUE"
+
+class RentGenerate(BaseModel):
+    month: date
+    pg_id: Optional[int] = None
+
+class RentPay(BaseModel):
+    rent_ids: list[int] = Field(min_length=1)
+    paid_on: Optional[date] = None
+
+class RentOut(BaseModel):
+    id: int
+    tenant_id: int
+    month: date
+    amount: int
+    status: RentStatus
+    paid_on: Optional[date] = None
+    user_name: str
+    room_number: int
+    pg_name: str
+
+class RentPage(BaseModel):
+    items: list[RentOut]
+    next_cursor: Optional[int] = None
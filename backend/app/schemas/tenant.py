@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Optional
 from datetime import date
 
 class TenantCreate(BaseModel):
@@ -6,6 +7,9 @@ class TenantCreate(BaseModel):
     bed_id: int
     move_in_date: date
 
+class TenantBatchCreate(BaseModel):
+    assignments: list[TenantCreate] = Field(min_length=1)
+
 class TenantOut(BaseModel):
     id: int
     user_id: int
@@ -18,3 +22,51 @@ class TenantOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+class TenantPage(BaseModel):
+    items: list[TenantOut]
+    next_cursor: Optional[int] = None
+    total: Optional[int] = None
+
+class TenantSearchResult(BaseModel):
+    user_id: int
+    name: str
+    email: str
+    pg_id: int
+    pg_name: str
+    # Unset for invited users who have no bed yet
+    tenant_id: Optional[int] = None
+    bed_id: Optional[int] = None
+    move_in_date: Optional[date] = None
+    room_id: Optional[int] = None
+    room_number: Optional[int] = None
+    rank: int
+
+class TenantSearchPage(BaseModel):
+    items: list[TenantSearchResult]
+    next_cursor: Optional[str] = None
+
+class AllocationRequest(BaseModel):
+    move_in_date: date
+    dry_run: bool = True
+    max_rent: Optional[int] = None
+    tenant_max_rent: dict[int, int] = {}
+    groups: list[list[int]] = []
+
+class AllocationItem(BaseModel):
+    user_id: int
+    user_name: str
+    bed_id: int
+    rent: int
+    room_id: int
+    room_number: int
+    pg_id: int
+
+class UnplacedTenant(BaseModel):
+    user_id: int
+    reason: str
+
+class AllocationPlan(BaseModel):
+    applied: bool
+    assignments: list[AllocationItem]
+    unplaced: list[UnplacedTenant]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
+from datetime import datetime
 from enum import Enum
 
 ### Pydantic Schemas for User :- Used for data validation and serialization
@@ -29,3 +30,29 @@ class UserResponse(BaseModel):
 
 class InviteGenerateRequest(BaseModel):
     pg_id: int
+
+class InviteBatchRequest(BaseModel):
+    pg_id: int
+    count: int = Field(default=1, ge=1)
+    # Signups each code allows
+    max_uses: int = Field(default=1, ge=1)
+    # Hours until the codes expire; 0 = never, unset = INVITE_TTL_HOURS
+    ttl_hours: Optional[int] = Field(default=None, ge=0)
+
+class InviteOut(BaseModel):
+    id: int
+    code: str
+    pg_id: int
+    max_uses: int
+    uses: int
+    expires_at: Optional[datetime] = None
+    created_at: datetime
+
+class InviteBatch(BaseModel):
+    pg_id: int
+    pg_name: str
+    invites: list[InviteOut]
+
+class InvitePage(BaseModel):
+    items: list[InviteOut]
+    next_cursor: Optional[int] = None
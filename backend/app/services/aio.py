@@ -0,0 +1,211 @@
+"""
+Async versions of the service functions, used when DB_MODE=async.
+
+Database work runs through AsyncSession.run_sync, so the sync service code is
+reused as-is while its I/O is awaited on the async driver instead of holding a
+threadpool slot. Results are serialized inside run_sync, because lazy loads
+cannot happen once control is back on the event loop.
+"""
+from functools import lru_cache
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.core.security import hash_password_async, verify_and_update_password_async, create_access_token
+from app.schemas.user import InviteBatch, InvitePage
+from app.schemas.pg import PGOut
+from app.schemas.room import RoomResponse
+from app.schemas.bed import BedResponse
+from app.schemas.tenant import TenantOut, TenantPage, TenantSearchPage, AllocationPlan
+from app.schemas.layout import LayoutOut
+from app.schemas.rent import RentPage
+from app.services import (
+    allocation_service, auth_service, export_service, invite_service, pg_service, room_service, bed_service,
+    tenant_service, layout_service, rent_service, report_service, occupancy_service
+)
+
+@lru_cache(maxsize=None)
+def _adapter(response_model):
+    return TypeAdapter(response_model)
+
+async def _call(db: AsyncSession, fn, *args, response_model=None, **kwargs):
+    def run(session):
+        result = fn(session, *args, **kwargs)
+        if response_model is None:
+            return result
+        return _adapter(response_model).validate_python(result, from_attributes=True)
+
+    return await db.run_sync(run)
+
+
+### Auth
+
+async def signup_service(db: AsyncSession, name: str, email: str, password: str, invite_code: str = None):
+    existing = await db.scalar(select(User.id).where(User.email == email))
+    if existing:
+        return None, "Email already registered"
+
+    password_hash = await hash_password_async(password)
+    return await _call(db, auth_service.create_user, name, email, password_hash, invite_code)
+
+async def login_service(db: AsyncSession, email: str, password: str):
+    db_user = await db.scalar(select(User).where(User.email == email))
+    if not db_user:
+        return None, "Invalid email or password"
+
+    valid, new_hash = await verify_and_update_password_async(password, db_user.password_hash)
+    if not valid:
+        return None, "Invalid email or password"
+
+    # Transparent rehash when BCRYPT_ROUNDS changed since this hash was stored
+    if new_hash:
+        db_user.password_hash = new_hash
+        await db.commit()
+
+    token = create_access_token({"sub": str(db_user.id)})
+
+    return token, None
+
+async def generate_invite_code(db: AsyncSession, pg_id: int, admin_user: User):
+    return await _call(db, auth_service.generate_invite_code, pg_id, admin_user)
+
+async def get_user_status(db: AsyncSession, user: User):
+    return await _call(db, auth_service.get_user_status, user)
+
+async def create_invites(db: AsyncSession, admin_user: User, pg_id: int, **options):
+    return await _call(db, invite_service.create_invites, admin_user, pg_id, response_model=InviteBatch, **options)
+
+async def get_invites(db: AsyncSession, admin_user: User, **filters):
+    return await _call(db, invite_service.get_invites, admin_user, response_model=InvitePage, **filters)
+
+async def revoke_invite(db: AsyncSession, admin_user: User, invite_id: int):
+    return await _call(db, invite_service.revoke_invite, admin_user, invite_id)
+
+
+### PGs
+
+async def create_pg(db: AsyncSession, pg_data, current_user: User):
+    return await _call(db, pg_service.create_pg, pg_data, current_user, response_model=PGOut)
+
+async def get_pgs(db: AsyncSession, current_user: User = None):
+    return await _call(db, pg_service.get_pgs, current_user, response_model=list[PGOut])
+
+async def get_pg_versions(db: AsyncSession, **filters):
+    return await _call(db, pg_service.get_pg_versions, **filters)
+
+async def get_floor_plan(db: AsyncSession, current_user: User, pg_id: int) -> bytes:
+    return await _call(db, pg_service.get_floor_plan, current_user, pg_id)
+
+
+### Rooms
+
+async def create_room(db: AsyncSession, room_number: int, pg_id: int):
+    return await _call(db, room_service.create_room, room_number, pg_id, response_model=RoomResponse)
+
+async def get_rooms(db: AsyncSession, pg_id: int):
+    return await _call(db, room_service.get_rooms, pg_id, response_model=list[RoomResponse])
+
+async def delete_room(db: AsyncSession, room_id: int):
+    return await _call(db, room_service.delete_room, room_id)
+
+
+### Beds
+
+async def get_available_beds_grouped(db: AsyncSession, current_user: User = None):
+    return await _call(db, bed_service.get_available_beds_grouped, current_user)
+
+async def search_available_beds(db: AsyncSession, current_user: User, **filters):
+    return await _call(db, bed_service.search_available_beds, current_user, **filters)
+
+async def get_available_beds_summary(db: AsyncSession, current_user: User, **filters):
+    return await _call(db, bed_service.get_available_beds_summary, current_user, **filters)
+
+async def create_bed(db: AsyncSession, rent, room_id: int):
+    return await _call(db, bed_service.create_bed, rent, room_id, response_model=BedResponse)
+
+async def get_beds(db: AsyncSession, room_id: int):
+    return await _call(db, bed_service.get_beds, room_id, response_model=list[BedResponse])
+
+async def delete_bed(db: AsyncSession, bed_id: int):
+    return await _call(db, bed_service.delete_bed, bed_id)
+
+
+### Tenants
+
+async def get_unassigned_tenants(db: AsyncSession, current_user: User = None):
+    return await _call(db, tenant_service.get_unassigned_tenants, current_user)
+
+async def create_tenant(db: AsyncSession, user_id: int, bed_id: int, move_in_date, current_user: User = None):
+    return await _call(
+        db,
+        tenant_service.create_tenant,
+        user_id,
+        bed_id,
+        move_in_date,
+        current_user,
+        response_model=TenantOut
+    )
+
+async def assign_beds(db: AsyncSession, assignments: list, current_user: User = None):
+    return await _call(db, tenant_service.assign_beds, assignments, current_user, response_model=list[TenantOut])
+
+async def get_tenants(db: AsyncSession, current_user: User = None, **filters):
+    return await _call(db, tenant_service.get_tenants, current_user, response_model=TenantPage, **filters)
+
+async def search_tenants(db: AsyncSession, current_user: User, q: str, **filters):
+    return await _call(db, tenant_service.search_tenants, current_user, q, response_model=TenantSearchPage, **filters)
+
+async def allocate_beds(db: AsyncSession, current_user: User, move_in_date, **options):
+    return await _call(db, allocation_service.allocate_beds, current_user, move_in_date, response_model=AllocationPlan, **options)
+
+
+### Layouts
+
+async def create_layout(db: AsyncSession, pg_id: int, rooms: list[dict], current_user: User):
+    return await _call(db, layout_service.create_layout, pg_id, rooms, current_user, response_model=LayoutOut)
+
+async def clone_layout(db: AsyncSession, source_pg_id: int, target_pg_id: int, current_user: User):
+    return await _call(db, layout_service.clone_layout, source_pg_id, target_pg_id, current_user, response_model=LayoutOut)
+
+
+### Rents
+
+async def generate_rents(db: AsyncSession, current_user: User, month, pg_id: int = None):
+    return await _call(db, rent_service.generate_rents, current_user, month, pg_id)
+
+async def mark_rents_paid(db: AsyncSession, current_user: User, rent_ids: list[int], paid_on=None):
+    return await _call(db, rent_service.mark_rents_paid, current_user, rent_ids, paid_on)
+
+async def get_rents(db: AsyncSession, current_user: User, *filters):
+    return await _call(db, rent_service.get_rents, current_user, *filters, response_model=RentPage)
+
+
+### Reports
+
+async def pg_month_report(db: AsyncSession, current_user: User, *filters):
+    return await _call(db, report_service.pg_month_report, current_user, *filters)
+
+async def room_report(db: AsyncSession, current_user: User, pg_id: int, *filters):
+    return await _call(db, report_service.room_report, current_user, pg_id, *filters)
+
+async def collection_trend(db: AsyncSession, current_user: User, *filters):
+    return await _call(db, report_service.collection_trend, current_user, *filters)
+
+async def occupancy_series(db: AsyncSession, current_user: User, *filters):
+    return await _call(db, occupancy_service.occupancy_series, current_user, *filters)
+
+
+### Export
+
+async def _stream_export(db: AsyncSession, export: export_service.Export):
+    # AsyncSession.stream keeps the cursor server-side (asyncpg), as yield_per does on the sync path
+    encoder = export.encoder()
+    yield encoder.header()
+    result = await db.stream(export.statement)
+    async for rows in result.partitions():
+        yield encoder.batch(rows)
+    yield encoder.end()
+
+async def export_response(db: AsyncSession, current_user: User, dataset: str, **options):
+    export = await _call(db, export_service.prepare_export, current_user, dataset, **options)
+    return export.response(_stream_export(db, export))
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.services.bed_service import get_available_beds_grouped
+from app.services.tenant_service import get_unassigned_tenants, assign_beds
+
+def _fits(beds: list, ceilings: list) -> bool:
+    """Cheapest beds matched to the lowest ceilings, both sorted ascending"""
+    return all(bed["rent"] <= ceiling for bed, ceiling in zip(beds, ceilings))
+
+def plan_allocation(
+    db: Session,
+    current_user: User,
+    max_rent: int = None,
+    tenant_max_rent: dict = None,
+    groups: list = None
+):
+    """
+    Match every unassigned tenant of the admin's PGs to a free bed in the PG
+    they were invited to, from two queries and without touching the database
+    per tenant.
+
+    - max_rent / tenant_max_rent: rent ceiling for everyone / per user id
+    - groups: lists of user ids that must share a room
+    """
+    tenant_max_rent = tenant_max_rent or {}
+    tenants = {t["id"]: t for t in get_unassigned_tenants(db, current_user)}
+    free_beds = get_available_beds_grouped(db, current_user)
+
+    def ceiling(user_id):
+        limit = tenant_max_rent.get(user_id, max_rent)
+        return float("inf") if limit is None else limit
+
+    # pg_id -> room_id -> free beds, cheapest first
+    rooms_by_pg = defaultdict(lambda: defaultdict(list))
+    for bed in sorted(free_beds, key=lambda b: (b["rent"], b["bed_id"])):
+        rooms_by_pg[bed["pg_id"]][bed["room_id"]].append(bed)
+
+    assignments = []
+    unplaced = []
+
+    def place(user_id, bed):
+        tenant = tenants[user_id]
+        assignments.append({
+            "user_id": user_id,
+            "user_name": tenant["name"],
+            "bed_id": bed["bed_id"],
+            "rent": bed["rent"],
+            "room_id": bed["room_id"],
+            "room_number": bed["room_number"],
+            "pg_id": bed["pg_id"]
+        })
+
+    # Groups first, largest first, each into the tightest room that fits
+    grouped = set()
+    for group in sorted(groups or [], key=len, reverse=True):
+        members = [user_id for user_id in dict.fromkeys(group) if user_id not in grouped]
+        grouped.update(members)
+
+        unknown = [user_id for user_id in members if user_id not in tenants]
+        pg_ids = {tenants[user_id]["invited_pg_id"] for user_id in members if user_id in tenants}
+        if unknown or len(pg_ids) != 1:
+            reason = "Not an unassigned tenant of your PGs" if unknown else "Group members were invited to different PGs"
+            unplaced.extend({"user_id": user_id, "reason": reason} for user_id in members)
+            continue
+
+        members.sort(key=ceiling)
+        ceilings = [ceiling(user_id) for user_id in members]
+        rooms = rooms_by_pg[pg_ids.pop()]
+        candidates = [
+            room_id for room_id, beds in rooms.items()
+            if len(beds) >= len(members) and _fits(beds, ceilings)
+        ]
+        if not candidates:
+            unplaced.extend({"user_id": user_id, "reason": "No room with enough free beds for the group"} for user_id in members)
+            continue
+
+        room_id = min(candidates, key=lambda r: len(rooms[r]))
+        beds = rooms[room_id]
+        for user_id, bed in zip(members, beds):
+            place(user_id, bed)
+        del beds[:len(members)]
+
+    # Everyone else: per PG, most constrained tenant first takes the cheapest bed left.
+    # With beds and ceilings both ascending this places the maximum number of tenants.
+    singles_by_pg = defaultdict(list)
+    for user_id, tenant in tenants.items():
+        if user_id not in grouped:
+            singles_by_pg[tenant["invited_pg_id"]].append(user_id)
+
+    for pg_id, user_ids in singles_by_pg.items():
+        beds = sorted(
+            (bed for room_beds in rooms_by_pg[pg_id].values() for bed in room_beds),
+            key=lambda b: (b["rent"], b["bed_id"])
+        )
+        next_bed = 0
+        for user_id in sorted(user_ids, key=lambda u: (ceiling(u), u)):
+            if next_bed < len(beds) and beds[next_bed]["rent"] <= ceiling(user_id):
+                place(user_id, beds[next_bed])
+                next_bed += 1
+            else:
+                reason = "No free bed left in the invited PG" if next_bed >= len(beds) else "No free bed within the rent ceiling"
+                unplaced.append({"user_id": user_id, "reason": reason})
+
+    return {"assignments": assignments, "unplaced": unplaced}
+
+def allocate_beds(
+    db: Session,
+    current_user: User,
+    move_in_date,
+    dry_run: bool = True,
+    max_rent: int = None,
+    tenant_max_rent: dict = None,
+    groups: list = None
+):
+    """Plan the allocation and, unless dry_run, commit all of it in one transaction"""
+    plan = plan_allocation(db, current_user, max_rent, tenant_max_rent, groups)
+    plan["applied"] = False
+
+    if not dry_run and plan["assignments"]:
+        assign_beds(
+            db,
+            [(a["user_id"], a["bed_id"], move_in_date) for a in plan["assignments"]],
+            current_user
+        )
+        plan["applied"] = True
+
+    return plan
@@ -1,44 +1,35 @@
 from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
-from app.models.pg import PG
 from app.models.tenant import TenantProfile
-from app.core.security import hash_password, verify_password, create_access_token
-import secrets
+from app.core.security import hash_password, verify_and_update_password, create_access_token
+from app.services.invite_service import claim_invite, create_invites
 
 def signup_service(db: Session, name: str, email: str, password: str, invite_code: str = None):
     existing = db.query(User).filter(User.email == email).first()
     if existing:
         return None, "Email already registered"
 
-    invited_pg_id = None
-    invite_admin = None
-    
-    # If invite code provided, validate and get PG
-    if invite_code:
-        admin = db.query(User).filter(User.invite_code == invite_code).first()
-        if not admin:
-            return None, "Invalid invite code"
+    return create_user(db, name, email, hash_password(password), invite_code)
 
-        invited_pg_id = admin.invited_pg_id
-        if not invited_pg_id:
-            return None, "Invite code is not linked to a PG"
+def create_user(db: Session, name: str, email: str, password_hash: str, invite_code: str = None):
+    """Signup after the email check and password hashing"""
+    invited_pg_id = None
 
-        invite_admin = admin
+    # Claim one use of the invite; rolled back with the signup if the insert fails
+    if invite_code:
+        invited_pg_id, error = claim_invite(db, invite_code)
+        if error:
+            db.rollback()
+            return None, error
 
     new_user = User(
         name=name,
         email=email,
-        password_hash=hash_password(password),
+        password_hash=password_hash,
         invited_pg_id=invited_pg_id
     )
 
     db.add(new_user)
-
-    # Single-use invite: invalidate code after first successful signup
-    if invite_admin:
-        invite_admin.invite_code = None
-        invite_admin.invited_pg_id = None
-
     db.commit()
     db.refresh(new_user)
 
@@ -47,21 +38,12 @@ def signup_service(db: Session, name: str, email: str, password: str, invite_cod
     return token, None
 
 def generate_invite_code(db: Session, pg_id: int, admin_user: User):
-    # Verify admin owns this PG
-    pg = db.query(PG).filter(PG.id == pg_id, PG.admin_id == admin_user.id).first()
-    if not pg:
-        return None, "PG not found or not authorized"
-    
-    # Generate unique code
-    invite_code = secrets.token_urlsafe(12)
-    
-    # Update admin's invite code
-    admin_user.invite_code = invite_code
-    admin_user.invited_pg_id = pg_id
-    db.commit()
-    db.refresh(admin_user)
-    
-    return {"invite_code": invite_code, "pg_name": pg.name}, None
+    """
+    One single-use code that never expires, as before the invites table; see
+    invite_service.create_invites for batches, multi-use and expiring codes
+    """
+    batch = create_invites(db, admin_user, pg_id, ttl_hours=0)
+    return {"invite_code": batch["invites"][0]["code"], "pg_name": batch["pg_name"]}, None
 
 
 def login_service(db: Session, email: str, password: str):
@@ -69,9 +51,15 @@ def login_service(db: Session, email: str, password: str):
     if not db_user:
         return None, "Invalid email or password"
 
-    if not verify_password(password, db_user.password_hash):
+    valid, new_hash = verify_and_update_password(password, db_user.password_hash)
+    if not valid:
         return None, "Invalid email or password"
 
+    # Transparent rehash when BCRYPT_ROUNDS changed since this hash was stored
+    if new_hash:
+        db_user.password_hash = new_hash
+        db.commit()
+
     token = create_access_token({"sub": str(db_user.id)})
 
     return token, None
@@ -1,8 +1,11 @@
+from sqlalchemy import select, func, tuple_, true
 from sqlalchemy.orm import Session, joinedload
 from app.models.bed import Bed
 from app.models.room import Room
 from app.models.pg import PG
 from app.models.user import User
+from app.services.pg_service import adjust_pg_counters
+from app.core import events
 from fastapi import HTTPException
 
 def get_available_beds_grouped(db: Session, current_user: User = None):
@@ -39,9 +42,159 @@ def get_available_beds_grouped(db: Session, current_user: User = None):
     
     return result
 
+def _parse_cursor(cursor: str):
+    try:
+        rent, bed_id = cursor.split(":")
+        return int(rent), int(bed_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def search_available_beds(
+    db: Session,
+    current_user: User,
+    pg_id: int = None,
+    room_id: int = None,
+    rent_min: int = None,
+    rent_max: int = None,
+    descending: bool = False,
+    cursor: str = None,
+    limit: int = 20
+):
+    """
+    Free beds of the admin's PGs ordered by (rent, id), keyset-paginated.
+    Pass the returned next_cursor ("rent:bed_id") back as cursor for the next page.
+
+    On Postgres each room contributes at most limit + 1 beds through a LATERAL
+    subquery, an index range scan on ix_beds_free_room_id_rent_id, so the
+    cheapest beds of a PG are found without reading all of its free beds.
+    """
+    conditions = [Bed.is_occupied == False]
+    if rent_min is not None:
+        conditions.append(Bed.rent >= rent_min)
+    if rent_max is not None:
+        conditions.append(Bed.rent <= rent_max)
+    if cursor is not None:
+        after = tuple_(*_parse_cursor(cursor))
+        conditions.append(tuple_(Bed.rent, Bed.id) < after if descending else tuple_(Bed.rent, Bed.id) > after)
+
+    def ordered(rent, bed_id):
+        return (rent.desc(), bed_id.desc()) if descending else (rent, bed_id)
+
+    lateral = db.get_bind().dialect.name == "postgresql"
+    if lateral:
+        beds = select(Bed.id, Bed.rent).where(
+            Bed.room_id == Room.id, *conditions
+        ).order_by(*ordered(Bed.rent, Bed.id)).limit(limit + 1).lateral("free_beds")
+        bed_id, rent = beds.c.id, beds.c.rent
+    else:
+        bed_id, rent = Bed.id, Bed.rent
+
+    stmt = select(
+        bed_id.label("bed_id"), rent.label("rent"), Room.id.label("room_id"), Room.room_number,
+        PG.id.label("pg_id"), PG.name.label("pg_name"), PG.address.label("pg_address")
+    ).select_from(Room).join(
+        PG, Room.pg_id == PG.id
+    ).where(
+        PG.admin_id == current_user.id
+    )
+    if lateral:
+        stmt = stmt.join(beds, true())
+    else:
+        stmt = stmt.join(Bed, Bed.room_id == Room.id).where(*conditions)
+    if pg_id is not None:
+        stmt = stmt.where(Room.pg_id == pg_id)
+    if room_id is not None:
+        stmt = stmt.where(Room.id == room_id)
+
+    rows = db.execute(stmt.order_by(*ordered(rent, bed_id)).limit(limit + 1)).all()
+
+    page = {"items": [], "pgs": [], "next_cursor": None}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        page["next_cursor"] = f"{rows[-1].rent}:{rows[-1].bed_id}"
+
+    # PG name and address once per PG on the page, not per bed
+    pgs = {}
+    for row in rows:
+        page["items"].append({
+            "bed_id": row.bed_id,
+            "rent": row.rent,
+            "room_id": row.room_id,
+            "room_number": row.room_number,
+            "pg_id": row.pg_id
+        })
+        pgs.setdefault(row.pg_id, {"id": row.pg_id, "name": row.pg_name, "address": row.pg_address})
+    page["pgs"] = list(pgs.values())
+    return page
+
+def get_available_beds_summary(
+    db: Session,
+    current_user: User,
+    pg_id: int = None,
+    rent_min: int = None,
+    rent_max: int = None
+):
+    """Free bed counts and rent range per PG and per room, from one grouped query over the partial index"""
+    stmt = select(
+        PG.id.label("pg_id"), PG.name.label("pg_name"), PG.address.label("pg_address"),
+        Room.id.label("room_id"), Room.room_number,
+        func.count(Bed.id).label("free_beds"),
+        func.min(Bed.rent).label("min_rent"),
+        func.max(Bed.rent).label("max_rent")
+    ).select_from(Bed).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    ).where(
+        PG.admin_id == current_user.id,
+        Bed.is_occupied == False
+    )
+    if pg_id is not None:
+        stmt = stmt.where(Room.pg_id == pg_id)
+    if rent_min is not None:
+        stmt = stmt.where(Bed.rent >= rent_min)
+    if rent_max is not None:
+        stmt = stmt.where(Bed.rent <= rent_max)
+    stmt = stmt.group_by(PG.id, PG.name, PG.address, Room.id, Room.room_number).order_by(PG.id, Room.room_number)
+
+    pgs = {}
+    for row in db.execute(stmt):
+        pg = pgs.get(row.pg_id)
+        if pg is None:
+            pg = pgs[row.pg_id] = {
+                "pg_id": row.pg_id,
+                "pg_name": row.pg_name,
+                "pg_address": row.pg_address,
+                "free_beds": 0,
+                "min_rent": row.min_rent,
+                "max_rent": row.max_rent,
+                "rooms": []
+            }
+        pg["free_beds"] += row.free_beds
+        pg["min_rent"] = min(pg["min_rent"], row.min_rent)
+        pg["max_rent"] = max(pg["max_rent"], row.max_rent)
+        pg["rooms"].append({
+            "room_id": row.room_id,
+            "room_number": row.room_number,
+            "free_beds": row.free_beds,
+            "min_rent": row.min_rent,
+            "max_rent": row.max_rent
+        })
+
+    return {
+        "free_beds": sum(pg["free_beds"] for pg in pgs.values()),
+        "pgs": list(pgs.values())
+    }
+
+def _room_pg_id(room_id: int):
+    return select(Room.pg_id).where(Room.id == room_id).scalar_subquery()
+
 def create_bed(db: Session, rent, room_id: int):
     bed = Bed(rent=rent, room_id=room_id)
     db.add(bed)
+    db.flush()
+    pg = adjust_pg_counters(db, _room_pg_id(room_id), beds=1, cause=events.BED_CREATED)
+    events.emit(db, events.BED_CREATED, pg, bed_id=bed.id, room_id=room_id, rent=rent)
     db.commit()
     db.refresh(bed)
     return bed
@@ -69,6 +222,8 @@ def delete_bed(db: Session, bed_id: int):
     if bed.is_occupied:
         raise HTTPException(status_code=400, detail="Cannot delete an occupied bed")
     
+    pg = adjust_pg_counters(db, _room_pg_id(bed.room_id), beds=-1, cause=events.BED_DELETED)
+    events.emit(db, events.BED_DELETED, pg, bed_id=bed.id, room_id=bed.room_id)
     db.delete(bed)
     db.commit()
     return {"message": "Bed deleted successfully"}
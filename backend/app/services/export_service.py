@@ -0,0 +1,217 @@
+import io
+import os
+import csv
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import date
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session
+from app.models.tenant import TenantProfile
+from app.models.bed import Bed
+from app.models.room import Room
+from app.models.pg import PG
+from app.models.rent import Rent
+from app.models.user import User, UserRole
+from app.services.rent_service import month_start
+
+# Rows fetched from the server-side cursor and encoded per chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+# zlib level for gzip=true; 1 is several times faster than 6 for a little more output
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+DATASETS = ("tenants", "beds", "rents")
+FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+### Statements
+
+def _tenants():
+    return select(
+        TenantProfile.id.label("tenant_id"),
+        User.id.label("user_id"),
+        User.name.label("user_name"),
+        User.email.label("user_email"),
+        TenantProfile.move_in_date,
+        Bed.id.label("bed_id"),
+        Bed.rent,
+        Room.id.label("room_id"),
+        Room.room_number,
+        PG.id.label("pg_id"),
+        PG.name.label("pg_name")
+    ).select_from(TenantProfile).join(
+        User, TenantProfile.user_id == User.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    )
+
+def _beds():
+    return select(
+        Bed.id.label("bed_id"),
+        Bed.rent,
+        Bed.is_occupied,
+        Room.id.label("room_id"),
+        Room.room_number,
+        PG.id.label("pg_id"),
+        PG.name.label("pg_name"),
+        TenantProfile.id.label("tenant_id"),
+        TenantProfile.user_id
+    ).select_from(Bed).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    ).outerjoin(
+        TenantProfile, TenantProfile.bed_id == Bed.id
+    )
+
+def _rents():
+    return select(
+        Rent.id.label("rent_id"),
+        Rent.month,
+        Rent.amount,
+        # The enum's value rather than its repr in CSV
+        cast(Rent.status, String).label("status"),
+        Rent.paid_on,
+        TenantProfile.id.label("tenant_id"),
+        User.id.label("user_id"),
+        User.name.label("user_name"),
+        Room.room_number,
+        PG.id.label("pg_id"),
+        PG.name.label("pg_name")
+    ).select_from(Rent).join(
+        TenantProfile, Rent.tenant_id == TenantProfile.id
+    ).join(
+        User, TenantProfile.user_id == User.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    )
+
+_STATEMENTS = {"tenants": _tenants, "beds": _beds, "rents": _rents}
+
+
+### Encoding
+
+class ExportEncoder:
+    """CSV or NDJSON bytes for one export, a chunk per batch of rows, optionally gzip-compressed"""
+
+    def __init__(self, columns: list[str], fmt: str, compress: bool):
+        self.columns = columns
+        self.fmt = fmt
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        # wbits 31: gzip container
+        self._zip = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    def _encode(self, text: str) -> bytes:
+        data = text.encode()
+        if self._zip is None:
+            return data
+        # Sync-flush every chunk so the client receives it now rather than when zlib's window fills
+        return self._zip.compress(data) + self._zip.flush(zlib.Z_SYNC_FLUSH)
+
+    def header(self) -> bytes:
+        return self._encode(",".join(self.columns) + "\n" if self.fmt == "csv" else "")
+
+    def batch(self, rows) -> bytes:
+        if self.fmt == "csv":
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            self._writer.writerows(rows)
+            return self._encode(self._buffer.getvalue())
+        return self._encode("".join(
+            json.dumps(dict(zip(self.columns, row)), default=str) + "\n" for row in rows
+        ))
+
+    def end(self) -> bytes:
+        return self._zip.flush() if self._zip is not None else b""
+
+
+@dataclass
+class Export:
+    statement: object
+    columns: list[str]
+    fmt: str
+    compress: bool
+    filename: str
+
+    def encoder(self) -> ExportEncoder:
+        return ExportEncoder(self.columns, self.fmt, self.compress)
+
+    def response(self, body) -> StreamingResponse:
+        return StreamingResponse(
+            body,
+            media_type="application/gzip" if self.compress else FORMATS[self.fmt],
+            headers={
+                "Content-Disposition": f'attachment; filename="{self.filename}"',
+                "Cache-Control": "no-store",
+                "X-Accel-Buffering": "no"
+            }
+        )
+
+
+def prepare_export(
+    db: Session,
+    current_user: User,
+    dataset: str,
+    fmt: str = "csv",
+    compress: bool = False,
+    pg_id: int = None,
+    month_from: date = None,
+    month_to: date = None
+) -> Export:
+    """
+    Authorize and build the export's statement; nothing is read until it streams.
+    Rows come in no particular order, so the database can return them as its
+    joins produce them instead of sorting the whole set first.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can export data")
+    if dataset not in _STATEMENTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+
+    stmt = _STATEMENTS[dataset]().where(PG.admin_id == current_user.id)
+    if pg_id is not None:
+        if db.query(PG.id).filter(PG.id == pg_id, PG.admin_id == current_user.id).first() is None:
+            raise HTTPException(status_code=404, detail="PG not found")
+        stmt = stmt.where(PG.id == pg_id)
+    if dataset == "rents":
+        if month_from is not None:
+            stmt = stmt.where(Rent.month >= month_start(month_from))
+        if month_to is not None:
+            stmt = stmt.where(Rent.month <= month_start(month_to))
+
+    filename = f"{dataset}-{date.today().isoformat()}.{fmt}" + (".gz" if compress else "")
+    return Export(
+        statement=stmt.execution_options(yield_per=EXPORT_BATCH_SIZE),
+        columns=list(stmt.selected_columns.keys()),
+        fmt=fmt,
+        compress=compress,
+        filename=filename
+    )
+
+def stream_export(db: Session, export: Export):
+    """
+    Encoded chunks of the export. yield_per streams from a server-side cursor
+    (named cursor on psycopg2), so memory holds one batch whatever the row count.
+    The header goes out before the query runs.
+    """
+    encoder = export.encoder()
+    yield encoder.header()
+    result = db.execute(export.statement)
+    for rows in result.partitions():
+        yield encoder.batch(rows)
+    yield encoder.end()
+
+def export_response(db: Session, current_user: User, dataset: str, **options) -> StreamingResponse:
+    export = prepare_export(db, current_user, dataset, **options)
+    return export.response(stream_export(db, export))
@@ -0,0 +1,164 @@
+import os
+import secrets
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.models.invite import Invite
+from app.models.pg import PG
+from app.models.user import User, UserRole
+
+# Lifetime of new invite codes unless the request sets one; 0 = never expire
+INVITE_TTL_HOURS = int(os.getenv("INVITE_TTL_HOURS", "168"))
+# Codes per batch request
+INVITE_BATCH_MAX = int(os.getenv("INVITE_BATCH_MAX", "500"))
+
+def _owned_pg(db: Session, pg_id: int, admin_user: User):
+    if admin_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can manage invites")
+    pg = db.query(PG.id, PG.name).filter(PG.id == pg_id, PG.admin_id == admin_user.id).first()
+    if pg is None:
+        raise HTTPException(status_code=403, detail="PG not found or not authorized")
+    return pg
+
+def _invite_dict(invite) -> dict:
+    return {
+        "id": invite.id,
+        "code": invite.code,
+        "pg_id": invite.pg_id,
+        "max_uses": invite.max_uses,
+        "uses": invite.uses,
+        "expires_at": invite.expires_at,
+        "created_at": invite.created_at
+    }
+
+def create_invites(
+    db: Session,
+    admin_user: User,
+    pg_id: int,
+    count: int = 1,
+    max_uses: int = 1,
+    ttl_hours: int = None
+):
+    """
+    count new codes for one of the admin's PGs, each good for max_uses signups,
+    written with a single multi-row INSERT.
+    """
+    if not 1 <= count <= INVITE_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"count must be between 1 and {INVITE_BATCH_MAX}")
+    if max_uses < 1:
+        raise HTTPException(status_code=400, detail="max_uses must be at least 1")
+
+    pg = _owned_pg(db, pg_id, admin_user)
+
+    now = datetime.now()
+    ttl_hours = INVITE_TTL_HOURS if ttl_hours is None else ttl_hours
+    expires_at = now + timedelta(hours=ttl_hours) if ttl_hours else None
+
+    invites = db.execute(
+        # Rows need not come back in parameter order, which lets SQLAlchemy send
+        # every code as one INSERT ... VALUES (...), (...) RETURNING on SQLite too
+        insert(Invite).returning(
+            Invite.id, Invite.code, Invite.pg_id, Invite.max_uses, Invite.uses, Invite.expires_at, Invite.created_at
+        ),
+        [
+            {
+                "code": secrets.token_urlsafe(12),
+                "pg_id": pg_id,
+                "created_by": admin_user.id,
+                "max_uses": max_uses,
+                "uses": 0,
+                "expires_at": expires_at,
+                "created_at": now
+            }
+            for _ in range(count)
+        ]
+    ).all()
+    db.commit()
+
+    return {
+        "pg_id": pg.id,
+        "pg_name": pg.name,
+        "invites": [_invite_dict(invite) for invite in sorted(invites, key=lambda invite: invite.id)]
+    }
+
+def claim_invite(db: Session, code: str):
+    """
+    Take one use of an invite code in the caller's transaction and return its
+    PG id, or (None, error). The check and the increment are one conditional
+    UPDATE, so concurrent signups can never claim more than max_uses.
+    """
+    now = datetime.now()
+    pg_id = db.execute(
+        update(Invite)
+        .where(
+            Invite.code == code,
+            Invite.uses < Invite.max_uses,
+            or_(Invite.expires_at.is_(None), Invite.expires_at > now)
+        )
+        .values(uses=Invite.uses + 1)
+        .returning(Invite.pg_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if pg_id is not None:
+        return pg_id, None
+
+    # Only failed claims pay for a second lookup, to say why
+    invite = db.execute(select(Invite.uses, Invite.max_uses).where(Invite.code == code)).first()
+    if invite is None:
+        return None, "Invalid invite code"
+    if invite.uses >= invite.max_uses:
+        return None, "Invite code has already been used"
+    return None, "Invite code has expired"
+
+def get_invites(
+    db: Session,
+    admin_user: User,
+    pg_id: int = None,
+    active_only: bool = False,
+    cursor: int = None,
+    limit: int = 100
+):
+    """Invites of the admin's PGs, newest first, keyset-paginated on id"""
+    if admin_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can manage invites")
+
+    query = db.query(
+        Invite.id, Invite.code, Invite.pg_id, Invite.max_uses, Invite.uses, Invite.expires_at, Invite.created_at
+    ).filter(
+        Invite.pg_id.in_(select(PG.id).where(PG.admin_id == admin_user.id))
+    )
+    if pg_id is not None:
+        query = query.filter(Invite.pg_id == pg_id)
+    if active_only:
+        query = query.filter(
+            Invite.uses < Invite.max_uses,
+            or_(Invite.expires_at.is_(None), Invite.expires_at > datetime.now())
+        )
+    if cursor is not None:
+        query = query.filter(Invite.id < cursor)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(Invite.id.desc()).limit(limit + 1).all()
+    page = {"items": [], "next_cursor": None}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        page["next_cursor"] = rows[-1].id
+    page["items"] = [_invite_dict(row) for row in rows]
+    return page
+
+def revoke_invite(db: Session, admin_user: User, invite_id: int):
+    """Delete an invite; users who already signed up with it keep their PG"""
+    if admin_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can manage invites")
+
+    deleted = db.execute(
+        delete(Invite).where(
+            Invite.id == invite_id,
+            Invite.pg_id.in_(select(PG.id).where(PG.admin_id == admin_user.id))
+        )
+    ).rowcount
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Invite not found")
+    db.commit()
+    return {"message": "Invite revoked"}
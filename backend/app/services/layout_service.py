@@ -0,0 +1,150 @@
+import csv
+import io
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.pg import PG
+from app.models.room import Room
+from app.models.bed import Bed
+from app.models.user import User
+from app.services.pg_service import adjust_pg_counters
+from app.core import events
+
+# Upper bound for one layout request
+MAX_LAYOUT_BEDS = 5000
+
+def _get_owned_pg(db: Session, pg_id: int, current_user: User):
+    pg = db.query(PG).filter(PG.id == pg_id).first()
+    if not pg:
+        raise HTTPException(status_code=404, detail="PG not found")
+    if pg.admin_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to modify this PG")
+    return pg
+
+def _validate_layout(db: Session, pg_id: int, rooms: list[dict]):
+    """Check the whole spec before anything is written"""
+    errors = []
+    if not rooms:
+        errors.append("Layout has no rooms")
+
+    seen = set()
+    for room in rooms:
+        if room["room_number"] in seen:
+            errors.append(f"Room {room['room_number']} appears more than once")
+        seen.add(room["room_number"])
+
+    total_beds = sum(len(room["beds"]) for room in rooms)
+    if total_beds > MAX_LAYOUT_BEDS:
+        errors.append(f"Layout has {total_beds} beds, the limit is {MAX_LAYOUT_BEDS}")
+
+    existing = db.query(Room.room_number).filter(
+        Room.pg_id == pg_id,
+        Room.room_number.in_(seen)
+    ).all()
+    for (room_number,) in existing:
+        errors.append(f"Room {room_number} already exists in this PG")
+
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+def create_layout(db: Session, pg_id: int, rooms: list[dict], current_user: User):
+    """
+    Create rooms and their beds for a PG in one transaction.
+    rooms: [{"room_number": 101, "beds": [{"rent": 5000}, ...]}, ...]
+    """
+    _get_owned_pg(db, pg_id, current_user)
+    _validate_layout(db, pg_id, rooms)
+
+    # Multi-row INSERT ... RETURNING, rows come back in parameter order
+    room_rows = db.execute(
+        insert(Room).returning(Room.id, Room.room_number, sort_by_parameter_order=True),
+        [{"room_number": room["room_number"], "pg_id": pg_id} for room in rooms]
+    ).all()
+
+    bed_params = []
+    for (room_id, _), room in zip(room_rows, rooms):
+        bed_params.extend({"room_id": room_id, "rent": bed["rent"]} for bed in room["beds"])
+
+    bed_ids = {room_id: [] for room_id, _ in room_rows}
+    bed_rows = []
+    if bed_params:
+        bed_rows = db.execute(
+            insert(Bed).returning(Bed.id, Bed.room_id, sort_by_parameter_order=True),
+            [dict(params, is_occupied=False) for params in bed_params]
+        ).all()
+        for bed_id, room_id in bed_rows:
+            bed_ids[room_id].append(bed_id)
+
+    pg = adjust_pg_counters(db, pg_id, rooms=len(room_rows), beds=len(bed_params), cause=events.ROOM_CREATED)
+    for room_id, room_number in room_rows:
+        events.emit(db, events.ROOM_CREATED, pg, room_id=room_id, room_number=room_number, bed_ids=bed_ids[room_id])
+    for (bed_id, room_id), params in zip(bed_rows, bed_params):
+        events.emit(db, events.BED_CREATED, pg, bed_id=bed_id, room_id=room_id, rent=params["rent"])
+    db.commit()
+
+    return {
+        "pg_id": pg_id,
+        "total_rooms": len(room_rows),
+        "total_beds": len(bed_params),
+        "rooms": [
+            {"id": room_id, "room_number": room_number, "bed_ids": bed_ids[room_id]}
+            for room_id, room_number in room_rows
+        ]
+    }
+
+def parse_layout_csv(body: bytes):
+    """
+    UTF-8 CSV with a room_number,rent header and one row per bed.
+    A row with an empty rent declares a room without beds.
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail=["CSV must be UTF-8 encoded"])
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or not {"room_number", "rent"} <= set(reader.fieldnames):
+        raise HTTPException(status_code=400, detail=["CSV must have room_number and rent columns"])
+
+    rooms = {}
+    errors = []
+    for line, row in enumerate(reader, start=2):
+        try:
+            room_number = int(row["room_number"])
+            rent = row["rent"].strip() if row["rent"] else ""
+            rent = int(rent) if rent else None
+        except ValueError:
+            errors.append(f"Line {line}: room_number and rent must be integers")
+            continue
+
+        if room_number <= 0 or (rent is not None and rent < 0):
+            errors.append(f"Line {line}: room_number must be positive and rent not negative")
+            continue
+
+        beds = rooms.setdefault(room_number, [])
+        if rent is not None:
+            beds.append({"rent": rent})
+
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    return [{"room_number": room_number, "beds": beds} for room_number, beds in rooms.items()]
+
+def clone_layout(db: Session, source_pg_id: int, target_pg_id: int, current_user: User):
+    """Copy room numbers and bed rents of one PG into another, all beds unoccupied"""
+    _get_owned_pg(db, source_pg_id, current_user)
+
+    rows = db.query(Room.id, Room.room_number, Bed.rent).outerjoin(
+        Bed, Bed.room_id == Room.id
+    ).filter(
+        Room.pg_id == source_pg_id
+    ).order_by(Room.room_number, Bed.id).all()
+
+    rooms = {}
+    for _, room_number, rent in rows:
+        beds = rooms.setdefault(room_number, [])
+        if rent is not None:
+            beds.append({"rent": rent})
+
+    layout = [{"room_number": room_number, "beds": beds} for room_number, beds in rooms.items()]
+    return create_layout(db, target_pg_id, layout, current_user)
@@ -0,0 +1,169 @@
+import os
+from datetime import date, datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import func, select, insert, and_, or_
+from sqlalchemy.orm import Session
+from app.models.occupancy import OccupancyEvent, OccupancyRollup
+from app.models.pg import PG
+from app.models.user import User, UserRole
+
+# Record occupancy_events and maintain occupancy_rollups on every count change
+OCCUPANCY_HISTORY = os.getenv("OCCUPANCY_HISTORY", "true").lower() == "true"
+# Points per series response; longer ranges should use monthly granularity
+OCCUPANCY_SERIES_MAX_POINTS = int(os.getenv("OCCUPANCY_SERIES_MAX_POINTS", "1100"))
+
+DAY = "day"
+MONTH = "month"
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def _upsert_rollups(db: Session):
+    """INSERT into occupancy_rollups that adds to the deltas of an existing (pg, period, start) row"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(OccupancyRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["pg_id", "period", "period_start"],
+        set_={
+            "beds_delta": OccupancyRollup.beds_delta + stmt.excluded.beds_delta,
+            "occupied_delta": OccupancyRollup.occupied_delta + stmt.excluded.occupied_delta,
+            "changes": OccupancyRollup.changes + stmt.excluded.changes,
+        }
+    )
+
+def record_occupancy_change(db: Session, pg_id: int, cause: str, rooms: int = 0, beds: int = 0, occupied: int = 0):
+    """
+    Append an occupancy event and fold it into the PG's day and month rollups,
+    in the caller's transaction. Two statements; concurrent writers to the same
+    PG add to the rollup rows atomically.
+    """
+    if not OCCUPANCY_HISTORY or not (rooms or beds or occupied):
+        return
+
+    now = datetime.now()
+    db.execute(insert(OccupancyEvent).values(
+        pg_id=pg_id,
+        occurred_at=now,
+        cause=cause,
+        rooms_delta=rooms,
+        beds_delta=beds,
+        occupied_delta=occupied
+    ))
+    if beds or occupied:
+        db.execute(_upsert_rollups(db), [
+            {"pg_id": pg_id, "period": period, "period_start": start,
+             "beds_delta": beds, "occupied_delta": occupied, "changes": 1}
+            for period, start in ((DAY, now.date()), (MONTH, _month_start(now.date())))
+        ])
+
+
+### Occupancy-rate series
+
+def _periods(date_from: date, date_to: date, granularity: str):
+    current = date_from
+    while current <= date_to:
+        yield current
+        current = current + timedelta(days=1) if granularity == DAY else _next_month(current)
+
+def occupancy_series(
+    db: Session,
+    current_user: User,
+    pg_id: int = None,
+    date_from: date = None,
+    date_to: date = None,
+    granularity: str = DAY
+):
+    """
+    Beds, occupied beds and occupancy rate at the end of each day or month of
+    the range, for one PG or the admin's whole portfolio. Reads only rollups:
+    the opening counts sum the monthly rows before the range (plus the daily
+    rows of its first, partial month), then each period applies its own row.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view reports")
+
+    date_to = date_to or date.today()
+    if granularity == MONTH:
+        date_to = _month_start(date_to)
+        date_from = _month_start(date_from) if date_from else _month_start(date_to - timedelta(days=335))
+    else:
+        date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+    periods = list(_periods(date_from, date_to, granularity))
+    if len(periods) > OCCUPANCY_SERIES_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range has {len(periods)} points, more than {OCCUPANCY_SERIES_MAX_POINTS}; use granularity=month"
+        )
+
+    pg_ids = select(PG.id).where(PG.admin_id == current_user.id)
+    if pg_id is not None:
+        if db.query(PG.id).filter(PG.id == pg_id, PG.admin_id == current_user.id).first() is None:
+            raise HTTPException(status_code=404, detail="PG not found")
+        pg_ids = pg_ids.where(PG.id == pg_id)
+    in_scope = OccupancyRollup.pg_id.in_(pg_ids.scalar_subquery())
+
+    first_month = _month_start(date_from)
+    beds, occupied = db.execute(
+        select(
+            func.coalesce(func.sum(OccupancyRollup.beds_delta), 0),
+            func.coalesce(func.sum(OccupancyRollup.occupied_delta), 0)
+        ).where(
+            in_scope,
+            or_(
+                and_(OccupancyRollup.period == MONTH, OccupancyRollup.period_start < first_month),
+                and_(
+                    OccupancyRollup.period == DAY,
+                    OccupancyRollup.period_start >= first_month,
+                    OccupancyRollup.period_start < date_from
+                )
+            )
+        )
+    ).one()
+
+    deltas = {
+        row.period_start: row
+        for row in db.execute(
+            select(
+                OccupancyRollup.period_start,
+                func.sum(OccupancyRollup.beds_delta).label("beds"),
+                func.sum(OccupancyRollup.occupied_delta).label("occupied"),
+                func.sum(OccupancyRollup.changes).label("changes")
+            ).where(
+                in_scope,
+                OccupancyRollup.period == granularity,
+                OccupancyRollup.period_start.between(date_from, date_to)
+            ).group_by(OccupancyRollup.period_start)
+        )
+    }
+
+    points = []
+    for start in periods:
+        row = deltas.get(start)
+        if row is not None:
+            beds += row.beds
+            occupied += row.occupied
+        points.append({
+            "date": start,
+            "beds": beds,
+            "occupied": occupied,
+            "occupancy_rate": round(occupied / beds, 4) if beds else None,
+            "changes": row.changes if row is not None else 0
+        })
+
+    return {
+        "pg_id": pg_id,
+        "granularity": granularity,
+        "date_from": date_from,
+        "date_to": date_to,
+        "points": points
+    }
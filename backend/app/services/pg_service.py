@@ -1,10 +1,22 @@
+import os
+import json
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, case, distinct, update, select
 from sqlalchemy.orm import Session
 from app.models.pg import PG
 from app.models.user import User, UserRole
 from app.models.room import Room
 from app.models.bed import Bed
+from app.models.tenant import TenantProfile
+from app.core.principal_cache import principal_cache
+from app.services.occupancy_service import record_occupancy_change
+
+# "aggregate": compute stats with one grouped query over rooms/beds
+# "counters": read (and maintain) the counters stored on the PG row
+PG_STATS_MODE = os.getenv("PG_STATS_MODE", "aggregate")
+
+def counters_enabled() -> bool:
+    return PG_STATS_MODE == "counters"
 
 def create_pg(db: Session, pg_data, current_user: User):
     if current_user.role != UserRole.ADMIN:
@@ -19,31 +31,177 @@ def create_pg(db: Session, pg_data, current_user: User):
     db.add(pg)
     db.commit()
     db.refresh(pg)
+
+    # Owned PG ids are part of the cached principal
+    principal_cache.invalidate_user(current_user.id)
+    return pg
+
+def adjust_pg_counters(db: Session, pg_id, rooms: int = 0, beds: int = 0, occupied: int = 0, *, cause: str):
+    """
+    Bump a PG's version and, in counter mode, apply deltas to its stored counters,
+    inside the caller's transaction. Every write to a PG's rooms, beds or tenants
+    goes through here. pg_id may be a plain id or a scalar subquery resolving to one.
+    Non-zero deltas are also recorded in the occupancy history under `cause`.
+    Returns the PG's (id, admin_id), which scopes the events of the write.
+    """
+    values = {"version": PG.version + 1}
+    if counters_enabled():
+        values.update(
+            total_rooms=PG.total_rooms + rooms,
+            total_beds=PG.total_beds + beds,
+            occupied_beds=PG.occupied_beds + occupied
+        )
+
+    pg = db.execute(
+        update(PG)
+        .where(PG.id == pg_id)
+        .values(**values)
+        .returning(PG.id, PG.admin_id)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if pg is not None:
+        record_occupancy_change(db, pg.id, cause, rooms=rooms, beds=beds, occupied=occupied)
     return pg
 
-def get_pg_stats(db: Session, pg_id: int):
-    """Calculate room and occupancy stats for a PG"""
-    total_rooms = db.query(func.count(Room.id)).filter(Room.pg_id == pg_id).scalar() or 0
-    total_beds = db.query(func.count(Bed.id)).join(Room).filter(Room.pg_id == pg_id).scalar() or 0
-    occupied_beds = db.query(func.count(Bed.id)).join(Room).filter(Room.pg_id == pg_id, Bed.is_occupied == True).scalar() or 0
-    total_tenants = occupied_beds
-    
+def get_pg_versions(db: Session, admin_id: int = None, pg_id: int = None, room_id: int = None):
+    """
+    (pg_id, version) pairs for an admin's PGs, one PG, or the PG of a room.
+    One indexed lookup; listings answer If-None-Match from these alone.
+    """
+    query = db.query(PG.id, PG.version)
+    if admin_id is not None:
+        query = query.filter(PG.admin_id == admin_id)
+    if pg_id is not None:
+        query = query.filter(PG.id == pg_id)
+    if room_id is not None:
+        query = query.join(Room, Room.pg_id == PG.id).filter(Room.id == room_id)
+    return [tuple(row) for row in query.order_by(PG.id)]
+
+def _pg_stats_query(db: Session):
+    """PG rows joined with their room/bed counts, one row per PG"""
+    occupied = func.coalesce(func.sum(case((Bed.is_occupied == True, 1), else_=0)), 0)
+    return db.query(
+        PG,
+        func.count(distinct(Room.id)).label("total_rooms"),
+        func.count(Bed.id).label("total_beds"),
+        occupied.label("occupied_beds")
+    ).outerjoin(
+        Room, Room.pg_id == PG.id
+    ).outerjoin(
+        Bed, Bed.room_id == Room.id
+    ).group_by(PG.id)
+
+def _pg_out(pg: PG, total_rooms: int, total_beds: int, occupied_beds: int):
     return {
+        "id": pg.id,
+        "name": pg.name,
+        "address": pg.address,
+        "admin_id": pg.admin_id,
         "total_rooms": total_rooms,
         "total_beds": total_beds,
         "occupied_beds": occupied_beds,
-        "total_tenants": total_tenants
+        "total_tenants": occupied_beds
     }
 
+def refresh_pg_counters(db: Session, admin_id: int = None) -> int:
+    """
+    Recompute the stored counters from rooms/beds; returns the number of PGs.
+    Run when switching PG_STATS_MODE to "counters" (scripts/refresh_pg_counters.py).
+    """
+    rows = _pg_stats_query(db)
+    if admin_id is not None:
+        rows = rows.filter(PG.admin_id == admin_id)
+
+    rows = rows.all()
+    for pg, total_rooms, total_beds, occupied_beds in rows:
+        pg.total_rooms = total_rooms
+        pg.total_beds = total_beds
+        pg.occupied_beds = occupied_beds
+        pg.version = PG.version + 1
+
+    db.commit()
+    return len(rows)
+
 def get_pgs(db: Session, current_user: User = None):
     if current_user and current_user.role == UserRole.ADMIN:
-        pgs = db.query(PG).filter(PG.admin_id == current_user.id).all()
-        # Enrich PGs with stats
-        for pg in pgs:
-            stats = get_pg_stats(db, pg.id)
-            pg.total_rooms = stats["total_rooms"]
-            pg.total_beds = stats["total_beds"]
-            pg.occupied_beds = stats["occupied_beds"]
-            pg.total_tenants = stats["total_tenants"]
-        return pgs
-    return []
\ No newline at end of file
+        if counters_enabled():
+            pgs = db.query(PG).filter(PG.admin_id == current_user.id).all()
+            return [_pg_out(pg, pg.total_rooms, pg.total_beds, pg.occupied_beds) for pg in pgs]
+
+        # Stats for every PG of this admin in a single grouped query
+        rows = _pg_stats_query(db).filter(PG.admin_id == current_user.id).order_by(PG.id).all()
+        return [_pg_out(*row) for row in rows]
+    return []
+
+
+### Floor plan
+
+def _floor_plan_query(admin_id: int, pg_id: int):
+    """One row per bed of the PG with its room and occupant; rooms without beds and a bare PG still yield a row"""
+    return select(
+        PG.id, PG.name, PG.address,
+        Room.id.label("room_id"), Room.room_number,
+        Bed.id.label("bed_id"), Bed.rent, Bed.is_occupied,
+        TenantProfile.id.label("tenant_id"), TenantProfile.move_in_date,
+        User.id.label("user_id"), User.name.label("user_name")
+    ).select_from(PG).outerjoin(
+        Room, Room.pg_id == PG.id
+    ).outerjoin(
+        Bed, Bed.room_id == Room.id
+    ).outerjoin(
+        TenantProfile, TenantProfile.bed_id == Bed.id
+    ).outerjoin(
+        User, User.id == TenantProfile.user_id
+    ).where(
+        PG.id == pg_id,
+        PG.admin_id == admin_id
+    ).order_by(Room.room_number, Room.id, Bed.id)
+
+def get_floor_plan(db: Session, current_user: User, pg_id: int) -> bytes:
+    """
+    A PG's rooms -> beds -> occupants as compact JSON, from a single query.
+    Rows are folded straight into plain dicts and encoded once, skipping ORM
+    objects and response-model validation; free beds have "tenant": null.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can view floor plans")
+
+    rows = db.execute(_floor_plan_query(current_user.id, pg_id)).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="PG not found")
+
+    first = rows[0]
+    rooms = []
+    room = None
+    occupied = beds = 0
+    for row in rows:
+        if row.room_id is None:
+            continue
+        if room is None or room["id"] != row.room_id:
+            room = {"id": row.room_id, "room_number": row.room_number, "beds": []}
+            rooms.append(room)
+        if row.bed_id is None:
+            continue
+
+        tenant = None
+        if row.tenant_id is not None:
+            tenant = {
+                "id": row.tenant_id,
+                "user_id": row.user_id,
+                "name": row.user_name,
+                "move_in_date": row.move_in_date.isoformat()
+            }
+        room["beds"].append({"id": row.bed_id, "rent": row.rent, "is_occupied": bool(row.is_occupied), "tenant": tenant})
+        beds += 1
+        occupied += bool(row.is_occupied)
+
+    plan = {
+        "id": first.id,
+        "name": first.name,
+        "address": first.address,
+        "total_rooms": len(rooms),
+        "total_beds": beds,
+        "occupied_beds": occupied,
+        "rooms": rooms
+    }
+    return json.dumps(plan, separators=(",", ":")).encode()
@@ -0,0 +1,160 @@
+import calendar
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import insert, select, update, literal, exists
+from sqlalchemy.orm import Session
+from app.models.rent import Rent, RentStatus
+from app.models.tenant import TenantProfile
+from app.models.bed import Bed
+from app.models.room import Room
+from app.models.pg import PG
+from app.models.user import User, UserRole
+from app.services.report_service import refresh_rent_rollups
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def _require_admin(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can manage rents")
+
+def _insert_rents(db: Session, rows, period: date):
+    """INSERT ... SELECT that skips (tenant_id, month) pairs which already exist"""
+    columns = ["tenant_id", "month", "amount", "status"]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        # Imported under another name: a local `insert` would shadow the module-level
+        # one for the whole function and break the fallback below
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert(Rent).from_select(columns, rows).on_conflict_do_nothing(
+            index_elements=["tenant_id", "month"]
+        )
+
+    # Portable fallback for databases without ON CONFLICT
+    rows = rows.where(~exists().where(Rent.tenant_id == TenantProfile.id, Rent.month == period))
+    return insert(Rent).from_select(columns, rows)
+
+def generate_rents(db: Session, current_user: User, month: date, pg_id: int = None):
+    """
+    Create the month's DUE rent rows for every tenant of the admin's PGs who has
+    moved in by the end of that month, priced from Bed.rent. One set-based
+    INSERT ... SELECT; rerunning for the same month inserts nothing.
+    """
+    _require_admin(current_user)
+    period = month_start(month)
+    period_end = period.replace(day=calendar.monthrange(period.year, period.month)[1])
+
+    tenants = select(
+        TenantProfile.id,
+        literal(period, Rent.month.type),
+        Bed.rent,
+        literal(RentStatus.DUE, Rent.status.type)
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    ).where(
+        PG.admin_id == current_user.id,
+        TenantProfile.move_in_date <= period_end
+    )
+    if pg_id is not None:
+        tenants = tenants.where(Room.pg_id == pg_id)
+
+    created = db.execute(_insert_rents(db, tenants, period)).rowcount
+    if created:
+        refresh_rent_rollups(db, current_user.id, [period])
+    db.commit()
+
+    return {"month": period, "created": created}
+
+def _admin_rent_ids(current_user: User):
+    """Rent ids belonging to the admin's PGs, as a subquery"""
+    return select(Rent.id).join(
+        TenantProfile, Rent.tenant_id == TenantProfile.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    ).where(PG.admin_id == current_user.id)
+
+def mark_rents_paid(db: Session, current_user: User, rent_ids: list[int], paid_on: date = None):
+    """Mark DUE rents as PAID with one UPDATE; rents outside the admin's PGs are ignored"""
+    _require_admin(current_user)
+
+    months = db.execute(
+        update(Rent)
+        .where(
+            Rent.id.in_(rent_ids),
+            Rent.status == RentStatus.DUE,
+            Rent.id.in_(_admin_rent_ids(current_user))
+        )
+        .values(status=RentStatus.PAID, paid_on=paid_on or date.today())
+        .returning(Rent.month)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    refresh_rent_rollups(db, current_user.id, months)
+    db.commit()
+
+    return {"updated": len(months)}
+
+def get_rents(
+    db: Session,
+    current_user: User,
+    month: date = None,
+    status: RentStatus = None,
+    pg_id: int = None,
+    cursor: int = None,
+    limit: int = 50
+):
+    """Keyset-paginated rent ledger ordered by Rent.id"""
+    query = db.query(
+        Rent.id,
+        Rent.tenant_id,
+        Rent.month,
+        Rent.amount,
+        Rent.status,
+        Rent.paid_on,
+        User.name.label("user_name"),
+        Room.room_number,
+        PG.name.label("pg_name")
+    ).join(
+        TenantProfile, Rent.tenant_id == TenantProfile.id
+    ).join(
+        User, TenantProfile.user_id == User.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    )
+
+    # Admins see their PGs, tenants see their own rents
+    if current_user.role == UserRole.ADMIN:
+        query = query.filter(PG.admin_id == current_user.id)
+    else:
+        query = query.filter(TenantProfile.user_id == current_user.id)
+
+    if month is not None:
+        query = query.filter(Rent.month == month_start(month))
+    if status is not None:
+        query = query.filter(Rent.status == status)
+    if pg_id is not None:
+        query = query.filter(Room.pg_id == pg_id)
+    if cursor is not None:
+        query = query.filter(Rent.id > cursor)
+
+    rows = query.order_by(Rent.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+
+    return {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
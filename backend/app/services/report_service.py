@@ -0,0 +1,165 @@
+import os
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import func, case, select, delete, insert
+from sqlalchemy.orm import Session
+from app.models.rent import Rent, RentStatus
+from app.models.rent_rollup import RentRollup
+from app.models.tenant import TenantProfile
+from app.models.bed import Bed
+from app.models.room import Room
+from app.models.pg import PG
+from app.models.user import User, UserRole
+
+# Serve the PG/month reports from rent_rollups instead of aggregating rents live
+RENT_ROLLUPS = os.getenv("RENT_ROLLUPS", "false").lower() == "true"
+
+# First key of the per-admin advisory lock taken by refresh_rent_rollups
+_ROLLUP_LOCK = 1
+
+def _require_admin(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view reports")
+
+def _totals():
+    """billed, collected, rents, paid aggregates over rents"""
+    paid = Rent.status == RentStatus.PAID
+    return (
+        func.coalesce(func.sum(Rent.amount), 0).label("billed"),
+        func.coalesce(func.sum(case((paid, Rent.amount), else_=0)), 0).label("collected"),
+        func.count(Rent.id).label("rents"),
+        func.coalesce(func.sum(case((paid, 1), else_=0)), 0).label("paid")
+    )
+
+def _rents_by_pg(*columns):
+    """rents joined up to pgs, selecting the given columns"""
+    return select(*columns).select_from(Rent).join(
+        TenantProfile, Rent.tenant_id == TenantProfile.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    )
+
+def _row(row, **keys):
+    billed, collected = row.billed, row.collected
+    return dict(
+        keys,
+        billed=billed,
+        collected=collected,
+        outstanding=billed - collected,
+        rents=row.rents,
+        paid=row.paid,
+        collection_rate=round(collected / billed, 4) if billed else None
+    )
+
+def _month_range(stmt, month_column, month_from: date = None, month_to: date = None):
+    if month_from is not None:
+        stmt = stmt.where(month_column >= month_from.replace(day=1))
+    if month_to is not None:
+        stmt = stmt.where(month_column <= month_to.replace(day=1))
+    return stmt
+
+def pg_month_report(db: Session, current_user: User, month_from: date = None, month_to: date = None, pg_id: int = None):
+    """Billed / collected / outstanding per PG per month"""
+    _require_admin(current_user)
+
+    if RENT_ROLLUPS:
+        stmt = select(
+            PG.id.label("pg_id"),
+            PG.name.label("pg_name"),
+            RentRollup.month,
+            RentRollup.billed,
+            RentRollup.collected,
+            RentRollup.rents,
+            RentRollup.paid
+        ).join(PG, RentRollup.pg_id == PG.id)
+        month_column = RentRollup.month
+    else:
+        stmt = _rents_by_pg(
+            PG.id.label("pg_id"), PG.name.label("pg_name"), Rent.month, *_totals()
+        ).group_by(PG.id, PG.name, Rent.month)
+        month_column = Rent.month
+
+    stmt = stmt.where(PG.admin_id == current_user.id)
+    if pg_id is not None:
+        stmt = stmt.where(PG.id == pg_id)
+    stmt = _month_range(stmt, month_column, month_from, month_to).order_by(month_column, PG.id)
+
+    return [
+        _row(row, pg_id=row.pg_id, pg_name=row.pg_name, month=row.month)
+        for row in db.execute(stmt)
+    ]
+
+def room_report(db: Session, current_user: User, pg_id: int, month_from: date = None, month_to: date = None):
+    """Billed / collected / outstanding per room of one PG"""
+    _require_admin(current_user)
+
+    stmt = _rents_by_pg(
+        Room.id.label("room_id"), Room.room_number, *_totals()
+    ).where(
+        PG.admin_id == current_user.id,
+        PG.id == pg_id
+    ).group_by(Room.id, Room.room_number)
+    stmt = _month_range(stmt, Rent.month, month_from, month_to).order_by(Room.room_number)
+
+    return [
+        _row(row, room_id=row.room_id, room_number=row.room_number)
+        for row in db.execute(stmt)
+    ]
+
+def collection_trend(db: Session, current_user: User, month_from: date = None, month_to: date = None):
+    """Portfolio-wide totals and collection rate per month"""
+    _require_admin(current_user)
+
+    if RENT_ROLLUPS:
+        stmt = select(
+            RentRollup.month,
+            func.sum(RentRollup.billed).label("billed"),
+            func.sum(RentRollup.collected).label("collected"),
+            func.sum(RentRollup.rents).label("rents"),
+            func.sum(RentRollup.paid).label("paid")
+        ).join(PG, RentRollup.pg_id == PG.id).group_by(RentRollup.month)
+        month_column = RentRollup.month
+    else:
+        stmt = _rents_by_pg(Rent.month, *_totals()).group_by(Rent.month)
+        month_column = Rent.month
+
+    stmt = stmt.where(PG.admin_id == current_user.id)
+    stmt = _month_range(stmt, month_column, month_from, month_to).order_by(month_column)
+
+    return [_row(row, month=row.month) for row in db.execute(stmt)]
+
+def refresh_rent_rollups(db: Session, admin_id: int, months: list[date] = None):
+    """
+    Recompute the rollup rows of one admin's PGs for the given months (all months
+    when None), in the caller's transaction. No-op unless RENT_ROLLUPS is enabled.
+    """
+    if not RENT_ROLLUPS or months == []:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        # One refresh per admin at a time, until commit. Otherwise two concurrent
+        # refreshes both delete, then both insert the same (pg_id, month) rows and
+        # one fails; waiting also lets this one's SELECT see the other's rents.
+        # SQLite already serializes write transactions.
+        db.execute(select(func.pg_advisory_xact_lock(_ROLLUP_LOCK, admin_id)))
+
+    admin_pg_ids = select(PG.id).where(PG.admin_id == admin_id)
+    stale = delete(RentRollup).where(RentRollup.pg_id.in_(admin_pg_ids))
+    fresh = _rents_by_pg(PG.id, Rent.month, *_totals()).where(PG.admin_id == admin_id)
+
+    if months is not None:
+        months = sorted({month.replace(day=1) for month in months})
+        stale = stale.where(RentRollup.month.in_(months))
+        fresh = fresh.where(Rent.month.in_(months))
+
+    db.execute(stale.execution_options(synchronize_session=False))
+    db.execute(
+        insert(RentRollup).from_select(
+            ["pg_id", "month", "billed", "collected", "rents", "paid"],
+            fresh.group_by(PG.id, Rent.month)
+        )
+    )
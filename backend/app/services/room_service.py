@@ -1,16 +1,25 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from app.models.room import Room
+from app.models.bed import Bed
+from app.services.pg_service import adjust_pg_counters
+from app.core import events
 from fastapi import HTTPException
 
 def create_room(db: Session, room_number: int, pg_id: int):
     room = Room(room_number=room_number, pg_id=pg_id)
     db.add(room)
+    db.flush()
+    pg = adjust_pg_counters(db, pg_id, rooms=1, cause=events.ROOM_CREATED)
+    events.emit(db, events.ROOM_CREATED, pg, room_id=room.id, room_number=room_number, bed_ids=[])
     db.commit()
     db.refresh(room)
     return room
 
 def get_rooms(db: Session, pg_id: int):
-    return db.query(Room).filter(Room.pg_id == pg_id).all()
+    # Beds in one extra query instead of a lazy load per room during serialization
+    return db.query(Room).filter(Room.pg_id == pg_id).options(selectinload(Room.beds)).all()
 
 def delete_room(db: Session, room_id: int):
     room = db.query(Room).filter(Room.id == room_id).first()
@@ -18,10 +27,32 @@ def delete_room(db: Session, room_id: int):
         raise HTTPException(status_code=404, detail="Room not found")
     
     # Check if all beds are unoccupied
-    occupied_beds = [bed for bed in room.beds if bed.is_occupied]
+    total_beds, occupied_beds = db.query(
+        func.count(Bed.id),
+        func.coalesce(func.sum(case((Bed.is_occupied == True, 1), else_=0)), 0)
+    ).filter(Bed.room_id == room_id).one()
     if occupied_beds:
         raise HTTPException(status_code=400, detail="Cannot delete room with occupied beds")
     
-    db.delete(room)
+    # Set-based deletes; the ORM cascade would load every bed and its tenant first.
+    # A bed claimed or added since the check above changes the count: give up
+    # rather than delete an occupied bed or leave the counters off. The PG row is
+    # locked last, after the beds, in the same order as tenant assignment
+    conflict = HTTPException(status_code=409, detail="Room changed while being deleted, try again")
+    deleted = db.query(Bed).filter(
+        Bed.room_id == room_id, Bed.is_occupied.is_not(True)
+    ).delete(synchronize_session=False)
+    if deleted != total_beds:
+        db.rollback()
+        raise conflict
+    try:
+        db.query(Room).filter(Room.id == room_id).delete(synchronize_session=False)
+    except IntegrityError:
+        # A bed was added to the room after its beds were deleted
+        db.rollback()
+        raise conflict
+
+    pg = adjust_pg_counters(db, room.pg_id, rooms=-1, beds=-total_beds, cause=events.ROOM_DELETED)
+    events.emit(db, events.ROOM_DELETED, pg, room_id=room_id, room_number=room.room_number, beds=total_beds)
     db.commit()
     return {"message": "Room deleted successfully"}
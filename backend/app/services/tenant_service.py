@@ -1,10 +1,20 @@
-from sqlalchemy.orm import Session, joinedload
+import os
+from collections import Counter
+from sqlalchemy import String, and_, case, cast, func, insert, null, or_, select, tuple_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.tenant import TenantProfile
 from app.models.bed import Bed
 from app.models.room import Room
 from app.models.pg import PG
 from app.models.user import User, UserRole
+from app.services.pg_service import adjust_pg_counters
+from app.core import events
+
+# Shorter search terms match only prefixes; substrings of one or two characters
+# match most names and cannot use the trigram indexes
+SEARCH_MIN_SUBSTRING = int(os.getenv("SEARCH_MIN_SUBSTRING", "3"))
 
 def get_unassigned_tenants(db: Session, current_user: User = None):
     """
@@ -14,24 +24,27 @@ def get_unassigned_tenants(db: Session, current_user: User = None):
     if not current_user:
         return []
     
-    # Get PG IDs owned by current admin
-    admin_pg_ids = [pg.id for pg in current_user.pgs]
+    # PG IDs owned by current admin, resolved inside the query
+    admin_pg_ids = select(PG.id).where(PG.admin_id == current_user.id)
     
     # Get users who are tenants, don't have a tenant_profile, and were invited to admin's PGs
-    unassigned = db.query(User).outerjoin(
+    unassigned = db.query(
+        User.id, User.name, User.email, User.role, User.invited_pg_id
+    ).outerjoin(
         TenantProfile, User.id == TenantProfile.user_id
     ).filter(
         User.role == UserRole.TENANT,
         TenantProfile.id == None,
         User.invited_pg_id.in_(admin_pg_ids)
-    ).all()
+    ).order_by(User.id).all()
     
     return [
         {
             "id": user.id,
             "name": user.name,
             "email": user.email,
-            "role": user.role.value
+            "role": user.role.value,
+            "invited_pg_id": user.invited_pg_id
         }
         for user in unassigned
     ]
@@ -43,111 +56,345 @@ def create_tenant(
     move_in_date,
     current_user: User = None
 ):
-    # Verify the bed exists
-    bed = db.query(Bed).filter(Bed.id == bed_id).first()
-    if not bed:
-        raise HTTPException(status_code=404, detail="Bed not found")
-
-    # Get the room and PG for ownership verification
-    room = db.query(Room).filter(Room.id == bed.room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    
-    pg = db.query(PG).filter(PG.id == room.pg_id).first()
-    if not pg:
-        raise HTTPException(status_code=404, detail="PG not found")
-    
+    return assign_beds(db, [(user_id, bed_id, move_in_date)], current_user)[0]
+
+def assign_beds(db: Session, assignments: list, current_user: User = None):
+    """
+    Assign beds to tenants in one transaction.
+    assignments: [(user_id, bed_id, move_in_date), ...]
+
+    Beds are claimed with a conditional UPDATE ... WHERE NOT is_occupied, so two
+    concurrent assignments of the same bed cannot both succeed and nothing is locked
+    longer than that single statement.
+    """
+    batch = len(assignments) > 1
+
+    def fail(status_code: int, detail: str, ids):
+        if batch:
+            detail = f"{detail}: {sorted(ids)}"
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    bed_ids = [bed_id for _, bed_id, _ in assignments]
+    user_ids = [user_id for user_id, _, _ in assignments]
+    if len(set(bed_ids)) != len(bed_ids):
+        fail(400, "Bed assigned more than once", {b for b in bed_ids if bed_ids.count(b) > 1})
+    if len(set(user_ids)) != len(user_ids):
+        fail(400, "User assigned more than once", {u for u in user_ids if user_ids.count(u) > 1})
+
+    # Bed -> room -> PG in one joined query for the ownership check
+    beds = {
+        row.bed_id: row
+        for row in db.query(
+            Bed.id.label("bed_id"),
+            Room.id.label("room_id"),
+            Room.room_number,
+            PG.id.label("pg_id"),
+            PG.name.label("pg_name"),
+            PG.admin_id
+        ).join(
+            Room, Bed.room_id == Room.id
+        ).join(
+            PG, Room.pg_id == PG.id
+        ).filter(Bed.id.in_(bed_ids))
+    }
+    missing = set(bed_ids) - beds.keys()
+    if missing:
+        fail(404, "Bed not found", missing)
+
     # Authorization check: Admin must own the PG
-    if current_user and pg.admin_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to assign tenants to this PG")
-    
-    # Verify the user exists and is a tenant
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    if user.role != UserRole.TENANT:
-        raise HTTPException(status_code=400, detail="User must have TENANT role")
+    if current_user:
+        foreign = {b for b, row in beds.items() if row.admin_id != current_user.id}
+        if foreign:
+            fail(403, "Not authorized to assign tenants to this PG", foreign)
 
-    # Check if bed is already occupied
-    if bed.is_occupied:
-        raise HTTPException(status_code=400, detail="Bed already occupied")
+    # Verify the users exist and are tenants
+    users = {
+        row.id: row
+        for row in db.query(User.id, User.name, User.email, User.role).filter(User.id.in_(user_ids))
+    }
+    missing = set(user_ids) - users.keys()
+    if missing:
+        fail(404, "User not found", missing)
 
-    tenant = TenantProfile(
-        user_id=user_id,
-        bed_id=bed_id,
-        move_in_date=move_in_date
-    )
+    not_tenants = {u for u, row in users.items() if row.role != UserRole.TENANT}
+    if not_tenants:
+        fail(400, "User must have TENANT role", not_tenants)
+
+    # Claim the beds; only rows that were still free come back
+    claimed = set(db.execute(
+        update(Bed)
+        .where(Bed.id.in_(bed_ids), Bed.is_occupied.is_not(True))
+        .values(is_occupied=True)
+        .returning(Bed.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    if len(claimed) != len(bed_ids):
+        db.rollback()
+        fail(400, "Bed already occupied", set(bed_ids) - claimed)
 
-    bed.is_occupied = True
+    try:
+        tenant_ids = db.execute(
+            insert(TenantProfile).returning(TenantProfile.id, sort_by_parameter_order=True),
+            [
+                {"user_id": user_id, "bed_id": bed_id, "move_in_date": move_in_date}
+                for user_id, bed_id, move_in_date in assignments
+            ]
+        ).scalars().all()
+    except IntegrityError:
+        db.rollback()
+        fail(400, "User already has a bed assigned", set(user_ids))
+
+    occupied_per_pg = Counter(beds[bed_id].pg_id for bed_id in bed_ids)
+    pgs = {
+        pg_id: adjust_pg_counters(db, pg_id, occupied=occupied, cause=events.TENANT_ASSIGNED)
+        for pg_id, occupied in occupied_per_pg.items()
+    }
+    for tenant_id, (user_id, bed_id, move_in_date) in zip(tenant_ids, assignments):
+        bed = beds[bed_id]
+        events.emit(db, events.BED_OCCUPIED, pgs[bed.pg_id], bed_id=bed_id, room_id=bed.room_id)
+        events.emit(
+            db, events.TENANT_ASSIGNED, pgs[bed.pg_id],
+            tenant_id=tenant_id, user_id=user_id, bed_id=bed_id, room_id=bed.room_id, move_in_date=move_in_date
+        )
 
-    db.add(tenant)
     db.commit()
-    db.refresh(tenant)
 
-    return tenant
+    return [
+        {
+            "id": tenant_id,
+            "user_id": user_id,
+            "bed_id": bed_id,
+            "move_in_date": move_in_date,
+            "user_name": users[user_id].name,
+            "user_email": users[user_id].email,
+            "room_number": beds[bed_id].room_number,
+            "pg_name": beds[bed_id].pg_name
+        }
+        for tenant_id, (user_id, bed_id, move_in_date) in zip(tenant_ids, assignments)
+    ]
 
 
-def get_tenants(db: Session, current_user: User = None):
+def get_tenants(
+    db: Session,
+    current_user: User = None,
+    cursor: int = None,
+    limit: int = 50,
+    pg_id: int = None,
+    room_id: int = None,
+    move_in_from=None,
+    move_in_to=None,
+    include_total: bool = False
+):
+    """
+    Keyset-paginated tenant list ordered by TenantProfile.id.
+    Pass the returned next_cursor back as cursor to get the following page.
+    """
+    page = {"items": [], "next_cursor": None, "total": 0 if include_total else None}
     if not current_user:
-        return []
-    
+        return page
+
+    query = db.query(
+        TenantProfile.id,
+        TenantProfile.user_id,
+        TenantProfile.bed_id,
+        TenantProfile.move_in_date,
+        User.name.label("user_name"),
+        User.email.label("user_email"),
+        Room.room_number,
+        PG.name.label("pg_name")
+    ).join(
+        User, TenantProfile.user_id == User.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    )
+
     # If user is admin, show all tenants from their PGs
     if current_user.role == UserRole.ADMIN:
-        tenants = db.query(TenantProfile).join(
-            Bed, TenantProfile.bed_id == Bed.id
-        ).join(
-            Room, Bed.room_id == Room.id
-        ).join(
-            PG, Room.pg_id == PG.id
-        ).filter(
-            PG.admin_id == current_user.id
-        ).options(
-            joinedload(TenantProfile.user),
-            joinedload(TenantProfile.bed).joinedload(Bed.room).joinedload(Room.pg)
-        ).all()
-    
+        query = query.filter(PG.admin_id == current_user.id)
+
     # If user is tenant with bed, show only tenants from same PG
     elif current_user.role == UserRole.TENANT:
-        # First check if this tenant has a bed assigned
-        current_tenant = db.query(TenantProfile).filter(
-            TenantProfile.user_id == current_user.id
-        ).options(
-            joinedload(TenantProfile.bed).joinedload(Bed.room)
-        ).first()
-        
-        if not current_tenant:
-            # Tenant has no bed assigned, return empty list
-            return []
-        
-        # Get the PG ID for this tenant's bed
-        tenant_pg_id = current_tenant.bed.room.pg_id
-        
-        # Get all tenants from the same PG
-        tenants = db.query(TenantProfile).join(
-            Bed, TenantProfile.bed_id == Bed.id
+        tenant_pg_id = db.query(Room.pg_id).join(
+            Bed, Bed.room_id == Room.id
         ).join(
-            Room, Bed.room_id == Room.id
+            TenantProfile, TenantProfile.bed_id == Bed.id
         ).filter(
-            Room.pg_id == tenant_pg_id
-        ).options(
-            joinedload(TenantProfile.user),
-            joinedload(TenantProfile.bed).joinedload(Bed.room).joinedload(Room.pg)
-        ).all()
+            TenantProfile.user_id == current_user.id
+        ).scalar()
+
+        if tenant_pg_id is None:
+            # Tenant has no bed assigned, return empty page
+            return page
+
+        query = query.filter(Room.pg_id == tenant_pg_id)
     else:
-        return []
-    
-    # Transform ORM objects to TenantOut schema format
-    return [
-        {
-            "id": t.id,
-            "user_id": t.user_id,
-            "bed_id": t.bed_id,
-            "move_in_date": t.move_in_date,
-            "user_name": t.user.name,
-            "user_email": t.user.email,
-            "room_number": t.bed.room.room_number,
-            "pg_name": t.bed.room.pg.name
-        }
-        for t in tenants
+        return page
+
+    if pg_id is not None:
+        query = query.filter(Room.pg_id == pg_id)
+    if room_id is not None:
+        query = query.filter(Bed.room_id == room_id)
+    if move_in_from is not None:
+        query = query.filter(TenantProfile.move_in_date >= move_in_from)
+    if move_in_to is not None:
+        query = query.filter(TenantProfile.move_in_date <= move_in_to)
+
+    if include_total:
+        page["total"] = query.order_by(None).count()
+
+    if cursor is not None:
+        query = query.filter(TenantProfile.id > cursor)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(TenantProfile.id).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        page["next_cursor"] = rows[-1].id
+
+    page["items"] = [row._asdict() for row in rows]
+    return page
+
+
+### Search
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _starts_with(column, term: str, postgres: bool):
+    # LIKE 'term%' is served by the text_pattern_ops index on Postgres; SQLite only
+    # uses an expression index for comparisons, so the prefix becomes a range there
+    if postgres:
+        return column.like(_like_escape(term) + "%", escape="\\")
+    return and_(column >= term, column < term + "\U0010ffff")
+
+def _contains(column, term: str):
+    return column.like("%" + _like_escape(term) + "%", escape="\\")
+
+def _parse_search_cursor(cursor: str):
+    try:
+        rank, user_id, sort_name = cursor.split(":", 2)
+        return int(rank), sort_name, int(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def search_tenants(
+    db: Session,
+    current_user: User,
+    q: str,
+    pg_id: int = None,
+    cursor: str = None,
+    limit: int = 20
+):
+    """
+    Tenants and invited, not yet assigned users of the admin's PGs whose name or
+    email starts with or (from SEARCH_MIN_SUBSTRING characters) contains q, or whose
+    room number starts with q. Case-insensitive, ranked exact match, prefix, prefix
+    of a later word of the name, then substring, then by name; keyset-paginated.
+    Pass the returned next_cursor back as cursor for the next page.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can search tenants")
+
+    term = " ".join(q.split()).lower()
+    if not term:
+        raise HTTPException(status_code=400, detail="Search term is empty")
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    name, email = func.lower(User.name), func.lower(User.email)
+
+    exact = [name == term, email == term]
+    prefix = [_starts_with(name, term, postgres), _starts_with(email, term, postgres)]
+    word = [_contains(name, " " + term)]
+    substring = [_contains(name, term), _contains(email, term)] if len(term) >= SEARCH_MIN_SUBSTRING else []
+
+    # Room numbers only match assigned tenants; isdigit alone also accepts "²", which int() rejects
+    room_exact, room_prefix = [], []
+    if term.isascii() and term.isdigit() and len(term) <= 9:
+        room_exact = [Room.room_number == int(term)]
+        room_prefix = [cast(Room.room_number, String).like(term + "%")]
+
+    def ranked(exact, prefix):
+        return case(
+            (or_(*exact), 0),
+            (or_(*prefix), 1),
+            (or_(*word), 2),
+            else_=3
+        ).label("rank")
+
+    assigned = select(
+        User.id.label("user_id"),
+        User.name,
+        User.email,
+        TenantProfile.id.label("tenant_id"),
+        TenantProfile.bed_id,
+        TenantProfile.move_in_date,
+        Room.id.label("room_id"),
+        Room.room_number,
+        PG.id.label("pg_id"),
+        PG.name.label("pg_name"),
+        ranked(exact + room_exact, prefix + room_prefix),
+        name.label("sort_name")
+    ).join(
+        TenantProfile, TenantProfile.user_id == User.id
+    ).join(
+        Bed, TenantProfile.bed_id == Bed.id
+    ).join(
+        Room, Bed.room_id == Room.id
+    ).join(
+        PG, Room.pg_id == PG.id
+    ).where(
+        PG.admin_id == current_user.id,
+        or_(*prefix, *word, *substring, *room_prefix)
+    )
+
+    invited = select(
+        User.id.label("user_id"),
+        User.name,
+        User.email,
+        null().label("tenant_id"),
+        null().label("bed_id"),
+        null().label("move_in_date"),
+        null().label("room_id"),
+        null().label("room_number"),
+        PG.id.label("pg_id"),
+        PG.name.label("pg_name"),
+        ranked(exact, prefix),
+        name.label("sort_name")
+    ).join(
+        PG, User.invited_pg_id == PG.id
+    ).outerjoin(
+        TenantProfile, TenantProfile.user_id == User.id
+    ).where(
+        PG.admin_id == current_user.id,
+        User.role == UserRole.TENANT,
+        TenantProfile.id == None,
+        or_(*prefix, *word, *substring)
+    )
+
+    if pg_id is not None:
+        assigned = assigned.where(PG.id == pg_id)
+        invited = invited.where(PG.id == pg_id)
+
+    results = union_all(assigned, invited).subquery("results")
+    key = (results.c.rank, results.c.sort_name, results.c.user_id)
+    stmt = select(results)
+    if cursor is not None:
+        stmt = stmt.where(tuple_(*key) > tuple_(*_parse_search_cursor(cursor)))
+
+    # Fetch one extra row to know whether another page exists
+    rows = db.execute(stmt.order_by(*key).limit(limit + 1)).all()
+
+    page = {"items": [], "next_cursor": None}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        page["next_cursor"] = f"{rows[-1].rank}:{rows[-1].user_id}:{rows[-1].sort_name}"
+
+    page["items"] = [
+        {column: value for column, value in row._asdict().items() if column != "sort_name"}
+        for row in rows
     ]
+    return page
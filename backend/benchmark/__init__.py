@@ -0,0 +1,6 @@
+"""
+Benchmark tooling for the backend.
+
+- benchmark.seed: migrate a scratch Postgres database and bulk-load a synthetic portfolio
+- benchmark.driver: run a weighted mix of real endpoints and report latency percentiles
+"""
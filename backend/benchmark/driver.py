@@ -0,0 +1,259 @@
+"""
+Load driver for the real endpoints.
+
+Each virtual user logs in as a random seeded admin (see benchmark.seed), lists
+its PGs, then keeps issuing a weighted mix of requests until the run ends.
+Latencies are recorded per route template and summarized as throughput and
+p50/p95/p99; the summary is printed and written to JSON.
+
+    cd backend
+    python -m benchmark.driver --in-process --duration 30 --out results/before.json
+    python -m benchmark.driver --url http://127.0.0.1:8000 --concurrency 32 \\
+        --out results/after.json --compare results/before.json
+
+--in-process drives app.main:app through httpx's ASGI transport, so no server is
+needed; --url drives a running uvicorn (or anything behind it).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+import httpx
+
+PASSWORD = "password"
+
+# Relative weight of each request type
+DEFAULT_MIX = {
+    "login": 1,
+    "pgs": 4,
+    "rooms": 4,
+    "available": 3,
+    "tenants": 4,
+}
+
+# Request type -> route template the latencies are reported under
+ROUTES = {
+    "login": "POST /auth/login",
+    "pgs": "GET /pg/get",
+    "rooms": "GET /rooms/{pg_id}",
+    "available": "GET /beds/available",
+    "tenants": "GET /tenants/",
+}
+
+# Settings that change what a run measures, recorded with the results
+ENV_KEYS = [
+    "DB_MODE", "PG_STATS_MODE", "RENT_ROLLUPS", "DB_POOL_SIZE", "DB_MAX_OVERFLOW",
+    "DB_POOLER_MODE", "DB_POOL_CLASS", "AUTH_CACHE_SIZE", "BCRYPT_ROUNDS", "HASH_POOL_SIZE",
+]
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {name!r}, expected one of {', '.join(ROUTES)}")
+        mix[name] = int(weight)
+    return mix
+
+def percentile(sorted_values: list, p: float):
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, route: str, started: float, status: int):
+        if started < self.measure_from:
+            return
+        self.samples.setdefault(route, []).append(time.perf_counter() - started)
+        if status >= 400:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        def stats(latencies, errors):
+            latencies = sorted(latencies)
+            ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+            return {
+                "requests": len(latencies),
+                "errors": errors,
+                "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+                "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+                "p50_ms": ms(percentile(latencies, 50)),
+                "p95_ms": ms(percentile(latencies, 95)),
+                "p99_ms": ms(percentile(latencies, 99)),
+                "max_ms": ms(latencies[-1]) if latencies else None,
+            }
+
+        routes = {route: stats(latencies, self.errors.get(route, 0)) for route, latencies in sorted(self.samples.items())}
+        everything = [latency for latencies in self.samples.values() for latency in latencies]
+        return {"routes": routes, "totals": stats(everything, sum(self.errors.values()))}
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, admins: int, page_size: int):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.admins = admins
+        self.page_size = page_size
+        self.pg_ids = []
+
+    async def request(self, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.recorder.record(ROUTES[name], started, response.status_code)
+        return response
+
+    async def login(self):
+        admin = self.rng.randint(1, self.admins)
+        response = await self.request("login", "POST", "/auth/login", json={"email": f"admin{admin}@example.com", "password": PASSWORD})
+        if response.status_code != 200:
+            # Shed by the server (503 + Retry-After) or a bad seed; back off and let run() retry
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+            return
+        await self.pgs()
+
+    async def pgs(self):
+        response = await self.request("pgs", "GET", "/pg/get")
+        if response.status_code == 200:
+            self.pg_ids = [pg["id"] for pg in response.json()]
+
+    async def rooms(self):
+        if self.pg_ids:
+            await self.request("rooms", "GET", f"/rooms/{self.rng.choice(self.pg_ids)}")
+
+    async def available(self):
+        await self.request("available", "GET", "/beds/available")
+
+    async def tenants(self):
+        await self.request("tenants", "GET", "/tenants/", params={"limit": self.page_size})
+
+    async def run(self, mix: dict, deadline: float):
+        names, weights = list(mix), list(mix.values())
+        while time.perf_counter() < deadline:
+            if "access_token" not in self.client.cookies:
+                await self.login()
+                continue
+            await getattr(self, self.rng.choices(names, weights)[0])()
+
+
+def _client(args, transport):
+    if transport is not None:
+        return httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout)
+    return httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+async def run(args) -> dict:
+    transport = None
+    if args.in_process:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+
+    started = time.perf_counter()
+    recorder = Recorder(measure_from=started + args.warmup)
+    deadline = started + args.warmup + args.duration
+
+    clients = [_client(args, transport) for _ in range(args.concurrency)]
+    try:
+        users = [
+            VirtualUser(client, recorder, random.Random(args.seed + i), args.admins, args.page_size)
+            for i, client in enumerate(clients)
+        ]
+        await asyncio.gather(*(user.run(args.mix, deadline) for user in users))
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+    elapsed = time.perf_counter() - recorder.measure_from
+    return dict(
+        started_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        config={
+            "target": "in-process" if args.in_process else args.url,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "admins": args.admins,
+            "page_size": args.page_size,
+            "seed": args.seed,
+            "git_commit": _git_commit(),
+            "env": {key: os.environ[key] for key in ENV_KEYS if key in os.environ},
+        },
+        elapsed_s=round(elapsed, 2),
+        **recorder.summary(elapsed)
+    )
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+### Reporting
+
+def _change(current, previous):
+    if current is None or not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+def print_report(result: dict, baseline: dict = None):
+    columns = ["requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+    print(f"{'route':24}" + "".join(f"{column:>16}" for column in columns))
+
+    rows = list(result["routes"].items()) + [("total", result["totals"])]
+    for route, stats in rows:
+        previous = (baseline or {}).get("routes", {}).get(route) if route != "total" else (baseline or {}).get("totals")
+        cells = []
+        for column in columns:
+            cell = "-" if stats[column] is None else str(stats[column])
+            if previous and column in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+                cell += f" ({_change(stats[column], previous.get(column))})"
+            cells.append(f"{cell:>16}")
+        print(f"{route:24}" + "".join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--in-process", action="store_true", help="drive app.main:app without a server")
+    target.add_argument("--url", help="base URL of a running server, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds run before measuring")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--admins", type=int, default=20, help="seeded admins to log in as (admin1..adminN)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="weights, e.g. login=1,pgs=4,rooms=4,available=3,tenants=4")
+    parser.add_argument("--page-size", type=int, default=50, help="limit for GET /tenants/")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the request sequence")
+    parser.add_argument("--out", help="write the results JSON here")
+    parser.add_argument("--compare", help="results JSON of an earlier run to diff against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
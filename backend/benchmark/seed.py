@@ -0,0 +1,259 @@
+"""
+Synthetic portfolio generator.
+
+Migrates the database to head and bulk-loads admins, PGs, rooms, beds, seated
+and waiting tenants, rents, rent rollups and PG counters with set-based
+INSERT ... SELECT over generate_series, so even the large preset loads in
+minutes. Postgres only.
+
+    cd backend
+    python -m benchmark.seed --preset large            # uses DATABASE_URL
+    python -m benchmark.seed --admins 50 --pgs 500 --beds 20000 --tenants 15000 --reset
+
+Everything is deterministic: admin i is admin{i}@example.com, tenant k is
+tenant{k}@example.com, all with the password "password", and admin i owns
+PG i, whose invite code is invite-{i} (unlimited uses).
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass, asdict
+from datetime import date
+from sqlalchemy import create_engine, text
+
+PASSWORD = "password"
+
+@dataclass(frozen=True)
+class Portfolio:
+    admins: int
+    pgs: int
+    rooms: int
+    beds: int
+    # Tenants with a bed, spread evenly over all beds
+    tenants: int
+    # Tenant users invited to a PG but not yet given a bed
+    waiting: int = 0
+    # Months of rent history per seated tenant, ending with the current month
+    months: int = 3
+
+    def __post_init__(self):
+        if not self.admins <= self.pgs <= self.rooms <= self.beds:
+            raise ValueError("Need admins <= pgs <= rooms <= beds")
+        if self.tenants > self.beds:
+            raise ValueError("More tenants than beds")
+
+PRESETS = {
+    "small": Portfolio(admins=20, pgs=200, rooms=2_000, beds=6_000, tenants=4_000, waiting=200),
+    "medium": Portfolio(admins=200, pgs=2_000, rooms=20_000, beds=60_000, tenants=40_000, waiting=2_000),
+    "large": Portfolio(admins=1_000, pgs=20_000, rooms=250_000, beds=1_000_000, tenants=800_000, waiting=20_000),
+}
+
+TABLES = ["invites", "occupancy_rollups", "occupancy_events", "rent_rollups", "rents", "tenants", "beds", "rooms", "pgs", "users"]
+
+SEED = [
+    """
+    INSERT INTO users (id, name, email, password_hash, role)
+    SELECT i, 'Admin ' || i, 'admin' || i || '@example.com', :password_hash, 'ADMIN'
+    FROM generate_series(1, :admins) AS i
+    """,
+    # PG i belongs to admin (i - 1) % admins + 1, so admin i owns PG i
+    """
+    INSERT INTO pgs (id, name, address, admin_id)
+    SELECT i, 'PG ' || i, i || ' Main Road', (i - 1) % :admins + 1
+    FROM generate_series(1, :pgs) AS i
+    """,
+    """
+    INSERT INTO rooms (id, room_number, pg_id)
+    SELECT i, 100 + row_number() OVER (PARTITION BY pg_id ORDER BY i), pg_id
+    FROM (
+        SELECT i, (i - 1)::bigint * :pgs / :rooms + 1 AS pg_id
+        FROM generate_series(1, :rooms) AS i
+    ) AS numbered
+    """,
+    # Bed i is occupied when i * tenants / beds steps up, which spreads exactly
+    # `tenants` occupied beds evenly over the portfolio
+    """
+    INSERT INTO beds (id, rent, is_occupied, room_id)
+    SELECT i,
+           3000 + (i * 37 % 50) * 100,
+           i::bigint * :tenants / :beds > (i - 1)::bigint * :tenants / :beds,
+           (i - 1)::bigint * :rooms / :beds + 1
+    FROM generate_series(1, :beds) AS i
+    """,
+    """
+    INSERT INTO users (id, name, email, password_hash, role, invited_pg_id)
+    SELECT :admins + k, 'Tenant ' || k, 'tenant' || k || '@example.com', :password_hash, 'TENANT', pg_id
+    FROM (
+        SELECT row_number() OVER (ORDER BY b.id) AS k, r.pg_id
+        FROM beds b JOIN rooms r ON r.id = b.room_id
+        WHERE b.is_occupied
+    ) AS seated
+    """,
+    """
+    INSERT INTO tenants (id, user_id, bed_id, move_in_date)
+    SELECT k, :admins + k, bed_id, CAST(:first_month AS date) - (k % 365)::int
+    FROM (
+        SELECT row_number() OVER (ORDER BY id) AS k, id AS bed_id
+        FROM beds WHERE is_occupied
+    ) AS seated
+    """,
+    """
+    INSERT INTO users (id, name, email, password_hash, role, invited_pg_id)
+    SELECT :admins + :tenants + i, 'Tenant ' || (:tenants + i), 'tenant' || (:tenants + i) || '@example.com',
+           :password_hash, 'TENANT', (i - 1) % :pgs + 1
+    FROM generate_series(1, :waiting) AS i
+    """,
+    # Every fourth tenant is behind on rent
+    """
+    INSERT INTO rents (tenant_id, month, amount, status, paid_on)
+    SELECT t.id, m.month, b.rent,
+           CASE WHEN t.id % 4 = 0 THEN 'DUE' ELSE 'PAID' END::rentstatus,
+           CASE WHEN t.id % 4 = 0 THEN NULL ELSE m.month + 4 END
+    FROM tenants t
+    JOIN beds b ON b.id = t.bed_id
+    CROSS JOIN unnest(CAST(:months AS date[])) AS m(month)
+    """,
+    """
+    INSERT INTO rent_rollups (pg_id, month, billed, collected, rents, paid)
+    SELECT r.pg_id, rent.month, sum(rent.amount),
+           sum(CASE WHEN rent.status = 'PAID' THEN rent.amount ELSE 0 END),
+           count(*), sum(CASE WHEN rent.status = 'PAID' THEN 1 ELSE 0 END)
+    FROM rents rent
+    JOIN tenants t ON t.id = rent.tenant_id
+    JOIN beds b ON b.id = t.bed_id
+    JOIN rooms r ON r.id = b.room_id
+    GROUP BY r.pg_id, rent.month
+    """,
+    # Occupancy history: every PG's rooms and beds a year before the first move-in,
+    # then each day's move-ins, folded into day and month rollups
+    """
+    INSERT INTO occupancy_events (pg_id, occurred_at, cause, rooms_delta, beds_delta, occupied_delta)
+    SELECT r.pg_id, CAST(:first_month AS date) - 366, 'baseline', count(DISTINCT r.id), count(b.id), 0
+    FROM rooms r LEFT JOIN beds b ON b.room_id = r.id
+    GROUP BY r.pg_id
+    """,
+    """
+    INSERT INTO occupancy_events (pg_id, occurred_at, cause, rooms_delta, beds_delta, occupied_delta)
+    SELECT r.pg_id, t.move_in_date, 'tenant.assigned', 0, 0, count(*)
+    FROM tenants t
+    JOIN beds b ON b.id = t.bed_id
+    JOIN rooms r ON r.id = b.room_id
+    GROUP BY r.pg_id, t.move_in_date
+    """,
+    """
+    INSERT INTO occupancy_rollups (pg_id, period, period_start, beds_delta, occupied_delta, changes)
+    SELECT pg_id, 'day', CAST(occurred_at AS date), sum(beds_delta), sum(occupied_delta), count(*)
+    FROM occupancy_events
+    GROUP BY pg_id, CAST(occurred_at AS date)
+    UNION ALL
+    SELECT pg_id, 'month', CAST(date_trunc('month', occurred_at) AS date), sum(beds_delta), sum(occupied_delta), count(*)
+    FROM occupancy_events
+    GROUP BY pg_id, date_trunc('month', occurred_at)
+    """,
+    # Statistics for the bulk-loaded tables, so the next statement is planned as a hash join
+    "ANALYZE",
+    """
+    UPDATE pgs SET
+        total_rooms = stats.rooms,
+        total_beds = stats.beds,
+        occupied_beds = stats.occupied
+    FROM (
+        SELECT r.pg_id,
+               count(DISTINCT r.id) AS rooms,
+               count(b.id) AS beds,
+               sum(CASE WHEN b.is_occupied THEN 1 ELSE 0 END) AS occupied
+        FROM rooms r LEFT JOIN beds b ON b.room_id = r.id
+        GROUP BY r.pg_id
+    ) AS stats
+    WHERE stats.pg_id = pgs.id
+    """,
+    # Admin i's code for PG i, good for any number of signups
+    """
+    INSERT INTO invites (code, pg_id, created_by, max_uses, uses, created_at)
+    SELECT 'invite-' || id, id, id, 1000000, 0, now()
+    FROM users WHERE role = 'ADMIN'
+    """,
+]
+
+def _months(count: int, until: date) -> list[date]:
+    months = []
+    year, month = until.year, until.month
+    for _ in range(count):
+        months.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+def migrate(url: str):
+    from alembic import command
+    from alembic.config import Config
+
+    root = os.path.join(os.path.dirname(__file__), "..")
+    config = Config(os.path.join(root, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(root, "migrations"))
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    command.upgrade(config, "head")
+
+def seed(engine, portfolio: Portfolio, reset: bool = False, until: date = None, verbose: bool = True) -> bool:
+    """Load the portfolio; returns False when the database already had data and reset is off"""
+    from app.core.security import hash_password
+
+    def log(message):
+        if verbose:
+            print(message, flush=True)
+
+    with engine.begin() as conn:
+        if reset:
+            conn.execute(text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+        elif conn.execute(text("SELECT EXISTS (SELECT 1 FROM users)")).scalar():
+            log("Database already has users, skipping the seed (use --reset to reload)")
+            return False
+
+        months = _months(portfolio.months, until or date.today())
+        params = dict(
+            asdict(portfolio),
+            months=months,
+            first_month=months[0] if months else (until or date.today()),
+            password_hash=hash_password(PASSWORD)
+        )
+        for statement in SEED:
+            started = time.perf_counter()
+            result = conn.execute(text(statement), params)
+            label = " ".join(statement.split()[:3])
+            log(f"{label:32} {max(result.rowcount, 0):>10} rows  {time.perf_counter() - started:7.2f}s")
+
+        for table in ["users", "pgs", "rooms", "beds", "tenants", "rents", "occupancy_events"]:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT coalesce(max(id), 1) FROM {table}))"
+            ))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    for field in ["admins", "pgs", "rooms", "beds", "tenants", "waiting", "months"]:
+        parser.add_argument(f"--{field}", type=int, help=f"override the preset's {field}")
+    parser.add_argument("--reset", action="store_true", help="truncate all tables first")
+    args = parser.parse_args()
+
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        parser.error("A Postgres DATABASE_URL (or --database-url) is required")
+
+    overrides = {
+        field: value for field, value in vars(args).items()
+        if field in Portfolio.__dataclass_fields__ and value is not None
+    }
+    portfolio = Portfolio(**dict(asdict(PRESETS[args.preset]), **overrides))
+
+    # The migration environment imports the app, whose engine reads DATABASE_URL
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+    migrate(args.database_url)
+    started = time.perf_counter()
+    if seed(create_engine(args.database_url), portfolio, reset=args.reset):
+        print(f"Seeded {portfolio} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
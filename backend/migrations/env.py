@@ -0,0 +1,54 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from app.core.database import Base
+from app.core.settings import get_settings
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The pg_trgm indexes from 0007 exist only where the extension is available,
+    # so they are not on the models; don't report them as extra
+    return not (type_ == "index" and reflected and compare_to is None and name.endswith("_trgm"))
+
+def _url():
+    # An explicit sqlalchemy.url (e.g. set by benchmark.seed.migrate) wins over DATABASE_URL
+    return config.get_main_option("sqlalchemy.url") or get_settings().database_url
+
+def run_migrations_offline():
+    url = _url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        render_as_batch=url.startswith("sqlite")
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    url = _url()
+    engine = create_engine(url, poolclass=NullPool)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite cannot ALTER constraints in place; batch mode recreates the table
+            render_as_batch=url.startswith("sqlite")
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,99 @@
+"""baseline schema: users, pgs, rooms, beds, tenants, rents
+
+Databases created before migrations existed are at this revision; mark them with
+`alembic stamp 0001` if pgs has no total_rooms column, `alembic stamp 0001a` if
+it has one but rents.month is still a string, `alembic stamp 0002` if it is
+already a date.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum("ADMIN", "TENANT", name="userrole")
+rent_status = sa.Enum("PAID", "DUE", name="rentstatus")
+
+
+def upgrade():
+    # users <-> pgs reference each other; the users -> pgs key is added once both exist
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("role", user_role, nullable=True),
+        sa.Column("invited_pg_id", sa.Integer(), nullable=True),
+        sa.Column("invite_code", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_invite_code", "users", ["invite_code"])
+
+    op.create_table(
+        "pgs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("admin_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_pgs_id", "pgs", ["id"])
+
+    with op.batch_alter_table("users") as batch:
+        batch.create_foreign_key("users_invited_pg_id_fkey", "pgs", ["invited_pg_id"], ["id"])
+
+    op.create_table(
+        "rooms",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("room_number", sa.Integer(), nullable=False),
+        sa.Column("pg_id", sa.Integer(), sa.ForeignKey("pgs.id"), nullable=False),
+    )
+    op.create_index("ix_rooms_id", "rooms", ["id"])
+
+    op.create_table(
+        "beds",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("rent", sa.Integer(), nullable=False),
+        sa.Column("is_occupied", sa.Boolean(), nullable=True),
+        sa.Column("room_id", sa.Integer(), sa.ForeignKey("rooms.id"), nullable=False),
+    )
+    op.create_index("ix_beds_id", "beds", ["id"])
+
+    op.create_table(
+        "tenants",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("bed_id", sa.Integer(), sa.ForeignKey("beds.id"), nullable=False, unique=True),
+        sa.Column("move_in_date", sa.Date(), nullable=False),
+    )
+    op.create_index("ix_tenants_id", "tenants", ["id"])
+
+    op.create_table(
+        "rents",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("status", rent_status, nullable=True),
+    )
+    op.create_index("ix_rents_id", "rents", ["id"])
+
+
+def downgrade():
+    op.drop_table("rents")
+    op.drop_table("tenants")
+    op.drop_table("beds")
+    op.drop_table("rooms")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_constraint("users_invited_pg_id_fkey", type_="foreignkey")
+    op.drop_table("pgs")
+    op.drop_table("users")
+    rent_status.drop(op.get_bind(), checkfirst=True)
+    user_role.drop(op.get_bind(), checkfirst=True)
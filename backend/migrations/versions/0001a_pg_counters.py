@@ -0,0 +1,38 @@
+"""pg occupancy counters, filled in from existing rooms and beds
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001a"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("pgs") as batch:
+        batch.add_column(sa.Column("total_rooms", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("total_beds", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("occupied_beds", sa.Integer(), nullable=False, server_default="0"))
+
+    # Correct from the start, so PG_STATS_MODE=counters can be enabled right after upgrading
+    op.execute("""
+        UPDATE pgs SET
+            total_rooms = (SELECT count(*) FROM rooms WHERE rooms.pg_id = pgs.id),
+            total_beds = (SELECT count(*) FROM beds JOIN rooms ON rooms.id = beds.room_id WHERE rooms.pg_id = pgs.id),
+            occupied_beds = (
+                SELECT count(*) FROM beds JOIN rooms ON rooms.id = beds.room_id
+                WHERE rooms.pg_id = pgs.id AND beds.is_occupied
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table("pgs") as batch:
+        batch.drop_column("occupied_beds")
+        batch.drop_column("total_beds")
+        batch.drop_column("total_rooms")
@@ -0,0 +1,65 @@
+"""date-typed rent months, rent indexes and rent_rollups
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Free-form month strings ("2026-03", "2026-03-01") become the first day of the month
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.batch_alter_table("rents") as batch:
+        batch.alter_column(
+            "month",
+            existing_type=sa.String(),
+            type_=sa.Date(),
+            existing_nullable=False,
+            postgresql_using="to_date(left(month, 7), 'YYYY-MM')"
+        )
+        batch.add_column(sa.Column("paid_on", sa.Date(), nullable=True))
+        batch.create_unique_constraint("uq_rents_tenant_month", ["tenant_id", "month"])
+    if not postgres:
+        op.execute("UPDATE rents SET month = substr(month, 1, 7) || '-01'")
+
+    op.create_index(
+        "ix_rents_tenant_month_status", "rents", ["tenant_id", "month", "status"],
+        postgresql_include=["amount"]
+    )
+    op.create_index(
+        "ix_rents_month_status", "rents", ["month", "status"],
+        postgresql_include=["amount", "tenant_id"]
+    )
+
+    op.create_table(
+        "rent_rollups",
+        sa.Column("pg_id", sa.Integer(), sa.ForeignKey("pgs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("billed", sa.Integer(), nullable=False),
+        sa.Column("collected", sa.Integer(), nullable=False),
+        sa.Column("rents", sa.Integer(), nullable=False),
+        sa.Column("paid", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("rent_rollups")
+    op.drop_index("ix_rents_month_status", table_name="rents")
+    op.drop_index("ix_rents_tenant_month_status", table_name="rents")
+    with op.batch_alter_table("rents") as batch:
+        batch.drop_constraint("uq_rents_tenant_month", type_="unique")
+        batch.drop_column("paid_on")
+        batch.alter_column(
+            "month",
+            existing_type=sa.Date(),
+            type_=sa.String(),
+            existing_nullable=False,
+            postgresql_using="to_char(month, 'YYYY-MM')"
+        )
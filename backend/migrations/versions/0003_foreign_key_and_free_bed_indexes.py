@@ -0,0 +1,46 @@
+"""indexes on the foreign keys the services filter by, partial index on free beds
+
+Built CONCURRENTLY on Postgres so writes to live tables are not blocked.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# tenants.bed_id / tenants.user_id are already covered by their unique constraints,
+# rents.tenant_id by ix_rents_tenant_month_status
+INDEXES = [
+    ("ix_pgs_admin_id", "pgs", ["admin_id"]),
+    ("ix_rooms_pg_id", "rooms", ["pg_id"]),
+    ("ix_beds_room_id", "beds", ["room_id"]),
+    ("ix_users_invited_pg_id", "users", ["invited_pg_id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(
+            "ix_beds_free_room_id_rent",
+            "beds",
+            ["room_id", "rent"],
+            postgresql_where=sa.text("is_occupied = false"),
+            sqlite_where=sa.text("is_occupied = 0"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_beds_free_room_id_rent", table_name="beds", postgresql_concurrently=True)
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
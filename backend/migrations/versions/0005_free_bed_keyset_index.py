@@ -0,0 +1,39 @@
+"""free-bed partial index extended with id, for keyset pages ordered by (rent, id)
+
+Built CONCURRENTLY on Postgres; the new index is created before the old one is dropped.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def _create(name, columns):
+    op.create_index(
+        name,
+        "beds",
+        columns,
+        postgresql_where=sa.text("is_occupied = false"),
+        sqlite_where=sa.text("is_occupied = 0"),
+        postgresql_concurrently=True,
+        if_not_exists=True
+    )
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        _create("ix_beds_free_room_id_rent_id", ["room_id", "rent", "id"])
+        op.drop_index("ix_beds_free_room_id_rent", table_name="beds", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        _create("ix_beds_free_room_id_rent", ["room_id", "rent"])
+        op.drop_index("ix_beds_free_room_id_rent_id", table_name="beds", postgresql_concurrently=True)
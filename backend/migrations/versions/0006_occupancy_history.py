@@ -0,0 +1,73 @@
+"""occupancy_events and per-day / per-month occupancy_rollups
+
+Existing PGs get a "baseline" event with their current room, bed and
+occupied-bed counts, so the rollups' running totals start from today's state.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from datetime import date, datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "occupancy_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("pg_id", sa.Integer(), sa.ForeignKey("pgs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("cause", sa.String(), nullable=False),
+        sa.Column("rooms_delta", sa.Integer(), nullable=False),
+        sa.Column("beds_delta", sa.Integer(), nullable=False),
+        sa.Column("occupied_delta", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_occupancy_events_id", "occupancy_events", ["id"])
+    op.create_index("ix_occupancy_events_pg_id_occurred_at", "occupancy_events", ["pg_id", "occurred_at"])
+
+    op.create_table(
+        "occupancy_rollups",
+        sa.Column("pg_id", sa.Integer(), sa.ForeignKey("pgs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("period", sa.String(), primary_key=True),
+        sa.Column("period_start", sa.Date(), primary_key=True),
+        sa.Column("beds_delta", sa.Integer(), nullable=False),
+        sa.Column("occupied_delta", sa.Integer(), nullable=False),
+        sa.Column("changes", sa.Integer(), nullable=False),
+    )
+
+    now = datetime.now()
+    today = now.date()
+    counts = """
+        SELECT p.id AS pg_id,
+               (SELECT count(*) FROM rooms r WHERE r.pg_id = p.id) AS rooms,
+               count(b.id) AS beds,
+               coalesce(sum(CASE WHEN b.is_occupied THEN 1 ELSE 0 END), 0) AS occupied
+        FROM pgs p
+        LEFT JOIN rooms r ON r.pg_id = p.id
+        LEFT JOIN beds b ON b.room_id = r.id
+        GROUP BY p.id
+    """
+    op.get_bind().execute(sa.text(f"""
+        INSERT INTO occupancy_events (pg_id, occurred_at, cause, rooms_delta, beds_delta, occupied_delta)
+        SELECT pg_id, :now, 'baseline', rooms, beds, occupied FROM ({counts}) AS counts
+        WHERE rooms > 0 OR beds > 0
+    """), {"now": now})
+    for period, start in (("day", today), ("month", date(today.year, today.month, 1))):
+        op.get_bind().execute(sa.text("""
+            INSERT INTO occupancy_rollups (pg_id, period, period_start, beds_delta, occupied_delta, changes)
+            SELECT pg_id, :period, :start, beds_delta, occupied_delta, 1
+            FROM occupancy_events WHERE cause = 'baseline' AND beds_delta > 0
+        """), {"period": period, "start": start})
+
+
+def downgrade():
+    op.drop_table("occupancy_rollups")
+    op.drop_index("ix_occupancy_events_pg_id_occurred_at", table_name="occupancy_events")
+    op.drop_index("ix_occupancy_events_id", table_name="occupancy_events")
+    op.drop_table("occupancy_events")
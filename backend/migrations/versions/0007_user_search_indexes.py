@@ -0,0 +1,62 @@
+"""lower(name) / lower(email) indexes for tenant search, plus pg_trgm indexes where available
+
+Built CONCURRENTLY on Postgres. The trigram indexes need the pg_trgm extension;
+where it cannot be installed they are skipped and substring search scans the
+caller's own tenants instead.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {"ix_users_name_trgm": "name", "ix_users_email_trgm": "email"}
+
+
+def _has_trigram(bind) -> bool:
+    if bind.dialect.name != "postgresql":
+        return False
+    available = bind.execute(sa.text(
+        "SELECT count(*) FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )).scalar()
+    if not available:
+        return False
+    bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    return True
+
+
+def upgrade():
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        for column in ("name", "email"):
+            op.create_index(
+                f"ix_users_{column}_lower",
+                "users",
+                [sa.text(f"lower({column}) text_pattern_ops" if bind.dialect.name == "postgresql" else f"lower({column})")],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+        if _has_trigram(bind):
+            for name, column in TRIGRAM_INDEXES.items():
+                op.create_index(
+                    name,
+                    "users",
+                    [sa.text(f"lower({column}) gin_trgm_ops")],
+                    postgresql_using="gin",
+                    postgresql_concurrently=True,
+                    if_not_exists=True
+                )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name="users", postgresql_concurrently=True, if_exists=True)
+        for column in ("name", "email"):
+            op.drop_index(f"ix_users_{column}_lower", table_name="users", postgresql_concurrently=True)
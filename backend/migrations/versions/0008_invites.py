@@ -0,0 +1,70 @@
+"""invites table replacing users.invite_code
+
+Each admin's pending code (users.invite_code / invited_pg_id) becomes a
+single-use invite without expiry, and the admin's invited_pg_id is cleared;
+tenants keep theirs. Downgrading restores the columns empty: outstanding
+invites are dropped.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def _restore_search_indexes():
+    # On SQLite, batch mode copies users into a new table using what reflection
+    # sees, which misses expression indexes: put back the ones from 0007
+    if op.get_bind().dialect.name == "sqlite":
+        for column in ("name", "email"):
+            op.create_index(f"ix_users_{column}_lower", "users", [sa.text(f"lower({column})")], if_not_exists=True)
+
+
+def upgrade():
+    op.create_table(
+        "invites",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("code", sa.String(), nullable=False),
+        sa.Column("pg_id", sa.Integer(), sa.ForeignKey("pgs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("max_uses", sa.Integer(), nullable=False),
+        sa.Column("uses", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_invites_id", "invites", ["id"])
+    op.create_index("ix_invites_code", "invites", ["code"], unique=True)
+    op.create_index("ix_invites_pg_id", "invites", ["pg_id"])
+
+    bind = op.get_bind()
+    bind.execute(sa.text("""
+        INSERT INTO invites (code, pg_id, created_by, max_uses, uses, expires_at, created_at)
+        SELECT u.invite_code, u.invited_pg_id, u.id, 1, 0, NULL, :now
+        FROM users u JOIN pgs p ON p.id = u.invited_pg_id AND p.admin_id = u.id
+        WHERE u.invite_code IS NOT NULL
+    """), {"now": datetime.now()})
+    bind.execute(sa.text("UPDATE users SET invited_pg_id = NULL WHERE invite_code IS NOT NULL"))
+
+    op.drop_index("ix_users_invite_code", table_name="users")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("invite_code")
+    _restore_search_indexes()
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch:
+        batch.add_column(sa.Column("invite_code", sa.String(), nullable=True))
+    _restore_search_indexes()
+    op.create_index("ix_users_invite_code", "users", ["invite_code"])
+
+    op.drop_index("ix_invites_pg_id", table_name="invites")
+    op.drop_index("ix_invites_code", table_name="invites")
+    op.drop_index("ix_invites_id", table_name="invites")
+    op.drop_table("invites")
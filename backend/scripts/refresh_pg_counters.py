@@ -0,0 +1,27 @@
+"""
+Recompute the occupancy counters stored on pgs (total_rooms, total_beds,
+occupied_beds) from rooms and beds.
+
+The services only keep them up to date while PG_STATS_MODE=counters. Run this
+when switching to counters on a database the app served in aggregate mode, or
+after editing rooms or beds by hand:
+
+    cd backend
+    python -m scripts.refresh_pg_counters [--admin-id 7]   # uses DATABASE_URL
+"""
+import argparse
+import app.models  # noqa: F401 - every mapper, before the first query
+from app.core.database import get_sessionmaker
+from app.services.pg_service import refresh_pg_counters
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--admin-id", type=int, help="only refresh this admin's PGs")
+    args = parser.parse_args()
+
+    with get_sessionmaker()() as db:
+        refreshed = refresh_pg_counters(db, args.admin_id)
+    print(f"Refreshed the counters of {refreshed} PG(s)")
+
+if __name__ == "__main__":
+    main()
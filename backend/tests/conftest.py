@@ -0,0 +1,37 @@
+import os
+
+# Before the app is imported: security.py reads these at import. A low bcrypt
+# cost keeps signups and logins fast, and without the hash pool they run inline
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("HASH_POOL_SIZE", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core import database
+from app.core.settings import Settings, use_settings
+from app.main import create_app
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+@pytest.fixture(params=["sync", "async"])
+def settings(request, tmp_path) -> Settings:
+    """A fresh SQLite database per test, served by both DB modes"""
+    return Settings(
+        database_url=f"sqlite:///{tmp_path / 'test.db'}", db_mode=request.param,
+        jwt_secret="test", rate_limit_enabled=False
+    )
+
+@pytest.fixture
+def client(settings):
+    with use_settings(settings):
+        database.Base.metadata.create_all(database.get_engine())
+    with TestClient(create_app(settings)) as client:
+        yield client
+    database.reset()
+
+@pytest.fixture
+def db(settings, client):
+    """A session on the test app's database, for arranging rows and checking results"""
+    with use_settings(settings):
+        session = database.get_sessionmaker()()
+    yield session
+    session.close()
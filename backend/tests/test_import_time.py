@@ -0,0 +1,116 @@
+"""
+Import-time and worker-boot tests for the application.
+
+Import app.main and run create_app() in fresh interpreters (no DATABASE_URL,
+JWT_SECRET or other settings in the environment), once per DB_MODE, and fail
+when:
+
+- importing the app or building it takes longer than the budget
+  (IMPORT_TIME_BUDGET_MS, 1500 by default, best of three runs)
+- building it connects, creates an engine, starts a thread or a process, or
+  imports a database driver: all of that belongs to the first request, so a
+  server can preload the app in its parent process and fork workers from it
+
+    cd backend
+    python -m pytest tests/test_import_time.py
+
+A failure over budget lists the slowest imports from `python -X importtime`, to
+show where a regression came from.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+# Fresh interpreters per mode; the fastest counts
+RUNS = 3
+
+# Database drivers: imported by the first engine, on the first request
+LAZY_MODULES = ("asyncpg", "aiosqlite", "psycopg2", "psycopg")
+
+PROBE = """
+import json, sys, time, threading, multiprocessing
+started = time.perf_counter()
+from app.main import create_app
+from app.core import database
+from app.core.settings import Settings
+imported = time.perf_counter()
+create_app(Settings(database_url="sqlite://", jwt_secret="check", db_mode=sys.argv[1]))
+created = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_ms": (created - imported) * 1000,
+    "engines": [
+        name for engines in database._engines.values()
+        for name in ("engine", "async_engine") if getattr(engines, name) is not None
+    ],
+    "threads": threading.active_count() - 1,
+    "processes": len(multiprocessing.active_children()),
+    "lazy_imported": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+# Settings the app reads; the probe runs without them to prove import does not need them
+SETTINGS_ENV = (
+    "DATABASE_URL", "ASYNC_DATABASE_URL", "DATABASE_REPLICA_URLS", "DB_MODE",
+    "JWT_SECRET", "ALGORITHM", "ACCESS_TOKEN_EXPIRE_MINUTES",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _env() -> dict:
+    env = {name: value for name, value in os.environ.items() if name not in SETTINGS_ENV}
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+def probe(db_mode: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, db_mode],
+        cwd=ROOT, env=_env(), capture_output=True, text=True
+    )
+    assert result.returncode == 0, f"Importing or building the app failed:\n{result.stderr}"
+    return json.loads(result.stdout.splitlines()[-1])
+
+def slowest_imports(top: int = 15) -> list[tuple[str, int, int]]:
+    """(module, self us, cumulative us) of the app's modules and the packages it imports directly"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if match and (match[4].startswith("app.") or len(match[3]) <= 3):
+            rows.append((match[4], int(match[1]), int(match[2])))
+    return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+
+@pytest.fixture(scope="module", params=["sync", "async"])
+def boot(request) -> dict:
+    results = [probe(request.param) for _ in range(RUNS)]
+    return min(results, key=lambda result: result["import_ms"] + result["create_ms"])
+
+def test_within_budget(boot):
+    total = boot["import_ms"] + boot["create_ms"]
+    if total > BUDGET_MS:
+        pytest.fail(
+            f"import {boot['import_ms']:.0f}ms + create_app {boot['create_ms']:.0f}ms = {total:.0f}ms"
+            f" is over the {BUDGET_MS:.0f}ms budget. Slowest imports (cumulative):\n" + "\n".join(
+                f"  {cumulative / 1000:7.1f}ms  (self {own / 1000:5.1f}ms)  {module}"
+                for module, own, cumulative in slowest_imports()
+            )
+        )
+
+def test_no_engines(boot):
+    assert not boot["engines"], f"create_app() created {', '.join(boot['engines'])}"
+
+def test_no_threads_or_processes(boot):
+    assert not boot["threads"] and not boot["processes"], (
+        f"create_app() started {boot['threads']} thread(s), {boot['processes']} process(es)"
+    )
+
+def test_no_database_drivers(boot):
+    assert not boot["lazy_imported"], f"imported at boot: {', '.join(boot['lazy_imported'])}"
@@ -0,0 +1,32 @@
+from app.models.pg import PG
+from app.models.user import User, UserRole
+from app.core.security import hash_password
+
+def login_admin(client, db) -> int:
+    """An admin with one empty PG, logged in on the client; returns the PG id"""
+    admin = User(name="Admin", email="admin@example.com", password_hash=hash_password("password"), role=UserRole.ADMIN)
+    pg = PG(name="PG", address="Road", admin=admin)
+    db.add(pg)
+    db.commit()
+    response = client.post("/auth/login", json={"email": "admin@example.com", "password": "password"})
+    assert response.status_code == 200
+    return pg.id
+
+def test_import_layout_csv(client, db):
+    pg_id = login_admin(client, db)
+
+    # Excel writes UTF-8 with a byte order mark
+    body = "\ufeffroom_number,rent\n101,5000\n101,5000\n102,\n".encode("utf-8")
+    response = client.post(f"/layouts/{pg_id}/csv", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200, response.text
+    assert [len(room["bed_ids"]) for room in response.json()["rooms"]] == [2, 0]
+
+def test_import_layout_csv_not_utf8(client, db):
+    pg_id = login_admin(client, db)
+
+    body = "room_number,rent\n101,5000 €\n".encode("cp1252")
+    response = client.post(f"/layouts/{pg_id}/csv", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == ["CSV must be UTF-8 encoded"]
@@ -0,0 +1,21 @@
+from app.models.bed import Bed
+from app.models.pg import PG
+from app.models.room import Room
+from app.models.user import User, UserRole
+from app.services.pg_service import refresh_pg_counters
+
+def test_refresh_pg_counters(db):
+    admin = User(name="Admin", email="admin@example.com", password_hash="-", role=UserRole.ADMIN)
+    # Rows written without the services, as in aggregate mode: the counters stay at 0
+    pg = PG(name="PG", address="Road", admin=admin, rooms=[
+        Room(room_number=101, beds=[Bed(rent=5000, is_occupied=True), Bed(rent=5000)]),
+        Room(room_number=102),
+    ])
+    db.add(pg)
+    db.commit()
+    assert (pg.total_rooms, pg.total_beds, pg.occupied_beds) == (0, 0, 0)
+
+    assert refresh_pg_counters(db, admin.id) == 1
+
+    db.refresh(pg)
+    assert (pg.total_rooms, pg.total_beds, pg.occupied_beds, pg.version) == (2, 2, 1, 2)
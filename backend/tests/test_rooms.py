@@ -0,0 +1,65 @@
+import sqlite3
+from sqlalchemy import event, func
+from sqlalchemy.engine import Engine
+from app.core.query_stats import assert_max_queries
+from app.models.bed import Bed
+from app.models.pg import PG
+from app.models.room import Room
+from app.models.user import User, UserRole
+
+def test_list_rooms_loads_beds_in_one_query(client, db):
+    admin = User(name="Admin", email="admin@example.com", password_hash="-", role=UserRole.ADMIN)
+    pg = PG(name="PG", address="Road", admin=admin)
+    pg.rooms = [Room(room_number=100 + i, beds=[Bed(rent=5000) for _ in range(3)]) for i in range(10)]
+    db.add(pg)
+    db.commit()
+    pg_id = pg.id
+
+    # PG version (ETag), rooms, their beds: the same for 10 rooms as for 1
+    with assert_max_queries(3):
+        response = client.get(f"/rooms/{pg_id}")
+
+    assert response.status_code == 200
+    rooms = response.json()
+    assert len(rooms) == 10
+    assert all(len(room["beds"]) == 3 for room in rooms)
+
+def test_delete_room_with_a_bed_claimed_meanwhile(client, db, settings):
+    admin = User(name="Admin", email="admin@example.com", password_hash="-", role=UserRole.ADMIN)
+    room = Room(room_number=101, beds=[Bed(rent=5000) for _ in range(3)])
+    db.add(PG(name="PG", address="Road", admin=admin, rooms=[room]))
+    db.commit()
+    room_id, bed_id = room.id, room.beds[0].id
+
+    # Another request claims a bed after delete_room checked they were all free
+    def claim(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM beds"):
+            other = sqlite3.connect(settings.database_url.removeprefix("sqlite:///"))
+            with other:
+                other.execute("UPDATE beds SET is_occupied = 1 WHERE id = ?", (bed_id,))
+            other.close()
+
+    event.listen(Engine, "before_cursor_execute", claim)
+    try:
+        response = client.delete(f"/rooms/{room_id}")
+    finally:
+        event.remove(Engine, "before_cursor_execute", claim)
+
+    assert response.status_code == 409
+    db.expire_all()
+    assert db.get(Room, room_id) is not None
+    assert db.query(func.count(Bed.id)).filter(Bed.room_id == room_id).scalar() == 3
+
+def test_delete_room(client, db):
+    admin = User(name="Admin", email="admin@example.com", password_hash="-", role=UserRole.ADMIN)
+    room = Room(room_number=101, beds=[Bed(rent=5000) for _ in range(3)])
+    db.add(PG(name="PG", address="Road", admin=admin, rooms=[room]))
+    db.commit()
+    room_id = room.id
+
+    response = client.delete(f"/rooms/{room_id}")
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.get(Room, room_id) is None
+    assert db.query(func.count(Bed.id)).filter(Bed.room_id == room_id).scalar() == 0
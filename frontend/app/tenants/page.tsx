@@ -27,6 +27,9 @@ function TenantsContent() {
   const [expandedRowIds, setExpandedRowIds] = useState<Set<number>>(new Set());
   const [currentPage, setCurrentPage] = useState(1);
   const [totalTenants, setTotalTenants] = useState(0);
+  // cursors[i] fetches page i + 1; the first page has none
+  const [cursors, setCursors] = useState<Array<number | null>>([null]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
 
   useEffect(() => {
     const checkAccessAndFetch = async () => {
@@ -42,18 +45,14 @@ function TenantsContent() {
         }
         
         // Fetch tenants (filtered by backend based on role)
-        const data = await TenantApi.list(currentPage, PAGE_SIZE);
-        // Handle both paginated and non-paginated responses
-        if (Array.isArray(data)) {
-          setTenants(data);
-          setTotalTenants(data.length);
-        } else {
-          setTenants(data.items || []);
-          setTotalTenants(data.total || 0);
-        }
+        const data = await TenantApi.list(cursors[currentPage - 1], PAGE_SIZE);
+        setTenants(data.items);
+        setTotalTenants(data.total ?? data.items.length);
+        setNextCursor(data.next_cursor);
       } catch {
         setTenants([]);
         setTotalTenants(0);
+        setNextCursor(null);
       } finally {
         setLoading(false);
       }
@@ -79,7 +78,13 @@ function TenantsContent() {
 
   const activeTenants = tenants.length;
   const leftTenants = 0;
-  const totalPages = Math.ceil(totalTenants / PAGE_SIZE);
+  const totalPages = Math.max(1, Math.ceil(totalTenants / PAGE_SIZE));
+
+  const goToNextPage = () => {
+    if (nextCursor == null) return;
+    setCursors(prev => [...prev.slice(0, currentPage), nextCursor]);
+    setCurrentPage(p => p + 1);
+  };
 
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('en-IN', {
@@ -255,7 +260,7 @@ function TenantsContent() {
           </div>
 
           {/* Pagination Controls */}
-          {totalPages > 1 && (
+          {(currentPage > 1 || nextCursor != null) && (
             <div style={{marginTop: 24, display: 'flex', justifyContent: 'center', gap: 8, alignItems: 'center'}}>
               <button 
                 onClick={() => setCurrentPage(p => Math.max(1, p - 1))}
@@ -269,8 +274,8 @@ function TenantsContent() {
                 Page {currentPage} of {totalPages}
               </span>
               <button 
-                onClick={() => setCurrentPage(p => Math.min(totalPages, p + 1))}
-                disabled={currentPage === totalPages}
+                onClick={goToNextPage}
+                disabled={nextCursor == null}
                 className="button secondary"
                 style={{padding: '8px 16px', fontSize: 13}}
               >
@@ -127,7 +127,8 @@ export const BedApi = {
 };
 
 export const TenantApi = {
-  list: (page: number = 1, pageSize: number = 50, options?: { silent?: boolean }) => apiFetch<{ items: Array<{ id: number; user_id: number; bed_id: number; move_in_date: string; user_name: string; user_email: string; room_number: number; pg_name: string }>; total: number; page: number; page_size: number }>(`/tenants?page=${page}&page_size=${pageSize}`, options),
+  // Keyset pages: pass the previous page's next_cursor to get the next one (null on the last page)
+  list: (cursor: number | null = null, limit: number = 50, options?: { silent?: boolean }) => apiFetch<{ items: Array<{ id: number; user_id: number; bed_id: number; move_in_date: string; user_name: string; user_email: string; room_number: number; pg_name: string }>; next_cursor: number | null; total: number | null }>(`/tenants/?limit=${limit}&include_total=true${cursor != null ? `&cursor=${cursor}` : ''}`, options),
   unassigned: (options?: { silent?: boolean }) => apiFetch<Array<{ id: number; name: string; email: string; role: string }>>('/tenants/unassigned', options),
   create: (userId: number, bedId: number, moveInDate: string) =>
     apiFetch<{ id: number; user_id: number; bed_id: number; move_in_date: string; user_name: string; user_email: string; room_number: number; pg_name: string }>(`/tenants/create`, {
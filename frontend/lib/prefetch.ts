@@ -14,7 +14,7 @@ export const prefetchData = {
   // Prefetch tenants (first page)
   tenants: async () => {
     try {
-      await TenantApi.list(1, 50, { silent: true });
+      await TenantApi.list(null, 50, { silent: true });
     } catch (err) {
       console.debug('Prefetch Tenants failed (this is ok)', err);
     }